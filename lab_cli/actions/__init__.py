@@ -2,15 +2,37 @@
 from typing import Callable, Dict, Any, List
 import inspect
 
-# Type definition for an Action: Function that takes context (dict) and returns bool
+# Type definition for an Action: Function that takes context (dict) and returns
+# bool, or an ActionResult carrying values
 ActionFunc = Callable[[Dict[str, Any]], bool]
 
 class ActionDefinition:
-    def __init__(self, func: ActionFunc, name: str, params: List[str], help_text: str):
+    def __init__(self, func: ActionFunc, name: str, params: List[str], help_text: str,
+                 defaults: Dict[str, Any] = None, types: Dict[str, Any] = None):
         self.func = func
         self.name = name
         self.params = params
         self.help_text = help_text
+        # Optional parameters and their default values
+        self.defaults = defaults or {}
+        # Declared parameter types (annotations), used to convert recipe values
+        self.types = types or {}
+
+class ActionResult:
+    """
+    What an action can return instead of a plain bool: success plus named
+    values (e.g. a fitted peak position) that run-loop can act on.
+    Usage: return ActionResult(peak_nm=1532.41, depth=0.6)
+    """
+    def __init__(self, ok: bool = True, **values: Any):
+        self.ok = ok
+        self.values = values
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        return f"ActionResult(ok={self.ok}, {self.values})"
 
 # Global registry
 ACTION_REGISTRY: Dict[str, ActionDefinition] = {}
@@ -26,11 +48,23 @@ def register_action(name: str):
         if "context" in params:
             params.remove("context")
 
+        defaults = {
+            p: sig.parameters[p].default for p in params
+            if sig.parameters[p].default is not inspect.Parameter.empty
+        }
+
+        types = {
+            p: sig.parameters[p].annotation for p in params
+            if sig.parameters[p].annotation is not inspect.Parameter.empty
+        }
+
         ACTION_REGISTRY[name] = ActionDefinition(
             func=func,
             name=name,
             params=params,
-            help_text=func.__doc__ or "No description."
+            help_text=func.__doc__ or "No description.",
+            defaults=defaults,
+            types=types
         )
         return func
     return decorator
@@ -1,14 +1,19 @@
 # Last updated 5 Dec 2025
 from . import register_action
 from ..connections.cryostat import set_magnet_field, set_temperature
-from ..connections.cryostat import set_vacuum_pump
+from ..connections.cryostat import set_vacuum_pump, get_cryostat_temperature_async, with_async_cryos
+from ..connections.cryostat import send_cryo_command
 from ..equipment_api import EQUIPMENT_CONFIG
 from rich.console import Console
 
+import asyncio
 import time
 
 console = Console()
 
+# How long magnet-zero waits for the magnet to report ready again (seconds)
+MAGNET_ZERO_TIMEOUT = 300.0
+
 def _get_cryo_ip():
     # Helper to find configured cryostat
     conf = EQUIPMENT_CONFIG.get("cryo-01")
@@ -69,35 +74,47 @@ def action_toggle_pump(state: str, context: dict = None):
         return False
 
 
-@register_action("wait-stable")
-def action_wait_stable(threshold: float, timeout: float = 600, context: dict = None):
-    """
-    Blocks execution until Platform Stability < threshold (Kelvin)
-    """
-    ip = _get_cryo_ip()
-    if not ip: return False
+async def _wait_stable(ip: str, threshold: float, timeout: float) -> bool:
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
-    console.print(f"[yellow]Waiting for stability < {threshold} K...[/yellow]")
-    start_time = time.time()
+    while (loop.time() - start_time) < timeout:
+        # Temperature, stability and flags come from one sample snapshot
+        try:
+            reading = await get_cryostat_temperature_async(ip)
+        except Exception as e:
+            console.print(f"\n[red]Stability read failed: {e}[/red]")
+            await asyncio.sleep(2.0)
+            continue
 
-    while (time.time() - start_time) < float(timeout):
-        # Implementation depends on your connection layer
-        # current_stability = float(get_stability_reading(ip)) # Uses command "GPS"
+        current_stability = reading.get("temperature_stability_k")
+        if current_stability is None or not reading.get("stability_ok", True):
+            await asyncio.sleep(2.0)
+            continue
 
-        # Mocking value for demonstration
-        current_stability = 0.005
+        console.print(f"Current Stability: {current_stability} K "
+                      f"(T = {reading.get('temperature_k')} K)", end="\r")
 
-        console.print(f"Current Stability: {current_stability} K", end="\r")
-
-        if current_stability < float(threshold):
+        if current_stability < threshold:
             console.print(f"\n[green]Stable! ({current_stability} < {threshold})[/green]")
             return True
 
-        time.sleep(2.0)
+        await asyncio.sleep(2.0)
 
     console.print("\n[red]Timeout waiting for stability.[/red]")
     return False
 
+@register_action("wait-stable")
+def action_wait_stable(threshold: float, timeout: float = 600, context: dict = None):
+    """
+    Blocks execution until Platform Stability < threshold (Kelvin)
+    """
+    ip = _get_cryo_ip()
+    if not ip: return False
+
+    console.print(f"[yellow]Waiting for stability < {threshold} K...[/yellow]")
+    return asyncio.run(with_async_cryos(_wait_stable(ip, float(threshold), float(timeout))))
+
 @register_action("magnet-zero")
 def action_magnet_zero(context: dict = None):
     """
@@ -108,10 +125,31 @@ def action_magnet_zero(context: dict = None):
 
     console.print("[bold magenta]Initiating Magnet True Zero Routine...[/bold magenta]")
 
-    # Send command "SMTZ"
-    # Might want to loop checking "GMS" (Get Magnet State)
-    # until it returns "MAGNET ENABLED" or "READY"
+    zero_resp = send_cryo_command(ip, "SMTZ")
+    console.print(f"SMTZ: {zero_resp}")
+    if zero_resp.startswith("Error"):
+        return False
 
+    # Poll "GMS" (Get Magnet State): the routine is only done once the magnet
+    # has left the ready state and then reports "MAGNET ENABLED" or "READY" again
+    deadline = time.time() + MAGNET_ZERO_TIMEOUT
+    busy = False
+    while True:
+        state = send_cryo_command(ip, "GMS")
+        if state.startswith("Error"):
+            console.print(f"\n[red]Magnet state read failed: {state}[/red]")
+            return False
+        ready = any(k in state.upper() for k in ("ENABLED", "READY"))
+        if ready and busy:
+            break
+        busy = busy or not ready
+        if time.time() > deadline:
+            console.print(f"\n[red]Magnet True Zero did not complete: {state}[/red]")
+            return False
+        console.print(f"Magnet State: {state}", end="\r")
+        time.sleep(1.0)
+
+    console.print(f"\n[green]Magnet ready: {state}[/green]")
     return True
 
 @register_action("system-state")
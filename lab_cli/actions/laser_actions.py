@@ -1,40 +1,170 @@
 # Last updated 5 Dec 2025
+import math
 import os
 import time
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from rich.console import Console
-from . import register_action
+from . import register_action, ActionResult
 from ..equipment_api import EQUIPMENT_CONFIG
+from ..connections.laser import dlc_session, set_param, is_simulated, SIGNAL_CTL_POWER
+from ..connections.manager import connection_manager
+from ..connections.recorder import download_recorder, stream_recorder, RecorderDownloadError
+from ..storage import save_sweep, DEFAULT_FORMAT, DEFAULT_PRECISION
+from ..postprocess import postprocessor, render_png
+from ..decimation import sparkline
+from ..averaging import RunningStats, resample, uniform_grid
+from ..peaks import find_resonance
 
 # Toptica Import logic
 try:
     from toptica.lasersdk.dlcpro.v2_0_3 import DLCpro, NetworkConnection
-    from toptica.lasersdk.utils.dlcpro import extract_float_arrays
     HAS_SDK = True
 except ImportError:
+    # Simulated lasers (sim://...) still work without it
     HAS_SDK = False
 
 console = Console()
 
-@register_action("sweep-laser")
-def action_sweep(start_nm: float, end_nm: float, speed: float, power: float, context: dict = None):
-    """Performs a wide scan sweep and saves data."""
-    if not HAS_SDK:
-        console.print("[red]Toptica SDK missing.[/red]")
-        return False
+# Recorder settings
+DEFAULT_RATE_HZ = 100.0
+RECORDING_MARGIN = 1.0             # seconds recorded after the scan ends
+DEFAULT_RECORDER_CAPACITY = 1_000_000   # samples, if the device doesn't say
+
+# Channels sweep-laser can record besides wavelength: name -> (block id, column)
+SWEEP_CHANNELS = {"intensity": ("y", "Intensity"), "power": ("Y", "Power")}
+
+def _recorder_capacity(dlc) -> int:
+    """Recorder memory in samples."""
+    try:
+        return int(dlc.laser1.recorder.memory_size.get())
+    except Exception:
+        return DEFAULT_RECORDER_CAPACITY
+
+def plan_segments(start_nm: float, end_nm: float, speed: float, rate_hz: float,
+                  capacity: int) -> List[Tuple[float, float, int]]:
+    """
+    Splits a scan into the fewest consecutive segments whose recordings
+    (scan + RECORDING_MARGIN at rate_hz) fit in the recorder.
+    Returns (begin_nm, end_nm, sample_count) per segment.
+    """
+    duration = abs(end_nm - start_nm) / speed
+    per_segment = capacity - RECORDING_MARGIN * rate_hz
+    if per_segment <= 0:
+        raise ValueError(f"{rate_hz:g} Hz is too fast for a {capacity}-sample recorder")
+
+    n = max(1, math.ceil(duration * rate_hz / per_segment))
+    step = (end_nm - start_nm) / n
+    samples = min(capacity, int(round((duration / n + RECORDING_MARGIN) * rate_hz)))
+    return [(start_nm + i * step, start_nm + (i + 1) * step, samples) for i in range(n)]
+
+def _is_on(value) -> bool:
+    return str(value).lower() in ["on", "true", "yes", "1"]
+
+def _record_scan(ip: str, dlc, begin: float, end: float, speed: float, samples: int,
+                 blocks: str, streaming: bool) -> Dict[str, np.ndarray]:
+    """
+    Runs one wide scan and returns the recorder data per block id.
+    Raises RecorderDownloadError (with the partial data) if a chunk fails.
+    """
+    # Settings unchanged since the last sweep aren't resent
+    set_param(ip, dlc, "laser1.wide_scan.scan_begin", float(begin))
+    set_param(ip, dlc, "laser1.wide_scan.scan_end", float(end))
+    set_param(ip, dlc, "laser1.wide_scan.speed", float(speed))
+    set_param(ip, dlc, "laser1.recorder.recording_time", abs(end - begin) / speed + RECORDING_MARGIN)
+    set_param(ip, dlc, "laser1.recorder.sample_count_set", int(samples))
+
+    dlc.laser1.wide_scan.start()
 
+    # Decoded straight into preallocated arrays, chunk size adapts.
+    # Failed chunks are retried; if one never arrives, keep the rest.
+    if streaming:
+        # Pull samples as they are recorded; only the tail is left once
+        # the scan ends
+        console.print(f"Streaming ~{samples} samples...")
+        return stream_recorder(dlc, lambda: dlc.laser1.wide_scan.state.get() != 0,
+                               blocks, capacity=samples)
+
+    while dlc.laser1.wide_scan.state.get() != 0:
+        time.sleep(0.5)
+
+    # Query how many samples were actually recorded
+    total_samples = dlc.laser1.recorder.data.recorded_sample_count.get()
+    console.print(f"Acquiring {total_samples} samples...")
+    return download_recorder(dlc, blocks, total=total_samples)
+
+def _record_pass(ip: str, dlc, segments: List[Tuple[float, float, int]], speed: float,
+                 blocks: str, streaming: bool, reverse: bool = False) -> Tuple[Dict[str, np.ndarray], bool]:
+    """
+    Scans every segment once (end to start if `reverse`) and joins them.
+    Returns (data per block id, complete); a failed download ends the pass
+    early with what was read.
+    """
+    if reverse:
+        segments = [(end, begin, n) for begin, end, n in reversed(segments)]
+
+    parts = []
+    complete = True
+    for i, (begin, end, samples) in enumerate(segments):
+        if len(segments) > 1:
+            console.print(f"Segment {i + 1}/{len(segments)}: {begin:.4f}-{end:.4f} nm")
+        try:
+            parts.append(_record_scan(ip, dlc, begin, end, speed, samples, blocks, streaming))
+        except RecorderDownloadError as e:
+            console.print(f"[yellow]{e}. Saving the partial sweep.[/yellow]")
+            parts.append(e.partial)
+            complete = False
+            break
+
+    # Keep only blocks every segment returned
+    joined = {b: np.concatenate([p[b] for p in parts]) for b in blocks
+              if parts and all(b in p for p in parts)}
+    return joined, complete
+
+def run_sweep(start_nm: float, end_nm: float, speed: float, power: float,
+              file_format: str = DEFAULT_FORMAT, precision: str = DEFAULT_PRECISION,
+              stream: str = "on", rate_hz: float = DEFAULT_RATE_HZ, resolution_pm: float = 0,
+              channels: str = "intensity", passes: int = 1, bidirectional: str = "off",
+              keep_raw: str = "off", context: dict = None,
+              extra_metadata: Optional[dict] = None, label: str = "") -> Optional[Dict[str, np.ndarray]]:
+    """
+    Does the work of sweep-laser (see action_sweep for the parameters).
+    `extra_metadata` is stored with the file and `label` is appended to its
+    name. Returns the saved columns, or None if nothing was saved.
+    """
     conf = EQUIPMENT_CONFIG.get("laser-01")
-    if not conf: return False
+    if not conf: return None
 
     ip = conf["ip"]
+    if not HAS_SDK and not is_simulated(ip):
+        console.print("[red]Toptica SDK missing.[/red]")
+        return None
+
+    start_nm, end_nm, speed = float(start_nm), float(end_nm), float(speed)
+    resolution_pm = float(resolution_pm or 0)
+    # A wavelength step sets the rate: speed (nm/s) / step (nm)
+    rate = speed / (resolution_pm * 1e-3) if resolution_pm > 0 else float(rate_hz)
+
+    selected = [c.strip().lower() for c in str(channels).split(",") if c.strip()]
+    unknown = [c for c in selected if c not in SWEEP_CHANNELS]
+    if unknown or not selected:
+        console.print(f"[red]Unknown channels '{channels}'. Choose from: {', '.join(SWEEP_CHANNELS)}[/red]")
+        return None
+    blocks = "x" + "".join(SWEEP_CHANNELS[c][0] for c in selected)
+    names = [("x", "Wavelength")] + [SWEEP_CHANNELS[c] for c in selected]
+    streaming = _is_on(stream)
+    passes = max(1, int(passes))
+    both_ways = _is_on(bidirectional)
+    keep_raw_passes = _is_on(keep_raw)
 
     # Generate filename based on context
     suffix = ""
     if context:
         for k, v in context.items():
             suffix += f"_{k}_{v}"
+    if label:
+        suffix += f"_{label}"
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     folder = "Data_Sweeps"
@@ -43,67 +173,218 @@ def action_sweep(start_nm: float, end_nm: float, speed: float, power: float, con
     filename_base = os.path.join(folder, f"Sweep_{timestamp}{suffix}")
 
     try:
-        with DLCpro(NetworkConnection(ip)) as dlc:
-            # Setup Sweep Parameters
-            console.print(f"Sweeping {start_nm}-{end_nm} nm @ {speed} nm/s...")
-            dlc.laser1.wide_scan.scan_begin.set(float(start_nm))
-            dlc.laser1.wide_scan.scan_end.set(float(end_nm))
-            dlc.laser1.wide_scan.speed.set(float(speed))
-
-            # Setup Recorder
-            scan_range = abs(float(end_nm) - float(start_nm))
-            duration = scan_range / float(speed)
-            sample_count = int(duration * 100) # 100 Hz recording
-
-            dlc.laser1.recorder.recording_time.set(duration + 1.0)
-            dlc.laser1.recorder.sample_count_set.set(sample_count)
-
-            # Start Sweep
-            dlc.laser1.wide_scan.start()
-            while dlc.laser1.wide_scan.state.get() != 0:
-                time.sleep(0.5)
-
-            # Fetch Data
-            # Query how many samples were actually recorded
-            total_samples = dlc.laser1.recorder.data.recorded_sample_count.get()
-            console.print(f"Acquiring {total_samples} samples...")
-
-            x_data = []
-            y_data = []
-
-            if total_samples > 0:
-                index = 0
-                while index < total_samples:
-                    # Fetch in chunks of 1024 to be safe
-                    chunk = min(1024, total_samples - index)
-                    raw = dlc.laser1.recorder.data.get_data(index, chunk)
-
-                    # Parse binary data
-                    xy = extract_float_arrays('xy', raw)
-                    if 'x' in xy: x_data.extend(xy['x'])
-                    if 'y' in xy: y_data.extend(xy['y'])
-
-                    index += chunk
+        # Shared session: stays open between actions, loop iterations and
+        # status polls.
+        with dlc_session(ip) as dlc:
+            segments = plan_segments(start_nm, end_nm, speed, rate, _recorder_capacity(dlc))
+            console.print(f"Sweeping {start_nm}-{end_nm} nm @ {speed} nm/s, {rate:g} Hz"
+                          + (f", {passes} passes{' both ways' if both_ways else ''}" if passes > 1 else "")
+                          + "...")
+            if "power" in selected:
+                set_param(ip, dlc, "laser1.recorder.inputs.channel2.signal", SIGNAL_CTL_POWER)
+
+            metadata = {
+                "device": "laser-01",
+                "timestamp": timestamp,
+                "start_nm": start_nm,
+                "end_nm": end_nm,
+                "speed_nm_s": speed,
+                "power": float(power),
+                "rate_hz": rate,
+                "resolution_pm": speed / rate * 1e3,
+                "channels": selected,
+                "segments": len(segments),
+                "recording_time_s": abs(end_nm - start_nm) / speed + RECORDING_MARGIN * len(segments),
+                "streamed": streaming,
+                "bidirectional": both_ways,
+                "context": context or {},
+            }
+            metadata.update(extra_metadata or {})
+
+            # Passes are folded into running mean/variance on a common grid
+            # as they arrive; only the aggregate (and optionally the raw
+            # passes) is written.
+            stats = {name: RunningStats() for _, name in names[1:]}
+            grid = uniform_grid(start_nm, end_nm, abs(end_nm - start_nm) / speed * rate + 1) if passes > 1 else None
+            columns = {}
+            complete = True
+            done = 0
+            for k in range(passes):
+                # Odd passes scan back to the start when recording both ways
+                reverse = both_ways and k % 2 == 1
+                if passes > 1:
+                    console.print(f"Pass {k + 1}/{passes}{' (reverse)' if reverse else ''}")
+                data, complete = _record_pass(ip, dlc, segments, speed, blocks, streaming, reverse)
+                pass_columns = {name: data[b] for b, name in names if b in data}
+
+                if passes == 1:
+                    columns = pass_columns
+                    break
+
+                if keep_raw_passes and len(pass_columns) > 1:
+                    save_sweep(f"{filename_base}_pass{k + 1}" + ("" if complete else "_partial"),
+                               pass_columns, dict(metadata, pass_index=k + 1, reverse=reverse,
+                                                  samples=len(next(iter(pass_columns.values())))),
+                               fmt=file_format, precision=precision)
+                # An incomplete pass would skew the average
+                if not complete or "Wavelength" not in pass_columns:
+                    complete = False
+                    break
+                for name, stat in stats.items():
+                    if name in pass_columns:
+                        stat.add(resample(pass_columns["Wavelength"], pass_columns[name], grid))
+                done += 1
+
+            if passes > 1 and done:
+                columns = {"Wavelength": grid}
+                for name, stat in stats.items():
+                    if stat.mean is not None:
+                        columns[name] = stat.mean
+                        columns[f"{name}_std"] = stat.std
+            elif passes > 1:
+                # Not even one full pass: keep what the failed pass recorded
+                columns = pass_columns
+            if not complete:
+                filename_base += "_partial"
+
+            x_data = columns.get("Wavelength", [])
+            traces = [v for k, v in columns.items() if k != "Wavelength" and not k.endswith("_std")]
 
             # Save Data
-            if x_data and y_data:
-                df = pd.DataFrame({"Wavelength": x_data, "Intensity": y_data})
-                df.to_excel(f"{filename_base}.xlsx", index=False)
-
-                plt.figure()
-                plt.plot(df["Wavelength"], df["Intensity"])
-                plt.title(os.path.basename(filename_base))
-                plt.xlabel("Wavelength (nm)")
-                plt.ylabel("Intensity")
-                plt.grid(True)
-                plt.savefig(f"{filename_base}.png")
-                plt.close()
+            if len(x_data) and traces:
+                metadata.update(samples=len(x_data), passes=done if passes > 1 else 1)
+                path = save_sweep(filename_base, columns, metadata, fmt=file_format, precision=precision)
+
+                # PNG is drawn in the background while the next step runs
+                postprocessor.submit(f"plot {os.path.basename(filename_base)}", render_png,
+                                     os.path.abspath(path), os.path.abspath(f"{filename_base}.png"),
+                                     os.path.basename(filename_base))
                 console.print(f"[green]Saved: {os.path.basename(filename_base)}[/green]")
-                return True
+                console.print(f"[dim]{sparkline(traces[0])}[/dim]")
+                return columns
             else:
                 console.print("[red]No data recorded.[/red]")
-                return False
+                return None
 
     except Exception as e:
         console.print(f"[red]Sweep Failed: {e}[/red]")
+        return None
+
+def sweep_metrics(columns: Dict[str, np.ndarray], feature: str = "dip") -> Dict[str, float]:
+    """
+    Scalar summaries of a sweep, returned to run-loop (e.g. for adaptive
+    refinement): mean and integrated intensity, and the strongest
+    resonance's position, width and depth if there is one.
+    """
+    x = np.asarray(columns["Wavelength"], dtype=np.float64)
+    name = "Intensity" if "Intensity" in columns else next(k for k in columns if k != "Wavelength")
+    y = np.asarray(columns[name], dtype=np.float64)
+
+    metrics = {
+        "mean_intensity": float(y.mean()),
+        "integrated_intensity": float(abs(np.sum((y[1:] + y[:-1]) / 2 * np.diff(x)))),
+    }
+    found = find_resonance(x, y, feature)
+    if found:
+        metrics.update(resonance_nm=found.center_nm, resonance_fwhm_nm=found.fwhm_nm,
+                       resonance_depth=found.depth)
+    return metrics
+
+@register_action("sweep-laser")
+def action_sweep(start_nm: float, end_nm: float, speed: float, power: float,
+                 file_format: str = DEFAULT_FORMAT, precision: str = DEFAULT_PRECISION,
+                 stream: str = "on", rate_hz: float = DEFAULT_RATE_HZ, resolution_pm: float = 0,
+                 channels: str = "intensity", passes: int = 1, bidirectional: str = "off",
+                 keep_raw: str = "off", context: dict = None):
+    """
+    Performs a wide scan sweep and saves data.
+    file_format: npz (default), hdf5 or parquet. precision: float32 or float64.
+    stream: 'on' (default) downloads while scanning, 'off' waits for the scan to end.
+    rate_hz: recorder sampling rate, or resolution_pm: wavelength step (overrides rate_hz).
+    channels: comma-separated, from intensity (default) and power.
+    Scans too long for the recorder are split into consecutive segments.
+    passes: repeat the scan and save the mean and standard deviation;
+    bidirectional: 'on' records on the way back too; keep_raw: 'on' also saves each pass.
+    Use 'lab-cli export-excel' for .xlsx copies.
+    Returns mean_intensity, integrated_intensity and resonance_nm (etc.) to run-loop.
+    """
+    columns = run_sweep(start_nm, end_nm, speed, power, file_format, precision, stream,
+                        rate_hz, resolution_pm, channels, passes, bidirectional, keep_raw, context)
+    if columns is None:
+        return False
+    return ActionResult(**sweep_metrics(columns))
+
+# Default window for tracking scans, in resonance linewidths
+TRACK_WINDOW_FWHMS = 20.0
+# A resonance closer than this fraction of the window to its edge counts as lost
+TRACK_EDGE_MARGIN = 0.1
+
+def _well_inside(center: float, begin: float, end: float, lo: float, hi: float) -> bool:
+    """True unless the centre sits near a window edge that isn't also a range edge."""
+    margin = TRACK_EDGE_MARGIN * (end - begin)
+    return ((begin <= lo or center > begin + margin) and
+            (end >= hi or center < end - margin))
+
+@register_action("track-resonance")
+def action_track(start_nm: float, end_nm: float, speed: float, power: float,
+                 window_nm: float = 0, feature: str = "dip",
+                 file_format: str = DEFAULT_FORMAT, precision: str = DEFAULT_PRECISION,
+                 rate_hz: float = DEFAULT_RATE_HZ, resolution_pm: float = 0,
+                 context: dict = None):
+    """
+    Sweep that follows a resonance through a run-loop. The first call scans
+    start_nm-end_nm and finds the strongest dip (feature='peak' for peaks);
+    later calls only scan window_nm (default 20 linewidths) around where it
+    is expected next, falling back to the full range if it is lost.
+    Other parameters and returned values as for sweep-laser.
+    """
+    conf = EQUIPMENT_CONFIG.get("laser-01")
+    if not conf: return False
+
+    lo, hi = sorted((float(start_nm), float(end_nm)))
+    # Tracks live with the laser session and are reset when a loop starts
+    tracks = connection_manager.state("dlcpro", conf["ip"]).setdefault("tracking", {})
+    key = (lo, hi, feature)
+
+    def scan(begin, end, mode):
+        columns = run_sweep(begin, end, speed, power, file_format, precision,
+                            rate_hz=rate_hz, resolution_pm=resolution_pm, context=context,
+                            extra_metadata={"tracking": mode, "track_range_nm": [lo, hi]},
+                            label=mode)
+        if columns is None:
+            return None, None
+        return columns, find_resonance(columns["Wavelength"], columns["Intensity"], feature)
+
+    track = tracks.get(key)
+    if track:
+        # Extrapolate from the last two positions
+        centers = track["centers"]
+        predicted = centers[-1] + (centers[-1] - centers[-2] if len(centers) > 1 else 0.0)
+        window = min(float(window_nm or 0) or TRACK_WINDOW_FWHMS * track["fwhm"], hi - lo)
+        # Shift the window back inside the full range if needed
+        begin = min(max(lo, predicted - window / 2), hi - window)
+        end = begin + window
+
+        console.print(f"Tracking: {begin:.4f}-{end:.4f} nm around {predicted:.4f} nm")
+        columns, found = scan(begin, end, "narrow")
+        if columns is None:
+            return False
+        if found and _well_inside(found.center_nm, begin, end, lo, hi):
+            track["centers"] = [centers[-1], found.center_nm]
+            track["fwhm"] = found.fwhm_nm
+            console.print(f"[cyan]Resonance at {found.center_nm:.4f} nm (FWHM {found.fwhm_nm * 1e3:.1f} pm)[/cyan]")
+            return ActionResult(**sweep_metrics(columns, feature))
+        console.print("[yellow]Resonance lost, falling back to a wide scan.[/yellow]")
+
+    columns, found = scan(float(start_nm), float(end_nm), "wide")
+    if columns is None:
         return False
+    if found is None:
+        tracks.pop(key, None)
+        console.print("[yellow]No resonance found; the next call scans the full range again.[/yellow]")
+        return ActionResult(**sweep_metrics(columns, feature))
+
+    # Start a new history: the resonance may have jumped
+    tracks[key] = {"centers": [found.center_nm], "fwhm": found.fwhm_nm}
+    console.print(f"[cyan]Resonance at {found.center_nm:.4f} nm (FWHM {found.fwhm_nm * 1e3:.1f} pm)[/cyan]")
+    return ActionResult(**sweep_metrics(columns, feature))
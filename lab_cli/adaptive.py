@@ -0,0 +1,107 @@
+# Adaptive refinement of one-variable loops
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+CRITERIA = ("gradient", "curvature")
+DEFAULT_CRITERION = "gradient"
+# Intervals scoring at least this fraction of the best one are refined together
+BATCH_FRACTION = 0.5
+# Default smallest interval, as a fraction of the coarse step
+MIN_STEP_FRACTION = 1 / 16
+
+
+class AdaptiveSampler:
+    """
+    Chooses where to evaluate a scalar metric along one variable.
+
+    It starts from a coarse list of values. After each batch, every gap
+    between neighbouring points gets a score: the metric change across it
+    ("gradient"), or the larger second difference at its two ends
+    ("curvature"). Gaps scoring at least BATCH_FRACTION of the best one are
+    split at their midpoints. This repeats until `budget` points have been
+    used, no gap scores above `tolerance`, or every gap is narrower than
+    2 x `min_step`.
+
+    Usage:
+        sampler = AdaptiveSampler(coarse, budget=50)
+        batch = sampler.start()
+        while batch:
+            for x in batch:
+                sampler.add(x, measure(x))
+            batch = sampler.next_batch()
+    """
+
+    def __init__(self, coarse: Sequence[float], budget: int, tolerance: float = 0.0,
+                 min_step: Optional[float] = None, criterion: str = DEFAULT_CRITERION):
+        if criterion not in CRITERIA:
+            raise ValueError(f"Unknown criterion '{criterion}'. Choose from: {', '.join(CRITERIA)}")
+        self.coarse = sorted(set(float(v) for v in coarse))
+        if len(self.coarse) < 2:
+            raise ValueError("Adaptive refinement needs at least two starting values")
+        self.budget = max(int(budget), len(self.coarse))
+        self.tolerance = float(tolerance)
+        if min_step is None:
+            min_step = float(np.min(np.diff(self.coarse))) * MIN_STEP_FRACTION
+        self.min_step = float(min_step)
+        self.criterion = criterion
+        # Every value visited -> metric (None if the step didn't return it)
+        self.results: Dict[float, Optional[float]] = {}
+
+    def start(self) -> List[float]:
+        """The coarse values, in order."""
+        return list(self.coarse)
+
+    def add(self, x: float, metric: Any) -> Optional[float]:
+        """
+        Records the metric at x. Anything that isn't a finite number (None,
+        text, NaN) counts as no measurement. Returns the value stored.
+        """
+        try:
+            value = float(metric)
+        except (TypeError, ValueError):
+            value = None
+        if value is not None and not np.isfinite(value):
+            value = None
+        self.results[float(x)] = value
+        return value
+
+    def _scores(self, x: np.ndarray, m: np.ndarray) -> np.ndarray:
+        """Score of each gap x[i]..x[i+1]; NaN where a metric is missing."""
+        if self.criterion == "gradient":
+            return np.abs(np.diff(m))
+        # Second difference at each point, on the (possibly uneven) grid
+        curv = np.zeros_like(m)
+        if len(m) > 2:
+            h1, h2 = np.diff(x)[:-1], np.diff(x)[1:]
+            slope = np.diff(m) / np.diff(x)
+            curv[1:-1] = np.abs(np.diff(slope)) * (h1 + h2) / 2
+            curv[0], curv[-1] = curv[1], curv[-2]
+        # np.maximum keeps NaN, so gaps next to a missing metric aren't scored
+        return np.maximum(curv[:-1], curv[1:])
+
+    def next_batch(self) -> List[float]:
+        """Midpoints to visit next, in increasing order (empty when done)."""
+        remaining = self.budget - len(self.results)
+        if remaining <= 0 or len(self.results) < 2:
+            return []
+
+        x = np.array(sorted(self.results))
+        m = np.array([np.nan if self.results[v] is None else self.results[v] for v in x])
+        scores = self._scores(x, m)
+        # Gaps too narrow to split, or next to a failed point, can't be refined
+        scores[np.diff(x) < 2 * self.min_step] = np.nan
+        if np.all(np.isnan(scores)):
+            return []
+
+        best = np.nanmax(scores)
+        if best <= self.tolerance:
+            return []
+        chosen = np.flatnonzero(np.nan_to_num(scores, nan=-np.inf) >= BATCH_FRACTION * best)
+        # Highest scores first if the budget can't cover them all
+        chosen = chosen[np.argsort(-scores[chosen], kind="stable")][:remaining]
+        return sorted(round(float((x[i] + x[i + 1]) / 2), 9) for i in chosen)
+
+    @property
+    def points(self) -> List[float]:
+        return sorted(self.results)
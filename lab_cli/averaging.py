@@ -0,0 +1,55 @@
+# Running averages of repeated sweeps
+from typing import Optional
+
+import numpy as np
+
+
+def uniform_grid(start: float, end: float, points: int) -> np.ndarray:
+    """Evenly spaced, increasing grid between start and end (inclusive)."""
+    lo, hi = min(start, end), max(start, end)
+    return np.linspace(lo, hi, max(2, int(points)))
+
+def resample(x: np.ndarray, y: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    Interpolates one pass onto `grid`. The pass may run in either
+    direction (or wobble); it is sorted by x first.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    order = np.argsort(x, kind="stable")
+    return np.interp(grid, x[order], np.asarray(y, dtype=np.float64)[order])
+
+
+class RunningStats:
+    """
+    Mean and variance of equally sized arrays, updated one array at a time
+    (Welford's method), so passes don't have to be kept in memory.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if self.mean is None:
+            self.count = 1
+            self.mean = values.copy()
+            self._m2 = np.zeros_like(values)
+            return
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (values - self.mean)
+
+    @property
+    def variance(self) -> Optional[np.ndarray]:
+        """Sample variance (zeros until there are two passes)."""
+        if self.mean is None:
+            return None
+        return self._m2 / (self.count - 1) if self.count > 1 else np.zeros_like(self.mean)
+
+    @property
+    def std(self) -> Optional[np.ndarray]:
+        var = self.variance
+        return None if var is None else np.sqrt(var)
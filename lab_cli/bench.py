@@ -0,0 +1,279 @@
+# Benchmarks against the local simulators
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from . import equipment_api
+from .actions import register_action, laser_actions
+from .simulators.dlcpro import SimulatedDLCpro, register_simulator
+from .simulators.montana import MontanaSimulator
+from .connections.manager import connection_manager
+from .postprocess import postprocessor
+
+BENCH_LASER = "sim://bench-laser"
+DEFAULT_SWEEP_SAMPLES = [10_000, 100_000, 1_000_000]
+RESULTS_FOLDER = "bench_results"
+
+
+@register_action("noop")
+def action_noop(value: str, context: dict = None):
+    """Does nothing. Used to measure run-loop overhead."""
+    return True
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    """Timing statistics in seconds."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "p50_s": ordered[len(ordered) // 2],
+        "p95_s": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_s": ordered[0],
+        "max_s": ordered[-1],
+    }
+
+@contextmanager
+def _replaced(target: dict, values: dict):
+    """Temporarily replaces the contents of a dict (e.g. EQUIPMENT_CONFIG)."""
+    saved = dict(target)
+    target.clear()
+    target.update(values)
+    try:
+        yield
+    finally:
+        target.clear()
+        target.update(saved)
+
+@contextmanager
+def _quiet(*consoles):
+    """Sends rich console output to a buffer so rendering, not the terminal, is timed."""
+    saved = [c.file for c in consoles]
+    for c in consoles:
+        c.file = io.StringIO()
+    try:
+        yield
+    finally:
+        for c, f in zip(consoles, saved):
+            c.file = f
+
+@contextmanager
+def _workdir():
+    """Runs in a scratch directory so benchmark files don't land in the project."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="lab-cli-bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
+
+
+def bench_status(iterations: int = 20, latency: float = 0.0) -> Dict[str, Any]:
+    """get_all_equipment() latency with every device simulated."""
+    with MontanaSimulator(cryo_port=0, rook_port=None, latency=latency) as cryo:
+        address = f"{BENCH_LASER}-status"
+        register_simulator(address, SimulatedDLCpro(latency=latency))
+        config = {
+            "laser-01": {"type": "Toptica Laser", "ip": address, "driver": "toptica_dlc"},
+            "cryo-01": {"type": "Montana Cryostation", "ip": cryo.address, "driver": "montana"},
+            "scope-01": {"type": "Digital Oscilloscope", "ip": None, "driver": "mock"},
+        }
+        with _replaced(equipment_api.EQUIPMENT_CONFIG, config):
+            # First call opens the sessions
+            started = time.perf_counter()
+            equipment_api.get_all_equipment()
+            first = time.perf_counter() - started
+
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                data = equipment_api.get_all_equipment()
+                samples.append(time.perf_counter() - started)
+        connection_manager.invalidate("dlcpro", address)
+        connection_manager.invalidate("montana", cryo.address)
+
+    result = _summary(samples)
+    result.update({
+        "first_call_s": first,
+        "device_latency_s": latency,
+        "statuses": {k: v.get("status") for k, v in data.items()},
+    })
+    return result
+
+
+def _instrument_sweep(sim: SimulatedDLCpro, marks: Dict[str, float]):
+    """Records when the scan was seen to finish and when downloading started/ended."""
+    ws, data = sim.laser1.wide_scan, sim.laser1.recorder.data
+
+    read_state = ws.state.get
+    def state():
+        value = read_state()
+        if value == 0:
+            marks.setdefault("scan_done", time.perf_counter())
+        return value
+    ws.state.get = state
+
+    get_data = data.get_data
+    def timed_get_data(start_index, count):
+        marks.setdefault("download_start", time.perf_counter())
+        raw = get_data(start_index, count)
+        marks["download_end"] = time.perf_counter()
+        return raw
+    data.get_data = timed_get_data
+
+def bench_sweep(sample_counts: Optional[List[int]] = None, latency: float = 0.0,
+                transfer_rate: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Download throughput and time-to-file of sweep-laser for several sizes."""
+    results = []
+    for n in sample_counts or DEFAULT_SWEEP_SAMPLES:
+        # sweep-laser records at 100 Hz; pick the speed that gives n samples.
+        # Scans run at 10^6 x real time so only the data path is measured.
+        # Recorder big enough that the sweep isn't split into segments.
+        sim = SimulatedDLCpro(time_scale=1e6, latency=latency, transfer_rate=transfer_rate,
+                              memory_size=2 * max(n, 1_000_000), seed=0)
+        # Fresh address per run: sessions are cached by address
+        address = f"{BENCH_LASER}-sweep-{n}"
+        register_simulator(address, sim)
+        marks: Dict[str, float] = {}
+        _instrument_sweep(sim, marks)
+
+        laser = dict(equipment_api.EQUIPMENT_CONFIG.get("laser-01", {}), ip=address)
+        with _replaced(equipment_api.EQUIPMENT_CONFIG, {"laser-01": laser}), \
+                _workdir() as tmp, _quiet(laser_actions.console):
+            started = time.perf_counter()
+            ok = laser_actions.action_sweep(1530.0, 1535.0, 5.0 * 100 / n, 1.0)
+            finished = time.perf_counter()
+            # The PNG is drawn in the background; wait for it before measuring files
+            postprocessor.flush()
+            plotted = time.perf_counter()
+            file_bytes = sum(os.path.getsize(os.path.join(root, f))
+                             for root, _, files in os.walk(tmp) for f in files)
+        samples = sim.laser1.recorder.data.recorded_sample_count.get()
+        connection_manager.invalidate("dlcpro", address)
+
+        download = marks.get("download_end", finished) - marks.get("download_start", finished)
+        scan_done = marks.get("scan_done", started)
+        results.append({
+            "samples": samples,
+            "success": bool(ok),
+            "bytes_downloaded": sim.bytes_sent,
+            "device_calls": sim.call_count,
+            "download_s": download,
+            "bytes_per_s": sim.bytes_sent / download if download > 0 else None,
+            "time_to_file_s": finished - scan_done,
+            "total_s": finished - started,
+            "plot_wait_s": plotted - finished,
+            "file_bytes": file_bytes,
+        })
+    return results
+
+
+def bench_run_loop(iterations: int = 200, steps_per_iteration: int = 5) -> Dict[str, Any]:
+    """Per-iteration cost of the run-loop machinery with no-op actions."""
+    from . import main
+
+    steps = [{"type": "noop", "value": "{x}"} for _ in range(steps_per_iteration)]
+    values = main.loop_values(0, iterations - 1, 1)
+
+    # Baseline: the actions themselves, called directly
+    started = time.perf_counter()
+    for val in values:
+        for _ in steps:
+            action_noop(str(val), context={"x": val})
+    direct = time.perf_counter() - started
+
+    # Compiled once, as run-loop does
+    plan = main.compile_recipe(steps, ["x"])
+    with _quiet(main.console):
+        samples = []
+        for val in values:
+            t0 = time.perf_counter()
+            main.console.print(f"\n[bold yellow]--- x = {val} ---[/bold yellow]")
+            plan.run({"x": val}, on_error=main._report_step_error)
+            samples.append(time.perf_counter() - t0)
+
+    result = _summary(samples)
+    result.update({
+        "steps_per_iteration": steps_per_iteration,
+        "overhead_per_iteration_s": (sum(samples) - direct) / len(values),
+        "overhead_per_step_s": (sum(samples) - direct) / (len(values) * steps_per_iteration),
+    })
+    return result
+
+
+def bench_startup(runs: int = 5) -> Dict[str, Any]:
+    """Wall time of `lab-cli --help` in a fresh interpreter."""
+    # Run from the project root so an uninstalled checkout works too
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def timed(args):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, capture_output=True, check=True, cwd=root)
+        return time.perf_counter() - started
+
+    interpreter = [timed(["-c", "pass"]) for _ in range(runs)]
+    cli = [timed(["-m", "lab_cli.main", "--help"]) for _ in range(runs)]
+
+    result = _summary(cli)
+    result["interpreter_p50_s"] = _summary(interpreter)["p50_s"]
+    return result
+
+
+BENCHMARKS = ("status", "sweep", "loop", "startup")
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def run_benchmarks(only: Optional[List[str]] = None, sample_counts: Optional[List[int]] = None,
+                   iterations: int = 20, latency: float = 0.0,
+                   transfer_rate: Optional[float] = None, progress=None) -> Dict[str, Any]:
+    """
+    Runs the selected benchmarks and returns a JSON-serialisable report.
+    `progress` is called with the name of each benchmark before it starts.
+    """
+    selected = [b for b in BENCHMARKS if not only or b in only]
+    results: Dict[str, Any] = {}
+    for name in selected:
+        if progress:
+            progress(name)
+        if name == "status":
+            results[name] = bench_status(iterations, latency)
+        elif name == "sweep":
+            results[name] = bench_sweep(sample_counts, latency, transfer_rate)
+        elif name == "loop":
+            results[name] = bench_run_loop()
+        elif name == "startup":
+            results[name] = bench_startup()
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"iterations": iterations, "latency_s": latency, "transfer_rate": transfer_rate},
+        "results": results,
+    }
+
+def save_report(report: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Writes a report as JSON (bench_results/bench_<timestamp>.json by default)."""
+    if path is None:
+        os.makedirs(RESULTS_FOLDER, exist_ok=True)
+        path = os.path.join(RESULTS_FOLDER, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
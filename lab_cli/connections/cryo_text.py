@@ -0,0 +1,123 @@
+import select
+import socket
+import struct
+from typing import List
+
+from .manager import connection_manager
+
+CRYO_PORT = 7773
+
+class CommandsNotSentError(ConnectionError):
+    """
+    A reused connection failed before the commands reached the cryostat
+    (while reconnecting or sending), so they can safely be sent again.
+    """
+
+class CryoTextClient:
+    """
+    Long-lived client for the Cryostation text protocol (port 7773).
+
+    Every frame is a 2-byte big-endian length followed by that many ASCII
+    bytes, in both directions. The socket stays open between commands, and
+    responses are read until the full frame has arrived, so a response split
+    over several TCP segments is never truncated.
+    """
+
+    def __init__(self, ip: str, port: int = CRYO_PORT, timeout: float = 3.0):
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self._sock = None
+
+    def connect(self):
+        if self._sock is None:
+            sock = socket.create_connection((self.ip, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = sock
+        return self
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def _is_alive(self) -> bool:
+        """
+        False if the idle socket was closed by the cryostat (or has bytes
+        nobody asked for): either way it is readable before we send.
+        """
+        try:
+            readable, _, _ = select.select([self._sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    @staticmethod
+    def encode(cmd: str) -> bytes:
+        """Frames one command."""
+        payload = cmd.encode('ascii')
+        return struct.pack('>H', len(payload)) + payload
+
+    def _recv_exact(self, size: int) -> bytes:
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = self._sock.recv_into(view[received:], size - received)
+            if n == 0:
+                raise ConnectionError("Cryostat closed the connection")
+            received += n
+        return bytes(buf)
+
+    def _read_frame(self) -> str:
+        resp_len = struct.unpack('>H', self._recv_exact(2))[0]
+        return self._recv_exact(resp_len).decode('ascii')
+
+    def pipeline(self, commands: List[str]) -> List[str]:
+        """
+        Sends several commands in one write and returns their responses in
+        the same order. Any socket error closes the connection, because the
+        stream position is unknown afterwards.
+
+        Raises CommandsNotSentError if a reused connection fails before the
+        write completes; any later error (e.g. a read timeout) is raised as
+        is, since the cryostat may already have acted on the commands.
+        """
+        reused = self._sock is not None
+        # Replace a socket the cryostat closed while it sat idle
+        if reused and not self._is_alive():
+            self.close()
+        try:
+            self.connect()
+            self._sock.sendall(b"".join(self.encode(c) for c in commands))
+        except OSError as e:
+            self.close()
+            if reused:
+                raise CommandsNotSentError(f"Connection lost before sending: {e}") from e
+            raise
+        try:
+            return [self._read_frame() for _ in commands]
+        except OSError:
+            self.close()
+            raise
+
+    def send(self, command: str) -> str:
+        """Sends one command and returns its response."""
+        return self.pipeline([command])[0]
+
+
+connection_manager.register_driver(
+    "montana-text",
+    connect=lambda ip: CryoTextClient(ip).connect(),
+    close=lambda client: client.close(),
+    is_fatal=lambda exc: isinstance(exc, (OSError, ConnectionError))
+)
+
+def cryo_text_session(ip: str):
+    """
+    Context manager yielding the shared text-protocol client for an IP.
+    Usage: with cryo_text_session(ip) as client: client.send("GPS")
+    """
+    return connection_manager.session("montana-text", ip)
@@ -2,11 +2,11 @@ import sys
 import requests
 import json
 import time
-import socket
-import struct
 from pathlib import Path
+from typing import List
 
-CRYO_PORT = 7773
+from .manager import connection_manager
+from .cryo_text import CRYO_PORT, CommandsNotSentError, cryo_text_session
 
 # Dynamic Path Setup
 current_dir = Path(__file__).resolve().parent
@@ -27,19 +27,57 @@ try:
 except ImportError:
     scryostation = None
 
-# Patch Requests
-_cryo_session = requests.Session()
-def persistent_get(url, params=None, **kwargs):
-    return _cryo_session.get(url=url, params=params, **kwargs)
-requests.get = persistent_get
+try:
+    import asyncgenericcryostat
+except ImportError:
+    asyncgenericcryostat = None
+
+def _split_address(ip: str):
+    """Splits "host" or "host:port" (e.g. a local simulator) into (host, port)."""
+    if ":" in ip:
+        host, port = ip.rsplit(":", 1)
+        return host, int(port)
+    return ip, 47101
+
+# Keep-alive session for the direct REST fallback below.
+# (SCryostation has its own pooled session inside instrument.Instrument.)
+_rest_session = requests.Session()
+
+# Shared Sessions
+def _check_cryo(cryo):
+    """Raises if the REST server stopped answering."""
+    if not cryo.is_up():
+        raise ConnectionError("Cryostat not responding")
+
+def _is_connection_error(exc: Exception) -> bool:
+    """Only transport failures drop the session; API errors keep it."""
+    if isinstance(exc, (requests.exceptions.RequestException, ConnectionError)):
+        return True
+    return type(exc).__name__ == "NotConnected"
+
+connection_manager.register_driver(
+    "montana",
+    connect=lambda ip: scryostation.SCryostation(_split_address(ip)[0], port=_split_address(ip)[1]),
+    check=_check_cryo,
+    close=lambda cryo: cryo.close(),
+    is_fatal=_is_connection_error
+)
+
+def cryo_session(ip: str):
+    """
+    Context manager yielding the shared SCryostation for an IP.
+    Usage: with cryo_session(ip) as cryo: ...
+    """
+    return connection_manager.session("montana", ip)
 
 # Helper: Direct REST Fallback
 def _send_rest_put(ip: str, endpoint: str, data_payload):
     """Sends a PUT request with correct JSON headers (Fix for Error 400)."""
-    url = f"http://{ip}:47101/v1/{endpoint}"
+    host, port = _split_address(ip)
+    url = f"http://{host}:{port}/v1/{endpoint}"
     headers = {'Content-Type': 'application/json'}
     try:
-        resp = requests.put(url, data=json.dumps(data_payload), headers=headers, timeout=5)
+        resp = _rest_session.put(url, data=json.dumps(data_payload), headers=headers, timeout=5)
         if resp.status_code in [200, 204]:
             return True, "Success"
         else:
@@ -47,35 +85,108 @@ def _send_rest_put(ip: str, endpoint: str, data_payload):
     except Exception as e:
         return False, str(e)
 
+def _snapshot_fields(snap) -> dict:
+    return {
+        "temperature_k": float(snap.temperature or 0.0),
+        "temperature_stability_k": float(snap.stability or 0.0),
+        "temperature_stable": bool(snap.stable),
+        "stability_ok": bool(snap.stability_ok)
+    }
+
+def _read_thermometer(cryo) -> dict:
+    """Platform temperature, stability and stable flag from one sample GET."""
+    if hasattr(cryo, 'get_platform_snapshot'):
+        return _snapshot_fields(cryo.get_platform_snapshot())
+
+    temp = cryo.get_temperature() if hasattr(cryo, 'get_temperature') else 0.0
+    return {"temperature_k": float(temp)}
+
+def _read_pressure(cryo) -> float:
+    return cryo.get_pressure() if hasattr(cryo, 'get_pressure') else 0.0
+
+def _read_magnet_field(cryo) -> float:
+    field = 0.0
+    # Try different naming conventions for Magneto-Optic vs Standard
+    if hasattr(cryo, 'get_magnet_target_field'):
+        field = cryo.get_magnet_target_field()
+    elif hasattr(cryo, 'getMagnetTargetField'):
+         field = cryo.getMagnetTargetField()
+    elif hasattr(cryo, 'get_mo_target_field'): # Specific to Magneto-Optic
+         field = cryo.get_mo_target_field()
+    return field
+
+# Single-group readers (used by the telemetry scheduler). These raise on errors.
+def get_cryostat_temperature(ip: str) -> dict:
+    if not scryostation: raise RuntimeError("Library Import Failed")
+    with cryo_session(ip) as cryo:
+        return _read_thermometer(cryo)
+
+# Async readers share one AsyncGenericCryostat per IP
+_async_cryos = {}
+
+def _async_cryo(ip: str):
+    cryo = _async_cryos.get(ip)
+    if cryo is None:
+        host, port = _split_address(ip)
+        cryo = asyncgenericcryostat.AsyncGenericCryostat(host, port=port)
+        _async_cryos[ip] = cryo
+    return cryo
+
+async def close_async_cryos():
+    """Closes the keep-alive connections of every async client."""
+    for cryo in list(_async_cryos.values()):
+        await cryo.close()
+
+async def with_async_cryos(coro):
+    """
+    Awaits coro, then closes the async connections it opened while its
+    event loop is still running. Wrap every asyncio.run() that uses the
+    async readers: asyncio.run(with_async_cryos(...)). Connections left
+    open when the loop closes can't be closed later and would leak.
+    """
+    try:
+        return await coro
+    finally:
+        await close_async_cryos()
+
+async def get_cryostat_temperature_async(ip: str) -> dict:
+    """Non-blocking get_cryostat_temperature (for the scheduler and wait actions)."""
+    if not (scryostation and asyncgenericcryostat): raise RuntimeError("Library Import Failed")
+    snap = await _async_cryo(ip).get_thermometer_snapshot(scryostation.Channels['platform'])
+    return _snapshot_fields(snap)
+
+def get_cryostat_pressure(ip: str) -> dict:
+    if not scryostation: raise RuntimeError("Library Import Failed")
+    with cryo_session(ip) as cryo:
+        return {"pressure_torr": float(_read_pressure(cryo))}
+
+def get_cryostat_magnet(ip: str) -> dict:
+    if not scryostation: raise RuntimeError("Library Import Failed")
+    with cryo_session(ip) as cryo:
+        return {"magnet_field_tesla": float(_read_magnet_field(cryo))}
+
 def get_cryostat_details(ip: str) -> dict:
     """Fetches current status (Temp, Pressure, Magnet)."""
     if not scryostation:
         return {"status": "Error", "details": "Library Import Failed"}
 
     try:
-        cryo = scryostation.SCryostation(ip)
-
-        # Temp & Pressure
-        temp = cryo.get_temperature() if hasattr(cryo, 'get_temperature') else 0.0
-        pressure = cryo.get_pressure() if hasattr(cryo, 'get_pressure') else 0.0
-
-        # Magnet
-        field = 0.0
-        # Try different naming conventions for Magneto-Optic vs Standard
-        if hasattr(cryo, 'get_magnet_target_field'):
-            field = cryo.get_magnet_target_field()
-        elif hasattr(cryo, 'getMagnetTargetField'):
-             field = cryo.getMagnetTargetField()
-        elif hasattr(cryo, 'get_mo_target_field'): # Specific to Magneto-Optic
-             field = cryo.get_mo_target_field()
-
-        return {
+        with cryo_session(ip) as cryo:
+            # Temp (single sample snapshot) & Pressure
+            thermometer = _read_thermometer(cryo)
+            pressure = _read_pressure(cryo)
+
+            # Magnet
+            field = _read_magnet_field(cryo)
+
+        details = {
             "status": "Active",
-            "temperature_k": float(temp),
             "pressure_torr": float(pressure),
             "magnet_field_tesla": float(field),
             "details": "Connected"
         }
+        details.update(thermometer)
+        return details
     except Exception as e:
         return {"status": "Connection Error", "details": str(e)}
 
@@ -84,14 +195,14 @@ def set_temperature(ip: str, target_k: float) -> str:
     if not scryostation: return "Library missing"
 
     try:
-        cryo = scryostation.SCryostation(ip)
-        # Try Library Method
-        if hasattr(cryo, 'set_platform_target_temperature'):
-            cryo.set_platform_target_temperature(target_k)
-            return f"Command sent: Set Temp to {target_k} K"
-        elif hasattr(cryo, 'setRenderTargetTemperature'):
-            cryo.setRenderTargetTemperature(target_k)
-            return f"Command sent: Set Temp to {target_k} K"
+        with cryo_session(ip) as cryo:
+            # Try Library Method
+            if hasattr(cryo, 'set_platform_target_temperature'):
+                cryo.set_platform_target_temperature(target_k)
+                return f"Command sent: Set Temp to {target_k} K"
+            elif hasattr(cryo, 'setRenderTargetTemperature'):
+                cryo.setRenderTargetTemperature(target_k)
+                return f"Command sent: Set Temp to {target_k} K"
 
         # Fallback to REST
         success, msg = _send_rest_put(ip, "controller/properties/platformTargetTemperature", target_k)
@@ -108,31 +219,30 @@ def set_magnet_field(ip: str, target_tesla: float) -> str:
     # Can add a software limit here
 
     try:
-        cryo = scryostation.SCryostation(ip)
-
-        # Ensure Magnet is Enabled
-        # Try library methods to enable
-        try:
-            if hasattr(cryo, 'set_magnet_state'): cryo.set_magnet_state(True)
-            elif hasattr(cryo, 'setMagnetState'): cryo.setMagnetState(True)
-        except:
-            pass # Continue to try setting field anyway
-
-        # Set Field
-        # Try Library Method (Standard)
-        if hasattr(cryo, 'set_magnet_target_field'):
-            cryo.set_magnet_target_field(target_tesla)
-            return f"Command sent: Field {target_tesla} T"
-
-        # Try Library Method (CamelCase)
-        elif hasattr(cryo, 'setMagnetTargetField'):
-            cryo.setMagnetTargetField(target_tesla)
-            return f"Command sent: Field {target_tesla} T"
-
-        # Try Library Method (Magneto-Optic module specific)
-        elif hasattr(cryo, 'set_mo_target_field'):
-            cryo.set_mo_target_field(target_tesla)
-            return f"Command sent: MO Field {target_tesla} T"
+        with cryo_session(ip) as cryo:
+            # Ensure Magnet is Enabled
+            # Try library methods to enable
+            try:
+                if hasattr(cryo, 'set_magnet_state'): cryo.set_magnet_state(True)
+                elif hasattr(cryo, 'setMagnetState'): cryo.setMagnetState(True)
+            except:
+                pass # Continue to try setting field anyway
+
+            # Set Field
+            # Try Library Method (Standard)
+            if hasattr(cryo, 'set_magnet_target_field'):
+                cryo.set_magnet_target_field(target_tesla)
+                return f"Command sent: Field {target_tesla} T"
+
+            # Try Library Method (CamelCase)
+            elif hasattr(cryo, 'setMagnetTargetField'):
+                cryo.setMagnetTargetField(target_tesla)
+                return f"Command sent: Field {target_tesla} T"
+
+            # Try Library Method (Magneto-Optic module specific)
+            elif hasattr(cryo, 'set_mo_target_field'):
+                cryo.set_mo_target_field(target_tesla)
+                return f"Command sent: MO Field {target_tesla} T"
 
         # Fallback to REST
         success, msg = _send_rest_put(ip, "magnet/targetField", target_tesla)
@@ -146,36 +256,30 @@ def set_magnet_field(ip: str, target_tesla: float) -> str:
     except Exception as e:
         return f"Error setting field: {e}"
 
-def _send_cryo_command(ip: str, cmd_str: str) -> str:
+def send_cryo_commands(ip: str, commands: List[str]) -> List[str]:
+    """
+    Sends text commands over the shared port 7773 connection in one write
+    and returns the responses in order. Raises on connection errors.
+
+    Commands are only sent again (once, on a fresh connection) if a reused
+    connection failed before they were written. Once they have gone out,
+    errors are raised: SMTZ, SVPR/SVPS, SCD/SWU etc. must not run twice.
+    """
+    for attempt in range(2):
+        try:
+            with cryo_text_session(_split_address(ip)[0]) as client:
+                return client.pipeline(commands)
+        except CommandsNotSentError:
+            if attempt == 1:
+                raise
+
+def send_cryo_command(ip: str, cmd_str: str) -> str:
     """
     Sends a text command to the Cryostation using the required 2-byte length
     prefix protocol
     """
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(3.0) # Set a reasonable timeout
-            s.connect((ip, CRYO_PORT))
-
-            # Protocol: 2 bytes length + Command String
-            # Encode the length as a 2-byte unsigned short
-            # (Big Endian standard for network)
-            cmd_bytes = cmd_str.encode('ascii')
-            length_prefix = struct.pack('>H', len(cmd_bytes))
-
-            # Send full message
-            s.sendall(length_prefix + cmd_bytes)
-
-            # Receive Response Length (First 2 bytes)
-            resp_len_bytes = s.recv(2)
-            if not resp_len_bytes:
-                return "Error: No response"
-
-            resp_len = struct.unpack('>H', resp_len_bytes)[0]
-
-            # Receive Response Body
-            response = s.recv(resp_len).decode('ascii')
-            return response
-
+        return send_cryo_commands(ip, [cmd_str])[0]
     except Exception as e:
         return f"Error: {str(e)}"
 
@@ -194,5 +298,5 @@ def set_vacuum_pump(ip: str, enable: bool) -> str:
     # SVPS = Set Vacuum Pump Stopped
     command = "SVPR" if enable else "SVPS"
 
-    response = _send_cryo_command(ip, command)
+    response = send_cryo_command(ip, command)
     return response
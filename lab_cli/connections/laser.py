@@ -1,63 +1,170 @@
 import sys
+from operator import attrgetter
+from typing import Optional
+
+from .manager import connection_manager
 
 # Try importing the SDK
 try:
     from toptica.lasersdk.dlcpro.v2_0_3 import DLCpro, NetworkConnection, DeviceNotFoundError
 except ImportError:
     DLCpro = None
+    class DeviceNotFoundError(Exception):
+        pass
     print("Warning: 'toptica-lasersdk' not installed. Laser connections will fail.")
 
+try:
+    from toptica.lasersdk.client import DeviceTimeoutError
+except ImportError:
+    class DeviceTimeoutError(Exception):
+        pass
+
+# Addresses starting with this use the in-process simulator (simulators/dlcpro.py)
+SIM_PREFIX = "sim://"
+
+# Recorder signal ids (toptica.lasersdk.utils.dlcpro.SignalChannel)
+SIGNAL_NONE = -3
+SIGNAL_TIME = -2
+SIGNAL_CTL_POWER = 70
+SIGNAL_CTL_WAVELENGTH_ACT = 79
+SIGNAL_FINE_IN1 = 0
+
+def is_simulated(address: Optional[str]) -> bool:
+    return bool(address) and address.startswith(SIM_PREFIX)
+
+def _open_dlc(ip: str):
+    """Opens a DLC Pro session that stays connected until closed."""
+    if is_simulated(ip):
+        # Only loaded for sim://<name> addresses
+        from ..simulators.dlcpro import get_simulator
+        dlc = get_simulator(ip)
+    else:
+        dlc = DLCpro(NetworkConnection(ip))
+    dlc.open()
+    return dlc
+
+def _check_dlc(dlc):
+    """Cheap round trip used as a health check."""
+    dlc.system_health_txt.get()
+
+def _is_transport_error(exc: Exception) -> bool:
+    """
+    Only connection failures drop the session. Bad values, rejected
+    parameters and errors in our own code keep it, along with its state()
+    (settings already written, resonance tracks). Wrapped errors such as
+    RecorderDownloadError are judged by their cause.
+    """
+    while exc is not None:
+        if isinstance(exc, (OSError, DeviceNotFoundError, DeviceTimeoutError)):
+            return True
+        exc = exc.__cause__
+    return False
+
+connection_manager.register_driver(
+    "dlcpro",
+    connect=_open_dlc,
+    check=_check_dlc,
+    close=lambda dlc: dlc.close(),
+    is_fatal=_is_transport_error
+)
+
+def dlc_session(ip: str):
+    """
+    Context manager yielding the shared DLC Pro session for an IP.
+    Usage: with dlc_session(ip) as dlc: ...
+    """
+    return connection_manager.session("dlcpro", ip)
+
+def set_param(ip: str, dlc, name: str, value) -> bool:
+    """
+    Writes a parameter by dotted name (e.g. "laser1.wide_scan.speed")
+    unless this session already wrote the same value. Returns True if
+    the write was sent.
+    """
+    written = connection_manager.state("dlcpro", ip).setdefault("written", {})
+    if name in written and written[name] == value:
+        return False
+    # Forget the old value first in case the write fails half-way
+    written.pop(name, None)
+    attrgetter(name)(dlc).set(value)
+    written[name] = value
+    return True
+
+def _read_health(dlc) -> dict:
+    """Health text and emission state (one status request)."""
+    # .strip() removes whitespace, .upper() ensures "ok" matches "OK"
+    health_txt = dlc.system_health_txt.get().strip()
+    is_healthy = health_txt.upper() == "OK"
+
+    # Get Emission State
+    emission = dlc.laser1.emission.get()
+
+    return {
+        "status": "Active" if is_healthy else "Warning",
+        "emission_active": bool(emission),
+        "details": f"Health: {health_txt}"
+    }
+
+def _read_optics(dlc) -> dict:
+    """Actual wavelength and power."""
+    # Get Wavelength
+    try:
+        if hasattr(dlc.laser1, 'ctl'):
+            wavelength = dlc.laser1.ctl.wavelength_act.get()
+        elif hasattr(dlc.laser1, 'wide_scan'):
+            # Fallback for other models if CTL isn't present
+            wavelength = dlc.laser1.wide_scan.scan_begin.get()
+        else:
+            wavelength = 0.0
+    except Exception:
+        wavelength = 0.0
+
+    # Get Power
+    # Try the stabilization input first (most accurate for experiments)
+    # If that fails, we check the 'power' attribute under ctl
+    power = 0.0
+    try:
+        # Primary Method: Power Stabilization Input
+        if hasattr(dlc.laser1, 'power_stabilization'):
+            power = dlc.laser1.power_stabilization.input_channel_value_act.get()
+        # Secondary Method: CTL Power Reading
+        elif hasattr(dlc.laser1, 'ctl') and hasattr(dlc.laser1.ctl, 'power'):
+             power = dlc.laser1.ctl.power.get()
+    except Exception:
+        power = 0.0
+
+    return {
+        "wavelength_nm": float(wavelength),
+        "power_mw": float(power)
+    }
+
+def get_laser_health(ip: str) -> dict:
+    """Reads health/emission only. Raises on connection errors."""
+    if DLCpro is None and not is_simulated(ip):
+        raise RuntimeError("SDK Missing")
+    with dlc_session(ip) as dlc:
+        return _read_health(dlc)
+
+def get_laser_optics(ip: str) -> dict:
+    """Reads wavelength/power only. Raises on connection errors."""
+    if DLCpro is None and not is_simulated(ip):
+        raise RuntimeError("SDK Missing")
+    with dlc_session(ip) as dlc:
+        return _read_optics(dlc)
+
 def get_laser_details(ip: str) -> dict:
     """
     Connects to Toptica DLC Pro via SDK and fetches live data.
     """
-    if DLCpro is None:
+    if DLCpro is None and not is_simulated(ip):
         return {"status": "Error", "details": "SDK Missing"}
 
     try:
-        # Connect to the laser
-        with DLCpro(NetworkConnection(ip)) as dlc:
-            # Get Health Status
-            # .strip() removes whitespace, .upper() ensures "ok" matches "OK"
-            health_txt = dlc.system_health_txt.get().strip()
-            is_healthy = health_txt.upper() == "OK"
-
-            # Get Emission State
-            emission = dlc.laser1.emission.get()
-
-            # Get Wavelength
-            try:
-                if hasattr(dlc.laser1, 'ctl'):
-                    wavelength = dlc.laser1.ctl.wavelength_act.get()
-                elif hasattr(dlc.laser1, 'wide_scan'):
-                    # Fallback for other models if CTL isn't present
-                    wavelength = dlc.laser1.wide_scan.scan_begin.get()
-                else:
-                    wavelength = 0.0
-            except Exception:
-                wavelength = 0.0
-
-            # Get Power
-            # Try the stabilization input first (most accurate for experiments)
-            # If that fails, we check the 'power' attribute under ctl
-            power = 0.0
-            try:
-                # Primary Method: Power Stabilization Input
-                if hasattr(dlc.laser1, 'power_stabilization'):
-                    power = dlc.laser1.power_stabilization.input_channel_value_act.get()
-                # Secondary Method: CTL Power Reading
-                elif hasattr(dlc.laser1, 'ctl') and hasattr(dlc.laser1.ctl, 'power'):
-                     power = dlc.laser1.ctl.power.get()
-            except Exception:
-                power = 0.0
-
-            return {
-                "status": "Active" if is_healthy else "Warning",
-                "emission_active": bool(emission),
-                "wavelength_nm": float(wavelength),
-                "power_mw": float(power),
-                "details": f"Health: {health_txt}"
-            }
+        # Reuse the shared session for the laser
+        with dlc_session(ip) as dlc:
+            details = _read_health(dlc)
+            details.update(_read_optics(dlc))
+            return details
 
     except DeviceNotFoundError:
         return {
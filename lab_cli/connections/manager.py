@@ -0,0 +1,157 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# A session that has been idle for longer than this (seconds) is health
+# checked before it is handed out again.
+HEALTH_CHECK_INTERVAL = 30.0
+
+
+class _Driver:
+    def __init__(self, connect: Callable[[str], Any],
+                 check: Optional[Callable[[Any], Any]],
+                 close: Optional[Callable[[Any], Any]],
+                 is_fatal: Optional[Callable[[Exception], bool]]):
+        self.connect = connect
+        self.check = check
+        self.close = close
+        self.is_fatal = is_fatal or (lambda exc: True)
+
+
+class _Session:
+    def __init__(self, handle: Any):
+        self.handle = handle
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        # Per-connection scratch data, e.g. values already written
+        self.state: Dict[str, Any] = {}
+
+
+class ConnectionManager:
+    """
+    Keeps one live session per (driver, address) for the whole process.
+
+    Sessions are opened lazily on first use, health checked when they have
+    been idle for a while, and dropped when a call on them fails with an
+    error the driver considers fatal, so the next user reconnects. Each
+    session carries its own lock: only one thread talks to a device at a
+    time, while different devices are used concurrently.
+    """
+
+    def __init__(self, health_check_interval: float = HEALTH_CHECK_INTERVAL):
+        self.health_check_interval = health_check_interval
+        self._drivers: Dict[str, _Driver] = {}
+        self._sessions: Dict[Tuple[str, str], _Session] = {}
+        self._lock = threading.Lock()
+
+    def register_driver(self, kind: str, connect: Callable[[str], Any],
+                        check: Optional[Callable[[Any], Any]] = None,
+                        close: Optional[Callable[[Any], Any]] = None,
+                        is_fatal: Optional[Callable[[Exception], bool]] = None):
+        """
+        Registers how to open, health check and close one kind of session.
+
+        Args:
+            kind: Driver name, e.g. "dlcpro".
+            connect: Opens a session for an address and returns the handle.
+            check: Raises if the handle is no longer usable.
+            close: Releases the handle.
+            is_fatal: Returns True if an exception raised while using the
+                handle means the session must be dropped (default: always).
+        """
+        self._drivers[kind] = _Driver(connect, check, close, is_fatal)
+
+    def _get_session(self, kind: str, address: str) -> _Session:
+        driver = self._drivers.get(kind)
+        if driver is None:
+            raise KeyError(f"No connection driver registered for '{kind}'")
+
+        with self._lock:
+            session = self._sessions.get((kind, address))
+            if session is None:
+                session = _Session(None)
+                self._sessions[(kind, address)] = session
+        return session
+
+    def _close_handle(self, kind: str, session: _Session):
+        driver = self._drivers[kind]
+        handle, session.handle = session.handle, None
+        session.state.clear()
+        if handle is not None and driver.close:
+            try:
+                driver.close(handle)
+            except Exception:
+                pass
+
+    @contextmanager
+    def session(self, kind: str, address: str):
+        """
+        Yields the live handle for a device, connecting if necessary.
+
+        Usage:
+            with connection_manager.session("dlcpro", ip) as dlc:
+                dlc.laser1.emission.get()
+        """
+        driver = self._drivers.get(kind)
+        session = self._get_session(kind, address)
+
+        with session.lock:
+            # Health check sessions that have been sitting idle
+            idle = time.monotonic() - session.last_used
+            if session.handle is not None and driver.check and idle > self.health_check_interval:
+                try:
+                    driver.check(session.handle)
+                except Exception:
+                    self._close_handle(kind, session)
+
+            if session.handle is None:
+                session.handle = driver.connect(address)
+
+            try:
+                yield session.handle
+            except Exception as e:
+                if driver.is_fatal(e):
+                    self._close_handle(kind, session)
+                raise
+            finally:
+                session.last_used = time.monotonic()
+
+    def state(self, kind: str, address: str) -> Dict[str, Any]:
+        """
+        Scratch dict tied to the current connection to a device. It is
+        emptied whenever that connection is closed, so anything cached in it
+        (e.g. settings already written) never outlives the session.
+        """
+        return self._get_session(kind, address).state
+
+    def clear_state(self):
+        """Empties every session's scratch dict (the connections stay open)."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            with session.lock:
+                session.state.clear()
+
+    def invalidate(self, kind: str, address: str):
+        """Closes a session so the next user reconnects."""
+        with self._lock:
+            session = self._sessions.get((kind, address))
+        if session is not None:
+            with session.lock:
+                self._close_handle(kind, session)
+
+    def close_all(self):
+        """Closes every open session."""
+        with self._lock:
+            sessions = list(self._sessions.items())
+            self._sessions.clear()
+        for (kind, _), session in sessions:
+            with session.lock:
+                self._close_handle(kind, session)
+
+
+# Process-wide instance shared by equipment_api and the actions
+connection_manager = ConnectionManager()
+atexit.register(connection_manager.close_all)
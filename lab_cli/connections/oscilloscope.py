@@ -3,12 +3,37 @@ import platform
 import datetime
 import time
 
+from .manager import connection_manager
+
 def find_visa_library():
     if platform.system() == "Windows":
         return None
     else:
         return None
 
+# Shared Sessions
+_resource_manager = None
+
+def _get_resource_manager():
+    """One VISA resource manager for the whole process."""
+    global _resource_manager
+    if _resource_manager is None:
+        _resource_manager = pyvisa.ResourceManager()
+    return _resource_manager
+
+def _open_scope(address: str):
+    scope = _get_resource_manager().open_resource(address)
+    scope.timeout = 15000
+    return scope
+
+connection_manager.register_driver(
+    "visa",
+    connect=_open_scope,
+    check=lambda scope: scope.query("*IDN?"),
+    close=lambda scope: scope.close(),
+    is_fatal=lambda exc: isinstance(exc, pyvisa.errors.VisaIOError)
+)
+
 def connect_oscilloscope():
     """
     Connects to the oscilloscope by first finding the VISA resource manager
@@ -16,8 +41,7 @@ def connect_oscilloscope():
     """
     scope = None
     try:
-        rm_oscil = pyvisa.ResourceManager()
-        scope = rm_oscil.open_resource("TCPIP0::192.168.0.92::inst0::INSTR")
+        scope = _get_resource_manager().open_resource("TCPIP0::192.168.0.92::inst0::INSTR")
         scope.write_termination = '\n'
         scope.read_termination = '\n'
         scope.timeout = 15000
@@ -40,18 +64,16 @@ def capture_scope_screen(scope_address: str, save_path: str = "."):
     """
     Connects to an oscilloscope, captures its screen, and saves it as a PNG file.
     """
-    scope = None
     try:
-        rm = pyvisa.ResourceManager()
-        scope = rm.open_resource(scope_address)
-        scope.timeout = 15000
+        with connection_manager.session("visa", scope_address) as scope:
+            scope.timeout = 15000
 
-        print("Requesting screen data from oscilloscope...")
-        image_data = scope.query_binary_values(
-            ':DISPlay:DATA? PNG, COLor',
-            datatype='B',
-            container=bytes
-        )
+            print("Requesting screen data from oscilloscope...")
+            image_data = scope.query_binary_values(
+                ':DISPlay:DATA? PNG, COLor',
+                datatype='B',
+                container=bytes
+            )
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"{save_path}/keysight_capture_{timestamp}.png"
@@ -65,10 +87,6 @@ def capture_scope_screen(scope_address: str, save_path: str = "."):
     except pyvisa.errors.VisaIOError as e:
         print(f"VISA Error: Could not communicate with the scope. Details: {e}")
         return False
-    finally:
-        if scope:
-            scope.close()
-        print("Connection closed.")
 
 
 def arm_and_capture(scope_address: str, save_path: str = "."):
@@ -76,30 +94,35 @@ def arm_and_capture(scope_address: str, save_path: str = "."):
     Arms the oscilloscope to wait for an external trigger,
     and saves the screen once the acquisition is complete.
     """
-    scope = None
     try:
-        rm = pyvisa.ResourceManager()
-        scope = rm.open_resource(scope_address)
-        scope.timeout = 20000
-        scope.clear()
-
-        print("Configuring oscilloscope for single external trigger...")
-        scope.write(':STOP')
-        scope.write(':TRIGger:SWEep NORMal')
-        scope.write(':TRIGger:EDGE:SOURce EXTernal')
-        scope.write(':SINGle')
-
-        print("Oscilloscope armed. Waiting for trigger signal...")
-        scope.query('*OPC?')
-        print("Trigger received and acquisition complete!")
-        time.sleep(1)
+        with connection_manager.session("visa", scope_address) as scope:
+            scope.timeout = 20000
+            scope.clear()
 
-        print("Requesting screen data...")
-        image_data = scope.query_binary_values(
-            ':DISPlay:DATA? PNG, COLor',
-            datatype='B',
-            container=bytes
-        )
+            try:
+                print("Configuring oscilloscope for single external trigger...")
+                scope.write(':STOP')
+                scope.write(':TRIGger:SWEep NORMal')
+                scope.write(':TRIGger:EDGE:SOURce EXTernal')
+                scope.write(':SINGle')
+
+                print("Oscilloscope armed. Waiting for trigger signal...")
+                scope.query('*OPC?')
+                print("Trigger received and acquisition complete!")
+                time.sleep(1)
+
+                print("Requesting screen data...")
+                image_data = scope.query_binary_values(
+                    ':DISPlay:DATA? PNG, COLor',
+                    datatype='B',
+                    container=bytes
+                )
+            finally:
+                # Leave the scope running for the next user of the session
+                try:
+                    scope.write(":RUN")
+                except pyvisa.errors.VisaIOError:
+                    pass
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"{save_path}/triggered_capture_{timestamp}.png"
@@ -116,11 +139,6 @@ def arm_and_capture(scope_address: str, save_path: str = "."):
         else:
             print(f"\nVISA Error: {e}")
         return False
-    finally:
-        if scope:
-            scope.write(":RUN")
-            scope.close()
-        print("Connection closed.")
 
 if __name__ == "__main__":
     print("Connecting to oscilloscope...")
@@ -0,0 +1,232 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+# Recorder binary blocks: id letter, payload length in bytes (ASCII), NUL,
+# payload as little-endian float32.
+BLOCK_DTYPE = np.dtype("<f4")
+
+# Chunk sizing for recorder.data.get_data()
+MIN_CHUNK = 1024
+MAX_CHUNK = 65536
+TARGET_CALL_TIME = 0.25   # seconds per get_data() call to aim for
+
+# A failed chunk is retried this many times (smaller, after a pause)
+CHUNK_RETRIES = 3
+RETRY_DELAY = 0.5
+
+# How often stream_recorder() checks for new samples during a scan (seconds)
+STREAM_POLL_INTERVAL = 0.2
+
+class RecorderDownloadError(RuntimeError):
+    """A chunk kept failing. `partial` holds the samples read before it."""
+
+    def __init__(self, message: str, partial: Dict[str, np.ndarray]):
+        super().__init__(message)
+        self.partial = partial
+
+def _headers(raw: bytes):
+    """Yields (block_id, payload offset, sample count) for each block."""
+    i = 0
+    while i < len(raw):
+        end = raw.index(b"\0", i + 1)
+        size = int(raw[i + 1:end])
+        yield chr(raw[i]), end + 1, size // BLOCK_DTYPE.itemsize
+        i = end + 1 + size
+
+def reply_samples(raw: bytes) -> int:
+    """Samples in a get_data() reply, read from the block headers only."""
+    return max((n for _, _, n in _headers(raw)), default=0)
+
+def decode_blocks_into(raw: bytes, out: Dict[str, np.ndarray], start: int,
+                       seen: Optional[set] = None) -> int:
+    """
+    Decodes one get_data() reply straight into out[block_id][start:...].
+    Blocks not in `out` are skipped; ids found are added to `seen`.
+    Returns the number of samples in the reply.
+    """
+    count = 0
+    for block_id, offset, n in _headers(raw):
+        target = out.get(block_id)
+        if target is not None:
+            n = min(n, len(target) - start)
+            target[start:start + n] = np.frombuffer(raw, dtype=BLOCK_DTYPE, count=n, offset=offset)
+            if seen is not None:
+                seen.add(block_id)
+        count = max(count, n)
+    return count
+
+class ChunkSizer:
+    """
+    Picks get_data() chunk sizes: doubles while calls stay under
+    TARGET_CALL_TIME, halves when they take much longer or fail.
+    """
+
+    def __init__(self, initial: int = MIN_CHUNK, target: float = TARGET_CALL_TIME):
+        self.size = initial
+        self.target = target
+
+    def record(self, samples: int, elapsed: float):
+        if samples < self.size:
+            return
+        if elapsed < self.target / 2:
+            self.size = min(MAX_CHUNK, self.size * 2)
+        elif elapsed > self.target * 2:
+            self.size = max(MIN_CHUNK, self.size // 2)
+
+    def failed(self):
+        self.size = max(MIN_CHUNK, self.size // 2)
+
+def _fetch_chunk(data, index: int, chunk: int, sizer: ChunkSizer, retries: int) -> bytes:
+    """One get_data() call, retried with a smaller chunk if it fails."""
+    for attempt in range(retries + 1):
+        started = time.monotonic()
+        try:
+            raw = data.get_data(index, chunk)
+        except Exception:
+            if attempt == retries:
+                raise
+            sizer.failed()
+            chunk = min(chunk, sizer.size)
+            time.sleep(RETRY_DELAY * (attempt + 1))
+            continue
+        sizer.record(chunk, time.monotonic() - started)
+        return raw
+
+class RecorderReader:
+    """
+    Reads recorder memory into preallocated NumPy arrays, one per block id
+    ('x' = channel x, 'y' = channel 1, 'Y' = channel 2), a range at a time.
+
+    fetch() can be called repeatedly with a growing limit, e.g. while the
+    recorder is still running; it continues where the last call stopped.
+    Arrays start at `capacity` samples and grow if more are recorded.
+
+    With `pipelined`, replies are decoded on a worker thread while the next
+    get_data() request is already on the wire. A failed chunk is retried
+    `retries` times; if it still fails, RecorderDownloadError carries
+    everything read up to that point.
+    """
+
+    def __init__(self, dlc, blocks: Iterable[str] = "xy", capacity: int = 0,
+                 dtype=np.float32, sizer: Optional[ChunkSizer] = None,
+                 pipelined: bool = True, retries: int = CHUNK_RETRIES):
+        self.data = dlc.laser1.recorder.data
+        self.out = {b: np.empty(max(0, int(capacity)), dtype=dtype) for b in blocks}
+        self.sizer = sizer or ChunkSizer()
+        self.retries = retries
+        self.index = 0      # next sample to request
+        self._seen = set()
+        self._decoded = 0
+        self._pending = None   # (future, end index) of the chunk being decoded
+        self._decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recorder-decode") if pipelined else None
+
+    def _reserve(self, total: int):
+        """Grows the arrays to hold `total` samples."""
+        for b, a in self.out.items():
+            if len(a) < total:
+                self._wait()
+                grown = np.empty(max(total, len(a) * 2), dtype=a.dtype)
+                grown[:self._decoded] = a[:self._decoded]
+                self.out[b] = grown
+
+    def _wait(self):
+        """Finishes decoding the queued chunk."""
+        if self._pending:
+            self._pending[0].result()
+            self._decoded = self._pending[1]
+            self._pending = None
+
+    def fetch(self, limit: int) -> int:
+        """
+        Reads samples [index, limit). Stops early if the device has nothing
+        more. Returns the new index.
+        """
+        self._reserve(limit)
+        while self.index < limit:
+            chunk = min(self.sizer.size, limit - self.index)
+            try:
+                raw = _fetch_chunk(self.data, self.index, chunk, self.sizer, self.retries)
+            except Exception as e:
+                self._wait()
+                raise RecorderDownloadError(
+                    f"Recorder download failed at sample {self.index} of {limit}: {e}", self.result()
+                ) from e
+
+            if self._decoder is None:
+                n = decode_blocks_into(raw, self.out, self.index, self._seen)
+                self._decoded = self.index + n
+            else:
+                n = reply_samples(raw)
+                # Finish the previous chunk before queueing this one, so at
+                # most two replies are held in memory
+                self._wait()
+                self._pending = (self._decoder.submit(decode_blocks_into, raw, self.out,
+                                                      self.index, self._seen), self.index + n)
+            if n == 0:
+                break   # Nothing more recorded
+            self.index += n
+        return self.index
+
+    def result(self) -> Dict[str, np.ndarray]:
+        """Everything decoded so far, trimmed to the samples received."""
+        self._wait()
+        return {b: a[:self._decoded] for b, a in self.out.items() if b in self._seen}
+
+    def close(self):
+        if self._decoder:
+            self._decoder.shutdown(wait=True)
+
+def download_recorder(dlc, blocks: Iterable[str] = "xy", total: Optional[int] = None,
+                      dtype=np.float32, sizer: Optional[ChunkSizer] = None,
+                      pipelined: bool = True, retries: int = CHUNK_RETRIES) -> Dict[str, np.ndarray]:
+    """
+    Reads the whole recorder memory once recording has finished.
+
+    The arrays are sized from recorded_sample_count and each reply is decoded
+    directly into its slice, so no intermediate lists or copies are made.
+    Block ids the device did not send (e.g. a disabled channel) are left out
+    of the result. See RecorderReader for pipelining and retries.
+    """
+    if total is None:
+        total = int(dlc.laser1.recorder.data.recorded_sample_count.get())
+    reader = RecorderReader(dlc, blocks, total, dtype, sizer, pipelined, retries)
+    try:
+        reader.fetch(total)
+        return reader.result()
+    finally:
+        reader.close()
+
+def stream_recorder(dlc, is_running: Callable[[], bool], blocks: Iterable[str] = "xy",
+                    capacity: int = 0, poll_interval: float = STREAM_POLL_INTERVAL,
+                    dtype=np.float32, sizer: Optional[ChunkSizer] = None,
+                    pipelined: bool = True, retries: int = CHUNK_RETRIES,
+                    progress: Optional[Callable[[int], None]] = None) -> Dict[str, np.ndarray]:
+    """
+    Downloads recorder data while it is being recorded, so only the tail
+    is left to fetch once `is_running()` returns False.
+
+    While running, recorded_sample_count is polled and new samples are
+    pulled once at least MIN_CHUNK of them are waiting; otherwise it sleeps
+    `poll_interval`. `capacity` is the expected sample count (arrays grow
+    if the recorder returns more). `progress` gets the samples read so far.
+    """
+    data = dlc.laser1.recorder.data
+    reader = RecorderReader(dlc, blocks, capacity, dtype, sizer, pipelined, retries)
+    try:
+        while is_running():
+            available = int(data.recorded_sample_count.get())
+            if available - reader.index >= MIN_CHUNK:
+                reader.fetch(available)
+                if progress:
+                    progress(reader.index)
+            else:
+                time.sleep(poll_interval)
+
+        # Recording is over: fetch what's left
+        reader.fetch(int(data.recorded_sample_count.get()))
+        return reader.result()
+    finally:
+        reader.close()
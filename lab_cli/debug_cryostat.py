@@ -33,10 +33,6 @@ except ImportError as e:
 
 console.print(f"\n[bold blue]--- Inspecting Cryostat at {CRY_IP} ---[/bold blue]")
 
-# Patch requests
-_cryo_session = requests.Session()
-requests.get = lambda url, **kwargs: _cryo_session.get(url, **kwargs)
-
 # Import library
 if libs_path not in sys.path:
     sys.path.append(libs_path)
@@ -0,0 +1,61 @@
+# Min/max envelope decimation for plotting and previewing large sweeps
+from typing import Tuple
+
+import numpy as np
+
+# Default matplotlib figure: 6.4 in x 100 dpi
+DEFAULT_PLOT_WIDTH = 640
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+
+def minmax_indices(y: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of y in each of `bins` equal
+    slices, in their original order (2 per bin, so about 2 x bins).
+    Returns every index if y is already that short.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if bins <= 0 or n <= 2 * bins:
+        return np.arange(n)
+
+    per_bin = -(-n // bins)  # ceil
+    bins = -(-n // per_bin)
+    # Pad the last slice with its final value; argmin/argmax return the
+    # first occurrence, so padding is never picked over the real sample
+    rows = np.pad(y, (0, bins * per_bin - n), mode="edge").reshape(bins, per_bin)
+
+    offsets = np.arange(bins) * per_bin
+    lo = offsets + rows.argmin(axis=1)
+    hi = offsets + rows.argmax(axis=1)
+    # Keep each pair in x order so the line doesn't double back
+    pairs = np.stack([np.minimum(lo, hi), np.maximum(lo, hi)], axis=1).ravel()
+    return np.minimum(pairs, n - 1)
+
+def envelope(x: np.ndarray, y: np.ndarray, width: int = DEFAULT_PLOT_WIDTH) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a series to about 2 x width points while keeping every peak
+    and dip, e.g. for a plot `width` pixels wide.
+    """
+    idx = minmax_indices(y, width)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+def sparkline(y: np.ndarray, width: int = 60) -> str:
+    """One-line terminal preview of a series, built from its envelope."""
+    y = np.asarray(y, dtype=float)
+    if len(y) == 0:
+        return ""
+    values = y[minmax_indices(y, width)]
+    if len(values) > width:
+        # Each bin shows whichever of its min/max is further from the median,
+        # so both dips and peaks stay visible
+        pairs = values[: len(values) // 2 * 2].reshape(-1, 2)
+        median = np.median(y)
+        pick = np.abs(pairs[:, 1] - median) > np.abs(pairs[:, 0] - median)
+        values = pairs[np.arange(len(pairs)), pick.astype(int)]
+
+    lo, hi = values.min(), values.max()
+    if hi <= lo:
+        return SPARK_CHARS[len(SPARK_CHARS) // 2] * len(values)
+    levels = np.rint((values - lo) / (hi - lo) * (len(SPARK_CHARS) - 1)).astype(int)
+    return "".join(SPARK_CHARS[i] for i in levels)
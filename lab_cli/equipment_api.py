@@ -1,4 +1,6 @@
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 from typing import Dict, Optional, Any
 from datetime import datetime
 
@@ -26,35 +28,87 @@ EQUIPMENT_CONFIG = {
     }
 }
 
-def get_all_equipment() -> Dict[str, Any]:
-    """Fetches live status from all configured devices."""
-    results = {}
+# Polling
+# Each device gets its own deadline (seconds). A device may override it with
+# a "timeout" key in its EQUIPMENT_CONFIG entry.
+DEFAULT_POLL_TIMEOUT = 3.0
 
-    for eq_id, config in EQUIPMENT_CONFIG.items():
-        driver = config.get("driver")
-        ip = config.get("ip")
+_poll_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="equipment-poll")
+_poll_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}           # eq_id -> poll still running
+_last_good: Dict[str, Dict[str, Any]] = {}  # eq_id -> last completed reading
 
-        # Default Basic Info
-        device_data = {
-            "id": eq_id,
-            "type": config["type"],
-            "status": "Unknown",
-            "last_check": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+def _fetch_details(driver: Optional[str], ip: Optional[str]) -> Dict[str, Any]:
+    """Dispatches to the connection handler for a driver."""
+    if driver == "toptica_dlc":
+        return get_laser_details(ip)
+    elif driver == "montana":
+        return get_cryostat_details(ip)
+    elif driver == "mock":
+        return {"status": "Idle", "details": "Mock Device"}
+    return {}
 
-        # Dispatch to specific connection handler
-        if driver == "toptica_dlc":
-            details = get_laser_details(ip)
-            device_data.update(details)
+def _poll_device(eq_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Queries one device (runs on a poll worker thread)."""
+    # Default Basic Info
+    device_data = {
+        "id": eq_id,
+        "type": config["type"],
+        "status": "Unknown",
+        "last_check": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+    device_data.update(_fetch_details(config.get("driver"), config.get("ip")))
+    return device_data
 
-        elif driver == "montana":
-            details = get_cryostat_details(ip)
-            device_data.update(details)
+def _stale_result(eq_id: str, config: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    """Builds a partial result from the last good reading of a device."""
+    device_data = dict(_last_good.get(eq_id) or {
+        "id": eq_id,
+        "type": config["type"],
+        "last_check": None
+    })
+    device_data["status"] = "Timeout"
+    device_data["stale"] = True
+    device_data["details"] = reason
+    return device_data
+
+def get_all_equipment(timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Fetches live status from all configured devices concurrently.
+
+    Every device is queried at once and given its own deadline, so one slow
+    or offline device only costs its own timeout. Devices that miss their
+    deadline are returned with status "Timeout", "stale": True and their last
+    known readings. A poll that is still hanging from an earlier call is not
+    resubmitted; callers keep getting stale data until it returns.
+    """
+    started = time.monotonic()
+    futures: Dict[str, Future] = {}
+
+    with _poll_lock:
+        for eq_id, config in EQUIPMENT_CONFIG.items():
+            fut = _inflight.get(eq_id)
+            if fut is None or fut.done():
+                fut = _poll_executor.submit(_poll_device, eq_id, config)
+                _inflight[eq_id] = fut
+            futures[eq_id] = fut
 
-        elif driver == "mock":
-            device_data["status"] = "Idle"
-            device_data["details"] = "Mock Device"
+    results = {}
+    for eq_id, fut in futures.items():
+        config = EQUIPMENT_CONFIG[eq_id]
+        limit = timeout if timeout is not None else config.get("timeout", DEFAULT_POLL_TIMEOUT)
+        remaining = max(0.0, started + limit - time.monotonic())
+
+        try:
+            device_data = fut.result(timeout=remaining)
+        except FutureTimeoutError:
+            results[eq_id] = _stale_result(eq_id, config, f"No response within {limit:g}s")
+            continue
+        except Exception as e:
+            results[eq_id] = _stale_result(eq_id, config, f"Poll failed: {e}")
+            continue
 
+        _last_good[eq_id] = device_data
         results[eq_id] = device_data
 
     return results
@@ -74,10 +128,8 @@ def get_equipment_by_id(equipment_id: str) -> Optional[Dict[str, Any]]:
         "last_check": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-    if driver == "toptica_dlc":
-        device_data.update(get_laser_details(ip))
-    elif driver == "montana":
-        device_data.update(get_cryostat_details(ip))
+    if driver in ("toptica_dlc", "montana"):
+        device_data.update(_fetch_details(driver, ip))
     else:
         device_data["status"] = "Idle (Mock)"
 
@@ -0,0 +1,105 @@
+# Multi-dimensional sweep grids for run-loop
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ORDERS = ("serpentine", "raster", "slow-outer")
+DEFAULT_ORDER = "serpentine"
+
+Axis = Tuple[str, List[float]]
+
+
+def loop_values(start: float, end: float, step: float) -> List[float]:
+    """Values from start to end (included) in steps of `step`."""
+    import numpy as np
+    # Handle range direction
+    if start > end and step > 0: step = -step
+    # Add tiny buffer to include the end value
+    return [round(float(v), 5) for v in np.arange(start, end + step/10000.0, step)]
+
+def parse_axis(spec: str) -> Axis:
+    """
+    Parses one --axis option:
+        field=0:1:0.1        start:end:step (end included)
+        temp=4,10,50,300     explicit values, visited in that order
+    """
+    if "=" not in spec:
+        raise ValueError(f"Invalid axis '{spec}', expected name=start:end:step or name=v1,v2,...")
+    name, values = (part.strip() for part in spec.split("=", 1))
+    if not name.isidentifier():
+        raise ValueError(f"Invalid axis name '{name}'")
+
+    if ":" in values:
+        parts = values.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Invalid range '{values}' for {name}, expected start:end:step")
+        start, end, step = (float(p) for p in parts)
+        if step == 0:
+            raise ValueError(f"Step for {name} can't be zero")
+        points = loop_values(start, end, step)
+    else:
+        points = [float(v) for v in values.split(",") if v.strip()]
+    if not points:
+        raise ValueError(f"Axis {name} has no values")
+    return name, points
+
+def slew_cost(values: Sequence[float], rate: float = 1.0) -> float:
+    """Cost of visiting values in order: total distance x rate (e.g. s per unit)."""
+    return sum(abs(b - a) for a, b in zip(values, values[1:])) * rate
+
+def _serpentine(axes: Sequence[Axis]) -> List[Tuple[float, ...]]:
+    """Boustrophedon: every other pass over the inner axes runs backwards."""
+    name, values = axes[0]
+    if len(axes) == 1:
+        return [(v,) for v in values]
+    inner = _serpentine(axes[1:])
+    points = []
+    for i, v in enumerate(values):
+        for rest in (inner if i % 2 == 0 else reversed(inner)):
+            points.append((v,) + rest)
+    return points
+
+def _raster(axes: Sequence[Axis]) -> List[Tuple[float, ...]]:
+    """Every pass over the inner axes starts from their first value."""
+    points: List[Tuple[float, ...]] = [()]
+    for _, values in axes:
+        points = [p + (v,) for p in points for v in values]
+    return points
+
+def order_axes(axes: Sequence[Axis], slew: Optional[Dict[str, float]] = None) -> List[Axis]:
+    """
+    Sorts axes so the one that is most expensive to sweep end to end is
+    outermost (changes least often). `slew` gives the cost per unit of
+    each axis (e.g. seconds per tesla); axes without one cost 1 per unit.
+    """
+    slew = slew or {}
+    # sorted() is stable: equal costs keep the order they were given in
+    return sorted(axes, key=lambda a: -slew_cost(sorted(a[1]), slew.get(a[0], 1.0)))
+
+def grid_points(axes: Sequence[Axis], order: str = DEFAULT_ORDER,
+                slew: Optional[Dict[str, float]] = None) -> List[Dict[str, float]]:
+    """
+    Every combination of axis values, as {name: value} dicts in visit order.
+
+    The first axis is outermost. "raster" restarts the inner axes on each
+    step of the outer ones; "serpentine" reverses them instead, so each
+    move changes one axis by one step; "slow-outer" first puts the axis
+    with the highest slew cost outermost, then goes serpentine.
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Unknown order '{order}'. Choose from: {', '.join(ORDERS)}")
+    if not axes:
+        return []
+    names = [name for name, _ in axes]
+    if len(set(names)) != len(names):
+        raise ValueError("Each axis needs a different name")
+
+    if order == "slow-outer":
+        axes = order_axes(axes, slew)
+    points = _raster(axes) if order == "raster" else _serpentine(axes)
+    return [dict(zip([name for name, _ in axes], p)) for p in points]
+
+def path_cost(points: Sequence[Dict[str, float]], slew: Optional[Dict[str, float]] = None) -> float:
+    """Total slew cost of visiting points in order (axes move one after another)."""
+    slew = slew or {}
+    if not points:
+        return 0.0
+    return sum(slew_cost([p[name] for p in points], slew.get(name, 1.0)) for name in points[0])
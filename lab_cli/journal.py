@@ -0,0 +1,116 @@
+# Append-only run journals so run-loop can resume after a crash or Ctrl+C
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+JOURNAL_FOLDER = "Data_Runs"
+JOURNAL_EXTENSION = ".jsonl"
+
+
+def new_run_id(name: str) -> str:
+    return f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+def journal_path(run_id: str) -> str:
+    # Accept a path to the journal as well as a bare run id
+    if run_id.endswith(JOURNAL_EXTENSION) or os.sep in run_id:
+        return run_id
+    return os.path.join(JOURNAL_FOLDER, run_id + JOURNAL_EXTENSION)
+
+
+class RunJournal:
+    """
+    One JSON record per line, only ever appended to and fsynced after each
+    write, so at most the line being written when the process died is lost.
+
+    Records:
+        start   settings and recipe of the run
+        step    one finished step of one point: ok flag, returned values
+                and how long it took (used by run-loop --dry-run)
+        point   a point whose steps have all run
+        resume / interrupted / end
+    """
+
+    def __init__(self, path: str, records: Optional[List[Dict[str, Any]]] = None):
+        self.path = path
+        self.run_id = os.path.splitext(os.path.basename(path))[0]
+        self.settings: Dict[str, Any] = {}
+        self.steps: List[Dict[str, Any]] = []
+        # index -> {step index -> values} for steps that succeeded
+        self.done_steps: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        # index -> {"point": ..., "values": ...} for points whose steps all succeeded
+        self.done_points: Dict[int, Dict[str, Any]] = {}
+        # index -> point, for every point that was started
+        self.visited: Dict[int, Dict[str, Any]] = {}
+        self.records: List[Dict[str, Any]] = []
+        # Set by load() when the file ends in a half-written line
+        self._torn = False
+        for record in records or []:
+            self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]):
+        self.records.append(record)
+        event = record.get("event")
+        if event == "start":
+            self.settings = record.get("settings", {})
+            self.steps = record.get("steps", [])
+        elif event == "step":
+            index = record["index"]
+            self.visited[index] = record["point"]
+            if record.get("ok"):
+                self.done_steps.setdefault(index, {})[record["step"]] = record.get("values", {})
+        elif event == "point":
+            self.visited[record["index"]] = record["point"]
+            if record.get("ok"):
+                self.done_points[record["index"]] = {"point": record["point"],
+                                                     "values": record.get("values", {})}
+
+    @classmethod
+    def create(cls, run_id: str, settings: Dict[str, Any], steps: List[Dict[str, Any]]) -> "RunJournal":
+        path = journal_path(run_id)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            raise FileExistsError(f"Run '{run_id}' already exists")
+        journal = cls(path)
+        journal.record("start", run_id=journal.run_id, settings=settings, steps=steps)
+        return journal
+
+    @classmethod
+    def load(cls, run_id: str) -> "RunJournal":
+        path = journal_path(run_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No journal for run '{run_id}' ({path})")
+        records = []
+        line = "\n"
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Half-written last line from a crash
+                    continue
+        journal = cls(path, records)
+        journal._torn = not line.endswith("\n")
+        if not journal.steps:
+            raise ValueError(f"Journal {path} has no start record")
+        return journal
+
+    def record(self, event: str, **fields: Any):
+        record = {"event": event, "time": time.time(), **fields}
+        line = json.dumps(record, default=str)
+        with open(self.path, "a") as f:
+            # Don't glue the first new record onto a half-written line
+            f.write(("\n" if self._torn else "") + line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._torn = False
+        self._apply(json.loads(line))
+
+    def record_step(self, index: int, point: Dict[str, Any], step: int, action: str,
+                    ok: bool, values: Dict[str, Any], seconds: Optional[float] = None):
+        self.record("step", index=index, point=point, step=step, action=action,
+                    ok=bool(ok), values=values, seconds=seconds)
+
+    def record_point(self, index: int, point: Dict[str, Any], ok: bool, values: Dict[str, Any]):
+        self.record("point", index=index, point=point, ok=bool(ok), values=values)
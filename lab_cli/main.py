@@ -4,15 +4,26 @@ from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt
 from rich.live import Live
+import asyncio
 import shlex
 import time
 import sys
+from typing import List, Optional
 
 # Application Modules
 # Import from the generic registry and actions, not specific drivers
 from .experiment_registry import save_experiment, get_experiment
 from .actions import get_all_actions, get_action
 from .equipment_api import get_all_equipment, get_equipment_by_id
+from .telemetry import TelemetryScheduler, build_sources
+from .postprocess import postprocessor
+from .plan import compile_recipe, PlanError, RunResult
+from .grid import loop_values, parse_axis, grid_points, path_cost, DEFAULT_ORDER
+from .adaptive import AdaptiveSampler, DEFAULT_CRITERION
+from .journal import RunJournal, new_run_id, JOURNAL_FOLDER
+from .timing import load_timing_model, estimate_plan, format_duration
+from .connections.manager import connection_manager
+from .connections.cryostat import with_async_cryos
 
 app = typer.Typer(
     help="CLI to monitor and control lab equipment.",
@@ -25,52 +36,73 @@ console = Console()
 
 # MONITORING COMMANDS
 
+def _build_status_table(equipment_data: dict) -> Table:
+    """Renders one status snapshot as a table."""
+    table = Table(title=f"Lab Equipment Status (Updated: {time.strftime('%H:%M:%S')})")
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Type", style="magenta")
+    table.add_column("Status", justify="center")
+    table.add_column("Key Readings", style="green")
+
+    for eq_id, data in equipment_data.items():
+        # Status Coloring
+        status = data.get("status", "Unknown")
+        style = "green" if status == "Active" else "red"
+        if status == "Idle": style = "yellow"
+        # Device missed its poll deadline, readings are from an earlier tick
+        if data.get("stale"):
+            status = f"{status} (stale)"
+
+        # Format Readings (Generic approach)
+        readings = []
+        # We look for common scientific keys dynamically
+        for key, val in data.items():
+            if key in ["id", "type", "status", "last_check", "details", "stale"]: continue
+            if isinstance(val, (int, float)):
+                readings.append(f"{key}={val}")
+
+        readings_str = ", ".join(readings) if readings else "-"
+
+        table.add_row(
+            eq_id,
+            data.get("type", "Unknown"),
+            f"[{style}]{status}[/{style}]",
+            readings_str
+        )
+
+    return table
+
 @app.command("status")
-def status_monitor(refresh_rate: float = 2.0):
+def status_monitor(
+    refresh_rate: float = 2.0,
+    period: Optional[List[str]] = typer.Option(None, "--period", help="Field polling period, e.g. temperature_k=0.5 (repeatable)"),
+):
     """
     Continuously monitors and displays the status of all connected equipment.
-    Press Ctrl+C to stop.
+    Each reading is polled at its own rate; refresh_rate only sets how often
+    the table is redrawn. Press Ctrl+C to stop.
     """
+    periods = {}
+    for item in period or []:
+        key, _, value = item.partition("=")
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = 0.0
+        if not key.strip() or not seconds > 0:
+            console.print(f"[red]Invalid period '{item}', expected field=seconds (> 0).[/red]")
+            return
+        periods[key.strip()] = seconds
+
     console.print("[bold blue]Starting Equipment Monitor... (Press Ctrl+C to stop)[/bold blue]")
 
+    scheduler = TelemetryScheduler(build_sources(periods=periods))
     try:
         with Live(console=console, refresh_per_second=1) as live:
-            while True:
-                # Fetch live data
-                equipment_data = get_all_equipment()
-
-                # Build Table
-                table = Table(title=f"Lab Equipment Status (Updated: {time.strftime('%H:%M:%S')})")
-                table.add_column("ID", style="cyan", no_wrap=True)
-                table.add_column("Type", style="magenta")
-                table.add_column("Status", justify="center")
-                table.add_column("Key Readings", style="green")
-
-                for eq_id, data in equipment_data.items():
-                    # Status Coloring
-                    status = data.get("status", "Unknown")
-                    style = "green" if status == "Active" else "red"
-                    if status == "Idle": style = "yellow"
-
-                    # Format Readings (Generic approach)
-                    readings = []
-                    # We look for common scientific keys dynamically
-                    for key, val in data.items():
-                        if key in ["id", "type", "status", "last_check", "details"]: continue
-                        if isinstance(val, (int, float)):
-                            readings.append(f"{key}={val}")
-
-                    readings_str = ", ".join(readings) if readings else "-"
-
-                    table.add_row(
-                        eq_id,
-                        data.get("type", "Unknown"),
-                        f"[{style}]{status}[/{style}]",
-                        readings_str
-                    )
-
-                live.update(table)
-                time.sleep(refresh_rate)
+            asyncio.run(with_async_cryos(scheduler.run(
+                lambda data: live.update(_build_status_table(data)),
+                render_interval=refresh_rate
+            )))
 
     except KeyboardInterrupt:
         console.print("\n[bold yellow]Monitor stopped.[/bold yellow]")
@@ -119,24 +151,41 @@ def run_action_cli(ctx: typer.Context, action_name: str):
             kwargs[key] = value
 
     # Check for missing parameters and prompt interactively
-    missing = [p for p in action_def.params if p not in kwargs]
+    # (optional ones fall back to their defaults)
+    missing = [p for p in action_def.params if p not in kwargs and p not in action_def.defaults]
     if missing:
         console.print(f"[yellow]Missing parameters for '{action_name}':[/yellow]")
         for param in missing:
             val = Prompt.ask(f"Enter value for '{param}'")
             kwargs[param] = val
 
+    unknown = [k for k in kwargs if k not in action_def.params]
+    if unknown:
+        console.print(f"[red]Error: '{action_name}' has no parameter {', '.join(map(repr, unknown))}.[/red]")
+        return
+
+    # Values are checked and converted like a one-step recipe
+    try:
+        plan = compile_recipe([dict(kwargs, type=action_name)], [])
+    except PlanError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+
+    # Device settings may have been changed by hand since the last command
+    connection_manager.clear_state()
+
     # Run the Action
     console.print(f"[bold]Running {action_name}...[/bold]")
-    try:
-        # We assume the action returns True on success
-        success = action_def.func(**kwargs)
-        if success:
-            console.print(f"[green]✔ Action {action_name} completed.[/green]")
-        else:
-            console.print(f"[red]✘ Action {action_name} failed.[/red]")
-    except Exception as e:
-        console.print(f"[bold red]Error executing action: {e}[/bold red]")
+
+    def report(step, error):
+        if error is not None:
+            console.print(f"[bold red]Error executing action: {error}[/bold red]")
+
+    if plan.run({}, on_error=report).ok:
+        console.print(f"[green]✔ Action {action_name} completed.[/green]")
+    else:
+        console.print(f"[red]✘ Action {action_name} failed.[/red]")
+    flush_postprocessing()
 
 
 # EXPERIMENT BUILDER COMMANDS
@@ -165,7 +214,10 @@ def define_experiment(name: str):
         # Dynamically ask for each parameter required by the action
         console.print(f"[italic]Configuring {cmd_type}... (Use {{var}} for variables)[/italic]")
         for param in action_def.params:
-            val = Prompt.ask(f"Value for '{param}'")
+            if param in action_def.defaults:
+                val = Prompt.ask(f"Value for '{param}'", default=str(action_def.defaults[param]))
+            else:
+                val = Prompt.ask(f"Value for '{param}'")
             step_data[param] = val
 
         steps.append(step_data)
@@ -175,73 +227,385 @@ def define_experiment(name: str):
     console.print(f"[bold green]Saved '{name}' with {len(steps)} steps.[/bold green]")
 
 
+def flush_postprocessing():
+    """Waits for background plots/exports and reports any that failed."""
+    backlog = postprocessor.backlog
+    if backlog:
+        console.print(f"[dim]Waiting for {backlog} post-processing job(s)...[/dim]")
+    for label, error in postprocessor.flush():
+        console.print(f"[red]Post-processing failed ({label}): {error}[/red]")
+
+def _report_step_error(step, error):
+    if error is None:
+        console.print(f"[red]Step {step.index + 1} ({step.name}) Failed![/red]")
+    else:
+        console.print(f"[red]Error in step {step.index + 1}: {error}[/red]")
+
+def _print_adaptive(variable: str, metric: str, sampler):
+    table = Table(title=f"{metric} vs {variable} ({len(sampler.results)} points)")
+    table.add_column(variable, style="cyan", justify="right")
+    table.add_column(metric, style="green", justify="right")
+    for x in sampler.points:
+        m = sampler.results[x]
+        table.add_row(f"{x:g}", "-" if m is None else f"{m:.6g}")
+    console.print(table)
+
+def _print_estimate(plan, points, sampler=None, journal=None):
+    """Dry run: predicted duration of each step over the whole loop."""
+    model = load_timing_model()
+    all_steps = range(len(plan))
+
+    def skip(i):
+        if journal is None:
+            return ()
+        return all_steps if i in journal.done_points else journal.done_steps.get(i, {})
+
+    extra = 0
+    if sampler:
+        var = next(iter(points[0]))
+        points = [{var: v} for v in sampler.start()]
+        # Refined points aren't known yet: assume the budget is used up,
+        # each costing as much as an average coarse point
+        extra = max(0, sampler.budget - max(len(points), len(journal.visited) if journal else 0))
+    estimates = estimate_plan(plan, points, model, skip)
+    if extra:
+        estimates = [e._replace(runs=e.runs + extra,
+                                seconds=e.seconds * (1 + extra / len(points))) for e in estimates]
+    total = sum(e.seconds for e in estimates)
+
+    table = Table(title="Estimated Duration" + (" (if the whole budget is used)" if sampler else ""))
+    table.add_column("Step", justify="right")
+    table.add_column("Action", style="cyan")
+    table.add_column("Runs", justify="right")
+    table.add_column("Per run", justify="right")
+    table.add_column("Total", justify="right", style="green")
+    table.add_column("Share", justify="right")
+    table.add_column("Model", style="dim")
+    for e in estimates:
+        table.add_row(str(e.index + 1), e.action, str(e.runs),
+                      format_duration(e.seconds / e.runs) if e.runs else "-",
+                      format_duration(e.seconds),
+                      f"{100 * e.seconds / total:.0f}%" if total else "-",
+                      f"fit to {e.learned_from} timing(s)" if e.learned_from else "default")
+    console.print(table)
+    for e in estimates:
+        if e.failed:
+            console.print(f"[red]Step {e.index + 1} ({e.action}) will fail at {e.failed} point(s): {e.error}[/red]")
+    console.print(f"[bold]Estimated total: {format_duration(total)}[/bold]")
+    if not any(e.learned_from for e in estimates):
+        console.print(f"[dim]No timed runs in {JOURNAL_FOLDER}/ yet; estimates use default rates.[/dim]")
+
 @app.command("run-loop")
 def run_loop_generic(
-    name: str,
+    name: Optional[str] = typer.Argument(None, help="Experiment to loop (not needed with --resume)"),
     variable: str = typer.Option("x", help="Variable name to loop"),
-    start: float = typer.Option(..., help="Start value"),
-    end: float = typer.Option(..., help="End value"),
-    step: float = typer.Option(..., help="Step size"),
+    start: Optional[float] = typer.Option(None, help="Start value"),
+    end: Optional[float] = typer.Option(None, help="End value"),
+    step: Optional[float] = typer.Option(None, help="Step size"),
+    axis: Optional[List[str]] = typer.Option(None, "--axis", help="Grid axis, name=start:end:step or name=v1,v2,... (repeatable, outermost first)"),
+    order: str = typer.Option(DEFAULT_ORDER, help="Grid visit order: serpentine, raster or slow-outer"),
+    slew: Optional[List[str]] = typer.Option(None, "--slew", help="Cost of moving an axis, e.g. field=600 (s per unit); used by slow-outer"),
+    adaptive: Optional[str] = typer.Option(None, help="Refine where this value returned by a step (e.g. resonance_nm) changes most"),
+    budget: int = typer.Option(50, help="Adaptive: total number of points"),
+    tolerance: float = typer.Option(0.0, help="Adaptive: stop once no gap changes the value by more than this"),
+    criterion: str = typer.Option(DEFAULT_CRITERION, help="Adaptive: gradient or curvature"),
+    min_step: Optional[float] = typer.Option(None, help="Adaptive: smallest spacing (default 1/16 of the coarse step)"),
+    resume: Optional[str] = typer.Option(None, help="Continue an interrupted run by its run id; other options are taken from its journal"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only estimate how long the loop will take; nothing is run"),
 ):
     """
-    Loops ANY defined experiment over a specific variable.
+    Loops ANY defined experiment over one variable (--variable/--start/--end/--step)
+    or over a grid of several (--axis, repeatable).
+    Example: run-loop map --axis field=-1:1:0.1 --axis temp=4,10,50 --order slow-outer
+    With --adaptive, the one-variable range is a coarse start and points are
+    added where the named step value changes most.
+    Example: run-loop scan --variable field --start 0 --end 1 --step 0.1 --adaptive resonance_nm
+    Every finished step is journaled under Data_Runs/; after a crash or
+    Ctrl+C, run-loop --resume <run id> skips the work already done.
+    --dry-run prints the expected duration of each step, based on the
+    timings of earlier runs.
     """
-    steps = get_experiment(name)
-    if not steps:
-        console.print(f"[red]Experiment '{name}' not found.[/red]")
+    journal = None
+    if resume:
+        try:
+            journal = RunJournal.load(resume)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Can't resume: {e}[/red]")
+            return
+        # The run continues exactly as it was started, with the recipe as it was then
+        settings, steps = journal.settings, journal.steps
+        name = settings["name"]
+        if get_experiment(name) not in (None, steps):
+            console.print(f"[yellow]'{name}' was changed since the run started; "
+                          f"resuming with the original steps.[/yellow]")
+    else:
+        if not name:
+            console.print("[red]Give an experiment name, or --resume <run id>.[/red]")
+            return
+        steps = get_experiment(name)
+        if not steps:
+            console.print(f"[red]Experiment '{name}' not found.[/red]")
+            return
+        try:
+            if axis:
+                axes = [parse_axis(a) for a in axis]
+            elif None not in (start, end, step):
+                axes = [(variable, loop_values(start, end, step))]
+            else:
+                console.print("[red]Give --start, --end and --step, or one or more --axis.[/red]")
+                return
+            slew_rates = {}
+            for item in slew or []:
+                if "=" not in item:
+                    raise ValueError(f"Invalid slew '{item}', expected axis=cost_per_unit")
+                key, value = item.split("=", 1)
+                slew_rates[key.strip()] = float(value)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        settings = {"name": name, "axes": axes, "order": order, "slew": slew_rates,
+                    "adaptive": adaptive, "budget": budget, "tolerance": tolerance,
+                    "criterion": criterion, "min_step": min_step}
+
+    axes = [(a, list(v)) for a, v in settings["axes"]]
+    order, slew_rates = settings["order"], settings["slew"]
+    adaptive, criterion = settings["adaptive"], settings["criterion"]
+    try:
+        points = grid_points(axes, order, slew_rates)
+        sampler = None
+        if adaptive:
+            if len(axes) != 1:
+                raise ValueError("--adaptive works with one variable")
+            sampler = AdaptiveSampler(axes[0][1], settings["budget"], settings["tolerance"],
+                                      settings["min_step"], criterion)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
         return
 
-    import numpy as np
-    # Handle range direction
-    if start > end and step > 0: step = -step
-    # Add tiny buffer to include the end value
-    values = np.arange(start, end + step/10000.0, step)
-
-    console.print(f"[bold]Looping '{name}' over {variable} ({start} -> {end})[/bold]")
-    if not typer.confirm("Start?"): return
+    # Resolve actions, templates and parameter types before touching hardware
+    try:
+        plan = compile_recipe(steps, [a for a, _ in axes])
+    except PlanError as e:
+        console.print(f"[red]Experiment '{name}' can't run: {e}[/red]")
+        return
 
-    for val in values:
-        val = round(float(val), 5)
-        console.print(f"\n[bold yellow]--- {variable} = {val} ---[/bold yellow]")
+    if sampler:
+        console.print(f"[bold]Adaptive loop '{name}' over {axes[0][0]}: {len(sampler.coarse)} coarse points, "
+                      f"up to {sampler.budget}, refining on {adaptive} ({criterion})[/bold]")
+    elif len(axes) == 1:
+        console.print(f"[bold]Looping '{name}' over {axes[0][0]} ({axes[0][1][0]} -> {axes[0][1][-1]})[/bold]")
+    else:
+        sizes = " x ".join(f"{a} ({len(v)})" for a, v in axes)
+        console.print(f"[bold]Looping '{name}' over {sizes} = {len(points)} points, {order} order[/bold]")
+        if slew_rates:
+            console.print(f"[dim]Slew cost: {path_cost(points, slew_rates):g} "
+                          f"(raster {path_cost(grid_points(axes, 'raster'), slew_rates):g})[/dim]")
+    if journal:
+        partial = len(set(journal.done_steps) - set(journal.done_points))
+        console.print(f"[bold]Resuming run {journal.run_id}: {len(journal.done_points)} point(s) done"
+                      + (f", {partial} partly done" if partial else "") + "[/bold]")
+    if dry_run:
+        _print_estimate(plan, points, sampler, journal)
+        return
+    if not typer.confirm("Resume?" if journal else "Start?"): return
 
-        # Context holds the current loop variable
-        context = {variable: val}
+    if journal:
+        journal.record("resume")
+    else:
+        try:
+            journal = RunJournal.create(new_run_id(name), settings, steps)
+        except OSError as e:
+            console.print(f"[red]Can't create run journal: {e}[/red]")
+            return
+    console.print(f"[dim]Run id: {journal.run_id}[/dim]")
+
+    # Device sessions stay open for the whole loop; settings written in one
+    # iteration are only resent when they change. Start from a clean slate
+    # in case something was changed by hand before the loop.
+    connection_manager.clear_state()
+
+    def visit(index, point):
+        label = ", ".join(f"{k} = {v}" for k, v in point.items())
+        seen = journal.visited.get(index)
+        if seen is not None and seen != point:
+            raise RuntimeError(f"Point {index + 1} is {point} but the journal has {seen}")
+        if index in journal.done_points:
+            console.print(f"[dim]--- {label} (done) ---[/dim]")
+            return RunResult(True, journal.done_points[index]["values"])
+
+        console.print(f"\n[bold yellow]--- {label} ---[/bold yellow]")
+        # Steps that succeeded before the resume are skipped; failed ones run again
+        done = journal.done_steps.get(index, {})
+        if done:
+            console.print(f"[dim]Skipping {len(done)} step(s) finished before the resume[/dim]")
+
+        def record(step, ok, values, seconds):
+            journal.record_step(index, point, step.index, step.name, ok, values, seconds)
+
+        # Context holds the current loop variables
+        result = plan.run(dict(point), on_error=_report_step_error, skip=done, on_step=record)
+        values = {}
+        for i in sorted(done):
+            values.update(done[i])
+        values.update(result.values)
+        journal.record_point(index, point, result.ok, values)
+
+        # Plots/exports still running in the background
+        backlog = postprocessor.backlog
+        if backlog:
+            console.print(f"[dim]Post-processing backlog: {backlog}[/dim]")
+        return RunResult(result.ok, values)
 
-        # Execute Steps
-        for i, step_config in enumerate(steps):
-            action_name = step_config["type"]
-            action_def = get_action(action_name)
+    try:
+        if sampler is None:
+            for index, point in enumerate(points):
+                visit(index, point)
+        else:
+            # Batches only depend on the values found so far, so a resumed
+            # run replays the journal and arrives at the same points
+            var = axes[0][0]
+            index = 0
+            batch = sampler.start()
+            while batch:
+                for val in batch:
+                    result = visit(index, {var: val})
+                    metric = result.values.get(adaptive)
+                    if sampler.add(val, metric) is None:
+                        got = f"{adaptive}={metric!r}" if adaptive in result.values else f"no '{adaptive}'"
+                        console.print(f"[yellow]Got {got} at {var}={val}; treated as no measurement.[/yellow]")
+                    index += 1
+                if all(v is None for v in sampler.results.values()):
+                    console.print(f"[red]No step returned '{adaptive}'"
+                                  + (f" (got: {', '.join(result.values)})" if result.values else "")
+                                  + "; not refining.[/red]")
+                    break
+                batch = sampler.next_batch()
+                if batch:
+                    console.print(f"[cyan]Refining: {len(batch)} new points[/cyan]")
+            _print_adaptive(var, adaptive, sampler)
+    except KeyboardInterrupt:
+        journal.record("interrupted")
+        flush_postprocessing()
+        console.print(f"\n[yellow]Interrupted. Continue with: run-loop --resume {journal.run_id}[/yellow]")
+        raise typer.Exit(130)
 
-            if not action_def:
-                console.print(f"[red]Unknown action: {action_name}[/red]")
-                continue
+    journal.record("end")
+    flush_postprocessing()
+    console.print("\n[bold green]Loop Complete[/bold green]")
 
-            # Prepare Arguments (Substitute variables)
-            kwargs = {}
-            for param in action_def.params:
-                raw_val = str(step_config.get(param, ""))
-                # Try to format "{field}" -> "0.5"
-                try:
-                    formatted_val = raw_val.format(**context)
-                except KeyError:
-                    formatted_val = raw_val # Keep raw if key missing or malformed
-                except ValueError:
-                    formatted_val = raw_val
+# DATA COMMANDS
 
-                kwargs[param] = formatted_val
+@app.command("export-excel")
+def export_excel_cli(
+    paths: List[str] = typer.Argument(..., help="Sweep files (.npz/.h5/.parquet) or folders of them"),
+    output: Optional[str] = typer.Option(None, help="Output file (single input only)"),
+):
+    """
+    Converts stored sweeps to Excel (.xlsx next to each file by default).
+    Example: export-excel Data_Sweeps/Sweep_20251205_101500_field_0.5.npz
+    """
+    import os
+    from .storage import EXTENSIONS
+    from .postprocess import write_export
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, f) for f in os.listdir(path)
+                            if os.path.splitext(f)[1] in EXTENSIONS.values())
+        else:
+            files.append(path)
 
-            # Pass context for logging/filenames/logic
-            kwargs["context"] = context
+    if output and len(files) != 1:
+        console.print("[red]--output needs exactly one input file.[/red]")
+        return
 
-            # RUN IT
-            try:
-                success = action_def.func(**kwargs)
-                if not success:
-                    console.print(f"[red]Step {i+1} ({action_name}) Failed![/red]")
-            except Exception as e:
-                console.print(f"[red]Error in step {i+1}: {e}[/red]")
+    # Files are converted in parallel by the post-processing workers
+    jobs = [(path, postprocessor.submit(f"export {path}", write_export, os.path.abspath(path),
+                                        os.path.abspath(output) if output else None))
+            for path in files]
+    for path, job in jobs:
+        try:
+            console.print(f"[green]Exported: {job.result()}[/green]")
+        except Exception as e:
+            console.print(f"[red]Failed to export {path}: {e}[/red]")
+    postprocessor.flush()
+
+
+# SIMULATORS
+
+@app.command("simulate")
+def simulate_device(
+    latency: float = typer.Option(0.0, help="Added delay per request (s)"),
+    jitter: float = typer.Option(0.0, help="Random +/- variation of the delay (s)"),
+    error_rate: float = typer.Option(0.0, help="Fraction of requests answered with HTTP 500"),
+    drop_rate: float = typer.Option(0.0, help="Fraction of requests dropped without a reply"),
+    time_scale: float = typer.Option(1.0, help="Simulated seconds per real second"),
+    port: int = typer.Option(47101, help="Cryostation REST port"),
+    seed: Optional[int] = typer.Option(None, help="Seed for repeatable noise/faults"),
+    warm: bool = typer.Option(False, help="Start at room temperature"),
+):
+    """
+    Serves a local Montana Cryostation/Rook REST simulator until Ctrl+C.
+    Point cryo-01 at 127.0.0.1 (or 127.0.0.1:<port>) to use it.
+    """
+    from .simulators.montana import MontanaSimulator
 
-    console.print("\n[bold green]Loop Complete[/bold green]")
+    sim = MontanaSimulator(cryo_port=port, latency=latency, jitter=jitter,
+                           error_rate=error_rate, drop_rate=drop_rate,
+                           time_scale=time_scale, seed=seed, cold=not warm)
+    sim.start()
+    console.print(f"[bold green]Montana simulator on {sim.address} (Rook on port {sim.rook_port}). Ctrl+C to stop.[/bold green]")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        console.print(f"\n[bold yellow]Simulator stopped after {sim.request_count} requests.[/bold yellow]")
+    finally:
+        sim.stop()
+
+
+@app.command("bench")
+def bench(
+    output: Optional[str] = typer.Option(None, help="JSON file for the results (default bench_results/bench_<time>.json)"),
+    only: Optional[List[str]] = typer.Option(None, "--only", help="status, sweep, loop or startup (repeatable)"),
+    samples: Optional[List[int]] = typer.Option(None, "--samples", help="Sweep sizes in samples (repeatable)"),
+    iterations: int = typer.Option(20, min=1, help="get_all_equipment() calls to time"),
+    latency: float = typer.Option(0.0, help="Simulated per-request device latency (s)"),
+    transfer_rate: Optional[float] = typer.Option(None, help="Simulated recorder download rate (bytes/s)"),
+):
+    """
+    Benchmarks status polling, sweep download, run-loop overhead and CLI
+    start-up against the local simulators, and saves the results as JSON.
+    """
+    from .bench import run_benchmarks, save_report
+
+    report = run_benchmarks(
+        only=only, sample_counts=samples, iterations=iterations, latency=latency,
+        transfer_rate=transfer_rate,
+        progress=lambda name: console.print(f"[bold]Running {name} benchmark...[/bold]")
+    )
+    results = report["results"]
+
+    table = Table(title="Benchmark Results")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Result", style="green")
+    if "status" in results:
+        r = results["status"]
+        table.add_row("get_all_equipment", f"p50 {r['p50_s']*1000:.1f} ms, p95 {r['p95_s']*1000:.1f} ms")
+    for r in results.get("sweep", []):
+        rate = f"{r['bytes_per_s']/1e6:.2f} MB/s" if r["bytes_per_s"] else "-"
+        table.add_row(f"sweep {r['samples']} samples", f"{rate}, time-to-file {r['time_to_file_s']:.2f} s")
+    if "loop" in results:
+        r = results["loop"]
+        table.add_row("run-loop overhead", f"{r['overhead_per_iteration_s']*1e6:.0f} us/iteration, {r['overhead_per_step_s']*1e6:.0f} us/step")
+    if "startup" in results:
+        r = results["startup"]
+        table.add_row("CLI cold start", f"p50 {r['p50_s']:.2f} s (interpreter {r['interpreter_p50_s']:.2f} s)")
+    console.print(table)
+
+    path = save_report(report, output)
+    console.print(f"[green]Saved: {path}[/green]")
 
 
 # INTERACTIVE SHELL
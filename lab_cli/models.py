@@ -34,6 +34,8 @@ class Cryostat(Equipment):
     Represents the Montana Cryostat.
     """
     temperature_k: Optional[float] = None
+    temperature_stability_k: Optional[float] = None
+    temperature_stable: Optional[bool] = None
     pressure_torr: Optional[float] = None
     magnet_field_tesla: Optional[float] = None
     magnet_enabled: Optional[bool] = None
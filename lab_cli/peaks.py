@@ -0,0 +1,68 @@
+# Resonance detection in sweep traces
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Moving-average width (samples) used before looking for the extremum
+SMOOTH_POINTS = 5
+# A feature must stand out from the baseline by this many noise sigmas
+MIN_PROMINENCE = 8.0
+
+
+class Resonance(NamedTuple):
+    center_nm: float
+    fwhm_nm: float
+    depth: float        # height of the peak / depth of the dip above the baseline
+    snr: float          # depth in units of the (smoothed) noise
+
+
+def find_resonance(x: np.ndarray, y: np.ndarray, feature: str = "dip",
+                   min_prominence: float = MIN_PROMINENCE,
+                   smooth_points: int = SMOOTH_POINTS) -> Optional[Resonance]:
+    """
+    Finds the strongest dip (or peak, with feature="peak") in a trace.
+
+    The trace is smoothed with a short moving average. The baseline is its
+    median and the noise comes from the median sample-to-sample step, so
+    the resonance itself barely affects either. The centre is the centroid
+    of the region above half height, which gives sub-sample precision.
+    Returns None if nothing stands out by `min_prominence` sigmas.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) < 3:
+        return None
+    if feature not in ("dip", "peak"):
+        raise ValueError(f"feature must be 'dip' or 'peak', not '{feature}'")
+
+    order = np.argsort(x, kind="stable")
+    x = x[order]
+    signal = -y[order] if feature == "dip" else y[order]
+
+    k = max(1, min(int(smooth_points), len(signal)))
+    # Pad with the end values so the edges aren't pulled towards zero
+    padded = np.pad(signal, (k // 2, k - 1 - k // 2), mode="edge")
+    smoothed = np.convolve(padded, np.ones(k) / k, mode="valid")
+
+    baseline = np.median(smoothed)
+    noise = 1.4826 * np.median(np.abs(np.diff(signal))) / np.sqrt(2)
+    noise = max(noise / np.sqrt(k), np.finfo(float).eps)
+
+    i = int(np.argmax(smoothed))
+    depth = smoothed[i] - baseline
+    snr = depth / noise
+    if snr < min_prominence:
+        return None
+
+    # Contiguous region around i that is above half height
+    above = smoothed >= baseline + depth / 2
+    below_left = np.flatnonzero(~above[:i])
+    below_right = np.flatnonzero(~above[i:])
+    left = below_left[-1] + 1 if len(below_left) else 0
+    right = i + below_right[0] - 1 if len(below_right) else len(x) - 1
+
+    weights = smoothed[left:right + 1] - (baseline + depth / 2)
+    center = float(np.sum(x[left:right + 1] * weights) / np.sum(weights)) if weights.sum() > 0 else float(x[i])
+    step = float(x[-1] - x[0]) / (len(x) - 1)
+    fwhm = max(float(x[right] - x[left]), step)
+    return Resonance(center, fwhm, float(depth), float(snr))
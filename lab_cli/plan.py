@@ -0,0 +1,183 @@
+# Compiles experiment recipes into execution plans
+import inspect
+import time
+from string import Formatter
+from typing import Any, Callable, Container, Dict, Iterable, List, NamedTuple, Optional
+
+from .actions import get_action, ActionDefinition, ActionResult
+
+
+class PlanError(ValueError):
+    """A recipe can't be run (unknown action, bad template or value)."""
+
+
+def coerce(value: Any, annotation: Any) -> Any:
+    """Converts a recipe value to the type an action parameter declares."""
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return value
+    if annotation is bool and isinstance(value, str):
+        return value.strip().lower() in ["on", "true", "yes", "1"]
+    if annotation is int and isinstance(value, (str, float)):
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f"expected a whole number, got {value!r}")
+        return int(number)
+    if annotation in (float, int, str, bool):
+        return annotation(value)
+    return value
+
+
+class _Param:
+    """
+    One parameter of a step. Constants are coerced once at compile time;
+    "{var}" is bound straight from the loop values; anything else is
+    formatted with them.
+    """
+
+    def __init__(self, name: str, raw: str, annotation: Any, variables: Optional[set]):
+        self.name = name
+        self.annotation = annotation
+        self.variable: Optional[str] = None
+        self.template: Optional[str] = None
+        self.value: Any = None
+
+        try:
+            fields = list(Formatter().parse(raw))
+        except ValueError as e:
+            raise PlanError(f"bad template {raw!r} for '{name}': {e}") from None
+
+        names = [field for _, field, _, _ in fields if field is not None]
+        for field in names:
+            if not field.isidentifier():
+                raise PlanError(f"bad template {raw!r} for '{name}': use {{variable}}")
+            if variables is not None and field not in variables:
+                raise PlanError(f"'{name}' uses {{{field}}} but the loop only sets: "
+                                f"{', '.join(sorted(variables)) or 'nothing'}")
+
+        if not names:
+            self.value = self._coerce(raw)
+        elif len(fields) == 1 and not fields[0][0] and not fields[0][2] and not fields[0][3]:
+            self.variable = names[0]
+        else:
+            self.template = raw
+
+    def _coerce(self, value: Any) -> Any:
+        try:
+            return coerce(value, self.annotation)
+        except (TypeError, ValueError) as e:
+            raise PlanError(f"bad value {value!r} for '{self.name}': {e}") from None
+
+    def bind(self, context: Dict[str, Any]) -> Any:
+        if self.variable is not None:
+            return self._coerce(context[self.variable])
+        if self.template is not None:
+            return self._coerce(self.template.format(**context))
+        return self.value
+
+
+class PlanStep:
+    """A recipe step with its action resolved and parameters pre-parsed."""
+
+    def __init__(self, index: int, action: ActionDefinition, params: List[_Param]):
+        self.index = index
+        self.action = action
+        self.params = params
+
+    @property
+    def name(self) -> str:
+        return self.action.name
+
+    def bind(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Keyword arguments for one run with these loop values."""
+        kwargs = {p.name: p.bind(context) for p in self.params}
+        # Pass context for logging/filenames/logic
+        kwargs["context"] = context
+        return kwargs
+
+
+class RunResult(NamedTuple):
+    ok: bool                  # every step succeeded
+    values: Dict[str, Any]    # values returned by the steps (later steps win)
+
+
+class ExecutionPlan:
+    """A compiled recipe: run() only binds loop values and calls actions."""
+
+    def __init__(self, steps: List[PlanStep], variables: Optional[set] = None):
+        self.steps = steps
+        self.variables = variables
+
+    def __len__(self):
+        return len(self.steps)
+
+    def run(self, context: Dict[str, Any],
+            on_error: Optional[Callable[[PlanStep, Optional[Exception]], None]] = None,
+            skip: Container[int] = (),
+            on_step: Optional[Callable[[PlanStep, bool, Dict[str, Any], float], None]] = None) -> RunResult:
+        """
+        Runs every step once. A failing step (False or an exception) is
+        reported to on_error(step, exception or None) and the rest still run.
+        Values from steps returning an ActionResult are collected.
+        Steps whose index is in `skip` are not run (e.g. already done before
+        a resume); on_step(step, ok, values, seconds) is called after each one
+        that is.
+        """
+        ok = True
+        values: Dict[str, Any] = {}
+        for step in self.steps:
+            if step.index in skip:
+                continue
+            started = time.perf_counter()
+            try:
+                success = step.action.func(**step.bind(context))
+                error = None
+            except Exception as e:
+                success, error = False, e
+            step_values = success.values if isinstance(success, ActionResult) else {}
+            values.update(step_values)
+            if on_step:
+                on_step(step, bool(success), step_values, time.perf_counter() - started)
+            if not success:
+                ok = False
+                if on_error:
+                    on_error(step, error)
+        return RunResult(ok, values)
+
+def compile_recipe(steps: List[Dict[str, Any]], variables: Optional[Iterable[str]] = None) -> ExecutionPlan:
+    """
+    Turns a recipe (list of {"type": action, param: value}) into a plan.
+
+    Actions are looked up, templates like "{field}" parsed and constant
+    values converted to the parameter types declared by the action, all
+    before anything runs. `variables` are the loop variable names; templates
+    using any other name are rejected (None skips that check). Raises
+    PlanError listing every problem found.
+    """
+    variables = set(variables) if variables is not None else None
+    compiled, problems = [], []
+
+    for i, step_config in enumerate(steps):
+        action_name = step_config.get("type")
+        action_def = get_action(action_name)
+        if not action_def:
+            problems.append(f"step {i + 1}: unknown action '{action_name}'")
+            continue
+
+        params = []
+        for param in action_def.params:
+            if param not in step_config:
+                # Optional parameters missing from older recipes keep their default
+                if param in action_def.defaults:
+                    continue
+                problems.append(f"step {i + 1} ({action_name}): missing '{param}'")
+                continue
+            try:
+                params.append(_Param(param, str(step_config[param]),
+                                     action_def.types.get(param, inspect.Parameter.empty), variables))
+            except PlanError as e:
+                problems.append(f"step {i + 1} ({action_name}): {e}")
+        compiled.append(PlanStep(i, action_def, params))
+
+    if problems:
+        raise PlanError("; ".join(problems))
+    return ExecutionPlan(compiled, variables)
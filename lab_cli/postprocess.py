@@ -0,0 +1,148 @@
+# Background post-processing (plots, exports) for sweeps
+import atexit
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+# Worker processes, and how many jobs may wait before submit() blocks
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 8
+
+
+def render_png(sweep_path: str, png_path: str, title: Optional[str] = None,
+               xlabel: str = "Wavelength (nm)", ylabel: Optional[str] = None) -> str:
+    """
+    Plots the second column of a stored sweep against the first (the
+    y label defaults to the column name) to a PNG.
+    Runs in a worker process; reads the sweep back from disk so the
+    arrays don't have to be pickled across. Long sweeps are reduced to
+    their min/max envelope at the figure's pixel width first.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from .storage import load_sweep
+    from .decimation import envelope
+
+    columns, _ = load_sweep(sweep_path)
+    (_, x), (y_name, y) = list(columns.items())[:2]
+
+    fig = plt.figure()
+    width_px = int(fig.get_figwidth() * fig.dpi)
+    plt.plot(*envelope(x, y, width_px))
+    plt.title(title or os.path.splitext(os.path.basename(sweep_path))[0])
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel or y_name)
+    plt.grid(True)
+    fig.savefig(png_path)
+    plt.close(fig)
+    return png_path
+
+def write_export(sweep_path: str, output: Optional[str] = None) -> str:
+    """Writes an .xlsx copy of a stored sweep. Runs in a worker process."""
+    from .storage import export_excel
+    return export_excel(sweep_path, output)
+
+
+class PostProcessor:
+    """
+    Runs plotting and export jobs in a process pool so acquisition can
+    carry on (e.g. the next field ramp) while matplotlib/Excel work.
+
+    submit() returns straight away unless max_pending jobs are already
+    waiting, in which case it blocks until one finishes. flush() waits for
+    everything submitted so far. With workers=0, or if a pool can't be
+    started, jobs run inline.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max(1, max_pending)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, Future]] = []
+        # Errors of jobs already dropped from _pending, reported by flush()
+        self._failures: List[Tuple[str, Exception]] = []
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._pool is None and self.workers > 0:
+                try:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                except (OSError, NotImplementedError):
+                    # No multiprocessing here; fall back to running inline
+                    self.workers = 0
+            return self._pool
+
+    def _forget_finished(self):
+        """Drops finished jobs (and their results), keeping only errors. Call with the lock held."""
+        running = []
+        for label, future in self._pending:
+            if not future.done():
+                running.append((label, future))
+            elif future.exception() is not None:
+                self._failures.append((label, future.exception()))
+        self._pending = running
+
+    @property
+    def backlog(self) -> int:
+        """Jobs submitted but not finished yet."""
+        with self._lock:
+            return sum(1 for _, f in self._pending if not f.done())
+
+    def submit(self, label: str, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queues func(*args, **kwargs). func must be a module-level function
+        and paths should be absolute (workers keep their own working directory).
+        """
+        pool = self._get_pool()
+        if pool is None:
+            future: Future = Future()
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            self._slots.acquire()
+            try:
+                future = pool.submit(func, *args, **kwargs)
+            except Exception:
+                self._slots.release()
+                raise
+            future.add_done_callback(lambda _: self._slots.release())
+
+        with self._lock:
+            self._forget_finished()
+            self._pending.append((label, future))
+        return future
+
+    def flush(self) -> List[Tuple[str, Exception]]:
+        """
+        Waits for all submitted jobs. Returns (label, error) for each job
+        that failed since the last flush; finished jobs are forgotten either way.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            failures, self._failures = self._failures, []
+
+        for label, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                failures.append((label, e))
+        return failures
+
+    def shutdown(self):
+        """Waits for outstanding jobs and stops the worker processes."""
+        self.flush()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+# Global instance shared by the actions and the CLI
+postprocessor = PostProcessor()
+atexit.register(postprocessor.shutdown)
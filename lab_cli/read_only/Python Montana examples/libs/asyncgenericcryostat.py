@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""Asyncio counterpart of genericcryostat.GenericCryostat
+
+Example usage:
+ import asyncio, asyncgenericcryostat
+ async def main():
+     cryo = asyncgenericcryostat.AsyncGenericCryostat('192.168.1.123', port=47101)
+     snaps = await cryo.get_thermometer_snapshots()
+     for channel, snap in snaps.items():
+         print(channel, snap.temperature, snap.stability)
+ asyncio.run(main())
+"""
+
+import asyncio
+import asyncinstrument
+import genericcryostat
+
+from typing import Dict, List, Optional, Tuple
+
+ThermometerSnapshot = genericcryostat.ThermometerSnapshot
+
+
+class AsyncGenericCryostat(asyncinstrument.AsyncInstrument):
+    """Read-side functionality common to all cryostats, without blocking."""
+    def __init__(self, ip, port, version='v1', verbose=False,
+                 timeout=None, max_connections=None):
+        super().__init__(ip=ip,
+                         port=port,
+                         version=version,
+                         verbose=verbose,
+                         timeout=timeout,
+                         max_connections=max_connections)
+        return
+
+    # Endpoint names are shared with the blocking class
+    cryo_tc_channel_endpoint_root           = genericcryostat.GenericCryostat.cryo_tc_channel_endpoint_root
+    cryo_thermometer_channel_sample_endpoint = genericcryostat.GenericCryostat.cryo_thermometer_channel_sample_endpoint
+    cryo_heater_channel_sample_endpoint     = genericcryostat.GenericCryostat.cryo_heater_channel_sample_endpoint
+
+    async def cryo_thermometer_channels(self) -> List[tuple]:
+        """Return names of the thermometers as (location, channel) pairs"""
+        def is_tc(x):
+            return (len(x)==10
+                    and x[3]=='v1'
+                    and x[5]=='temperatureControllers'
+                    and x[7:10]==['thermometer', 'properties', 'sample'])
+
+        endpoints = await self.get_prop('/')
+        return list(set([(x[4], x[6]) for x in [x.split('/') for x in endpoints] if is_tc(x)]))
+
+    async def get_thermometer_snapshot(self, channel) -> ThermometerSnapshot:
+        """Fetch one thermometer sample for a (location, channel) pair."""
+        r = await self.get_prop(self.cryo_thermometer_channel_sample_endpoint(channel))
+        return ThermometerSnapshot(r['sample'])
+
+    async def get_thermometer_snapshots(self, channels=None) -> Dict[tuple, ThermometerSnapshot]:
+        """Fetch every channel's sample concurrently.
+
+        Keyword arguments:
+           channels  (optional) (location, channel) pairs.  All thermometers
+                     of the cryostat when omitted.
+        """
+        if channels is None:
+            channels = await self.cryo_thermometer_channels()
+        snaps = await asyncio.gather(*[self.get_thermometer_snapshot(c) for c in channels])
+        return dict(zip(channels, snaps))
+
+    async def get_heater_sample(self, channel):
+        r = await self.get_prop(self.cryo_heater_channel_sample_endpoint(channel))
+        return r['sample']
+
+
+async def read_all_thermometers(cryostats, channels=None):
+    """Snapshot the thermometers of several cryostats at once.
+
+    Keyword arguments:
+       cryostats  Iterable of AsyncGenericCryostat.
+       channels   (optional) Same channel list for every cryostat.
+
+    Return
+       List with one {channel: ThermometerSnapshot} dict (or the exception
+       raised for that cryostat) per cryostat, in order.
+    """
+    return await asyncio.gather(*[c.get_thermometer_snapshots(channels) for c in cryostats],
+                                return_exceptions=True)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+#
+# Asyncio counterpart of instrument.Instrument.
+#
+# Talks HTTP/1.1 over asyncio streams with keep-alive, so it needs nothing
+# beyond the standard library.  Many instruments (or many endpoints on one
+# instrument) can be read concurrently from a single thread.
+#
+# Example usage:
+#  import asyncio, asyncinstrument
+#  async def main():
+#      inst = asyncinstrument.AsyncInstrument('192.168.45.123', port=47101, version='v1')
+#      print(await inst.get_prop('/controller/properties/systemState'))
+#      await inst.close()
+#  asyncio.run(main())
+#
+import asyncio
+import json
+from urllib.parse import urlencode
+
+import instrument
+from instrument import ApiError, NotConnected, BadUrl
+
+_default_timeout = 10.0
+_default_max_connections = 4
+
+
+class _Response:
+    """Just enough of requests.Response for instrument._verifySuccess()."""
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers     = headers
+        self.content     = content
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+    async def _read_body(self, headers):
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0].strip(), 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            return b''.join(chunks)
+        length = int(headers.get('content-length', '0'))
+        return await self.reader.readexactly(length) if length else b''
+
+    async def request(self, method, host, target, body=None):
+        lines = [f'{method} {target} HTTP/1.1',
+                 f'Host: {host}',
+                 'Connection: keep-alive',
+                 'Accept: application/json']
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            lines.append('Content-Type: application/json')
+        lines.append(f'Content-Length: {len(payload)}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('ascii') + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Server closed the connection')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        content = await self._read_body(headers)
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return _Response(status, headers, content)
+
+
+class AsyncInstrument:
+    def __init__(self, ip, port, version, verbose=False,
+                 timeout=None, max_connections=None):
+        """Create an asyncio instrument object
+
+        Keyword arguments:
+          ip              -- IP address (or hostname) of the instrument.
+          port            -- TCP Port number of the service on the MIEC.
+          version         -- REST API version (e.g. "v1")
+          verbose         -- Print debug information?
+          timeout         -- Seconds allowed for one request.
+          max_connections -- Keep-alive connections opened at most, i.e.
+                             how many requests run in parallel.
+        """
+        (self.ip, self.port, _) = instrument._rewrite_connection(ip, port, False)
+        self.version         = version
+        self.verbose         = verbose
+        self.timeout         = _default_timeout if timeout is None else timeout
+        self.max_connections = max_connections or _default_max_connections
+
+        self._idle  = []
+        self._slots = None
+        self._loop  = None
+        return
+
+    def _bind_loop(self):
+        """Connections belong to one event loop; start over on a new one.
+
+        Connections left from a loop that has already been closed can't be
+        closed any more, so await close() before each asyncio.run() ends.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None and not self._loop.is_closed():
+                for conn in self._idle:
+                    conn.close()
+            self._idle  = []
+            self._slots = asyncio.Semaphore(self.max_connections)
+            self._loop  = loop
+
+    async def close(self):
+        """Close the idle keep-alive connections (on the loop that opened them)."""
+        for conn in self._idle:
+            conn.close()
+        self._idle = []
+
+    def url(self, path):
+        if self.ip is None: raise NotConnected()
+        path = path.strip('/')
+        path = path.replace('//', '/')
+        return f'/{self.version}/{path}'
+
+    async def _request(self, op, path, body=None, params=None):
+        self._bind_loop()
+        target = self.url(path)
+        if params:
+            target += '?' + urlencode(params)
+        if self.verbose: print(f'{op} http://{self.ip}:{self.port}{target} [data -> {body}]')
+
+        async with self._slots:
+            # A reused keep-alive connection may have been closed by the
+            # server while idle; GET/PUT are retried once on a fresh one.
+            for attempt in range(2):
+                reused = bool(self._idle)
+                conn = self._idle.pop() if reused else None
+                try:
+                    if conn is None:
+                        reader, writer = await asyncio.wait_for(
+                            asyncio.open_connection(self.ip, int(self.port)), self.timeout)
+                        conn = _Connection(reader, writer)
+                    resp = await asyncio.wait_for(
+                        conn.request(op, f'{self.ip}:{self.port}', target, body), self.timeout)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    if conn is not None:
+                        conn.close()
+                    if reused and attempt == 0 and op in ('GET', 'PUT'):
+                        continue
+                    raise
+                if not conn.closed:
+                    self._idle.append(conn)
+                break
+
+        instrument._verifySuccess(op, path, resp)
+
+        c = resp.content.decode('utf-8')
+        if c != '':
+            return json.loads(c)
+        return None
+
+    async def is_up(self):
+        """Is the instrument responding?
+        """
+        try:
+            await self.get_prop('/version')
+        except ApiError:
+            # It answered, it just didn't like the request
+            return True
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return False
+        return True
+
+    async def call_method(self, path, data=None):
+        """Call a method to perform some action with the instrument."""
+        return await self._request('POST', path, body=data)
+
+    async def set_prop(self, path, data=None):
+        return await self._request('PUT', path, body=data)
+
+    async def get_prop(self, path, params=None):
+        """Retrieve a property value via REST from the instrument
+
+        Keyword arguments:
+           path    The non-root portion of the URI.
+                   e.g. "/controller1/thermometer/properties/sample"
+           params  (optional) Any parameters that need to be passed
+                   along in the GET message.
+        """
+        return await self._request('GET', path, params=params)
+
+    async def get_props(self, paths):
+        """Retrieve several properties concurrently, results in order."""
+        return await asyncio.gather(*[self.get_prop(p) for p in paths])
+
+
+async def gather_props(reads, return_exceptions=False):
+    """Read properties from several instruments at once.
+
+    Keyword arguments:
+       reads   Iterable of (AsyncInstrument, path) pairs.
+       return_exceptions
+               If True a failed read returns its exception instead of
+               cancelling the others.
+
+    Return
+       List of results in the same order as reads.
+    """
+    return await asyncio.gather(*[inst.get_prop(path) for inst, path in reads],
+                                return_exceptions=return_exceptions)
@@ -25,6 +25,25 @@ class PidScheduleItem:
     def __repr__(self):
         return repr((self.temperature, self.kc, self.ti, self.td))
 
+
+class ThermometerSnapshot:
+    """One thermometer sample, fetched once and read as often as needed.
+
+    Every field of the .../thermometer/properties/sample response comes
+    from the same GET, so a poll that needs the temperature, stability and
+    stable flag should read them all from one snapshot.
+    """
+    def __init__(self, sample):
+        self.sample          = sample
+        self.temperature_ok  = sample.get('temperatureOK')
+        self.temperature     = sample.get('temperatureAvg1Sec')
+        self.stability_ok    = sample.get('temperatureStabilityOK')
+        self.stability       = sample.get('temperatureStability')
+        self.stable          = sample.get('temperatureStable')
+        return
+    def __repr__(self):
+        return repr((self.temperature, self.stability, self.stable))
+
     
 class GenericCryostat(instrument.Instrument):
     """Functionality common to all cryostat instruments. 
@@ -32,12 +51,15 @@ class GenericCryostat(instrument.Instrument):
     All derived classes should register themselves using the
     @genericcryostat.register decorator. 
     """
-    def __init__(self, ip, port, version='v1', verbose=False, tunnel=False):
+    def __init__(self, ip, port, version='v1', verbose=False, tunnel=False,
+                 timeout=None, retries=None):
         super().__init__(ip=ip,
                          port=port,
                          version=version,
                          verbose=verbose,
-                         tunnel=tunnel)
+                         tunnel=tunnel,
+                         timeout=timeout,
+                         retries=retries)
         return
     
     def cryo_thermometer_channels(self) -> List[tuple]:
@@ -116,6 +138,25 @@ class GenericCryostat(instrument.Instrument):
 
         return f'{self.cryo_tc_channel_endpoint_root(channel)}/thermometer/properties/sample'
 
+    def get_thermometer_snapshot(self, channel) -> ThermometerSnapshot:
+        """Fetch one thermometer sample for a channel.
+
+        Keywords arguments:
+           channel     A pair of strings.  First item is the name of the 
+                       chamber (e.g. sampleChamber).  Second item is the channel
+                       (e.g. platform)
+        """
+        r = self.get_prop(self.cryo_thermometer_channel_sample_endpoint(channel))
+        return ThermometerSnapshot(r['sample'])
+
+    def get_thermometer_snapshots(self, channels) -> dict:
+        """Fetch each channel's sample endpoint once.
+
+        Return
+           { channel: ThermometerSnapshot }
+        """
+        return { c: self.get_thermometer_snapshot(c) for c in channels }
+
     def cryo_heater_channel_sample_endpoint(self, channel):
         """Return endpoint names of the heaters for s and xp series Cryostations
 
@@ -14,6 +14,8 @@ sys.path.append(op.abspath(op.join(op.dirname(__file__), os.pardir, os.pardir, '
 
 from enum import IntEnum
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import re
 import time
@@ -28,6 +30,11 @@ _force_ipv4 = True  # Some day IPv6 will be ubiquitous.  Today is not that day.
 
 _success = range(200,300)
 
+# Default (connect, read) timeouts in seconds and number of retries used by
+# every Instrument unless overridden in the constructor.
+_default_timeout = (3.05, 10.0)
+_default_retries = 2
+
 class Rest_Ports(IntEnum):
     """Constants for TCP port numbers of the various REST servers
     """
@@ -107,6 +114,26 @@ def _verifySuccess(op, path, resp) -> None:
 
     return
 
+def _make_session(retries):
+    """Create a keep-alive HTTP session for one instrument.
+
+    Connection failures are retried for every request.  Read failures are
+    only retried for GET and PUT, because a POST calls a method on the
+    instrument and must not run twice.
+    """
+    retry = Retry(total=retries,
+                  connect=retries,
+                  read=retries,
+                  status=0,
+                  backoff_factor=0.1,
+                  allowed_methods=frozenset(['GET', 'PUT']),
+                  raise_on_status=False)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 def _rewrite_connection(ip, port, tunnel):
     """For hostnames that start with "mirs:" determine port on MIRS server
 
@@ -131,7 +158,8 @@ def _rewrite_connection(ip, port, tunnel):
     return (ip, port, tunnel)
         
 class Instrument:
-    def __init__(self, ip, port, version, verbose=False, tunnel=False):
+    def __init__(self, ip, port, version, verbose=False, tunnel=False,
+                 timeout=None, retries=None):
         """Create a base instrument object for Scripting R3
 
         Keyword arguments:
@@ -147,10 +175,16 @@ class Instrument:
           version -- REST API version (e.g. "v1")
           verbose -- Print debug information?
           tunnel  -- Communicate through a secure SSH tunnel?
+          timeout -- (connect, read) timeout in seconds, or a single
+                     number for both.  Defaults to _default_timeout.
+          retries -- How often to retry a failed request.  Defaults
+                     to _default_retries.
         """
         assert not isinstance(port, (list,tuple)), "This class can only talk to a single port"
 
         self.tun     = None
+        self.session = None
+        self.timeout = _default_timeout if timeout is None else timeout
         (self.ip, self.port, tunnel) = _rewrite_connection(ip, port, tunnel)
 
         self.version = version
@@ -163,11 +197,17 @@ class Instrument:
                 raise TunnelError("Could not start the ssh tunnel.  Have you copied your ssh keys?")
             self.ip   = self.tun.local_bind_address[0]
             self.port = self.tun.local_bind_ports[0]
+
+        # One pooled keep-alive session for every GET/PUT/POST
+        self.session = _make_session(_default_retries if retries is None else retries)
         return
 
     def close(self):
         if self.tun is not None:
             self.tun.stop()
+        if getattr(self, 'session', None) is not None:
+            self.session.close()
+        self.session = None
         self.ip      = None
         self.port    = None
         self.version = None
@@ -226,6 +266,10 @@ class Instrument:
 
         return f'{root}/{path}'
 
+    def _session(self):
+        if self.session is None: raise NotConnected()
+        return self.session
+
     def call_method(self, path, data=None):
         """Call a method to perform some action with the instrument.
 
@@ -233,10 +277,10 @@ class Instrument:
         uri = self.url(path)
         if (data is not None):
             if (self.verbose): print(f'POST {uri} [data -> {data}]')
-            resp = requests.post(uri, json=data)
+            resp = self._session().post(uri, json=data, timeout=self.timeout)
         else:
             if (self.verbose): print(f'POST {uri}')
-            resp = requests.post(uri)
+            resp = self._session().post(uri, timeout=self.timeout)
 
         _verifySuccess('POST', path, resp)
 
@@ -248,7 +292,7 @@ class Instrument:
         uri = self.url(path)
 
         if (self.verbose): print(f'PUT {uri} [data -> {data}]')
-        resp = requests.put(uri, json=data)
+        resp = self._session().put(uri, json=data, timeout=self.timeout)
 
         _verifySuccess('PUT', path, resp)
 
@@ -269,7 +313,7 @@ class Instrument:
         if (self.verbose): print(f'GET {uri} [params -> {params}]')
         try:
             # print(f"uri is |{uri}|")
-            resp = requests.get(uri, params)
+            resp = self._session().get(uri, params=params, timeout=self.timeout)
         except requests.exceptions.InvalidURL:
             raise BadUrl() from None
         except requests.exceptions.ConnectionError:
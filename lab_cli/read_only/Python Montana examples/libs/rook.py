@@ -8,12 +8,15 @@ import time
 import datetime
 
 class Rook(instrument.Instrument):
-    def __init__(self, ip, version='v1', verbose=False, tunnel=False):
+    def __init__(self, ip, version='v1', verbose=False, tunnel=False,
+                 timeout=None, retries=None):
         super().__init__(ip=ip,
                          port=instrument.Rest_Ports.lynx_hlm,
                          version=version,
                          verbose=verbose,
-                         tunnel=tunnel)
+                         tunnel=tunnel,
+                         timeout=timeout,
+                         retries=retries)
 
     #
     # Controller commands
@@ -14,6 +14,10 @@ Example usage:
  cryo.get_platform_temperature_stability()
  cryo.warmup()
 
+ # One GET per tick for temperature, stability and stable flag
+ snap = cryo.get_platform_snapshot()
+ snap.temperature, snap.stability, snap.stable
+
  # Shows how to use generic post/get/put methods for accessing any REST url/end-point
  cryo.call_method('/controller/methods/cooldown()')
  cryo.get_prop('/sampleChamber/temperatureControllers/platform/thermometer/sample')['sample']['temperatureAvg1Sec']
@@ -26,15 +30,28 @@ import genericcryostat
 
 Ports = instrument.Rest_Ports
 
+# Thermometer channels as (location, channel) pairs
+Channels = {
+    'stage1':    ('cooler',        'stage1'),
+    'stage2':    ('cooler',        'stage2'),
+    'platform':  ('sampleChamber', 'platform'),
+    'user1':     ('sampleChamber', 'user1'),
+    'user2':     ('sampleChamber', 'user2'),
+    'cryooptic': ('sampleChamber', 'cryoOptic'),
+}
+
 
 @genericcryostat.register
 class SCryostation(genericcryostat.GenericCryostat):
-    def __init__(self, ip, version='v1', verbose=False, tunnel=False, port=Ports.scryostation_hlm):
+    def __init__(self, ip, version='v1', verbose=False, tunnel=False, port=Ports.scryostation_hlm,
+                 timeout=None, retries=None):
         super().__init__(ip=ip,
                          port=port,
                          version=version,
                          verbose=verbose,
-                         tunnel=tunnel)
+                         tunnel=tunnel,
+                         timeout=timeout,
+                         retries=retries)
 
     def cooldown(self):
         self.call_method('/controller/methods/cooldown()')
@@ -93,25 +110,29 @@ class SCryostation(genericcryostat.GenericCryostat):
     #
     # Stage1 methods
     #
+    def get_stage1_snapshot(self):
+        return self.get_thermometer_snapshot(Channels['stage1'])
+
     def get_stage1_temperature_sample(self):
-        r = self.get_prop('/cooler/temperatureControllers/stage1/thermometer/properties/sample')
-        return r['sample']
+        return self.get_stage1_snapshot().sample
 
     def get_stage1_temperature(self):
-        r = self.get_prop('/cooler/temperatureControllers/stage1/thermometer/properties/sample')
-        return r['sample']['temperatureOK'], r['sample']['temperatureAvg1Sec']
+        s = self.get_stage1_snapshot()
+        return s.temperature_ok, s.temperature
 
 
     #
     # Stage2 methods
     #
+    def get_stage2_snapshot(self):
+        return self.get_thermometer_snapshot(Channels['stage2'])
+
     def get_stage2_temperature_sample(self):
-        r = self.get_prop('/cooler/temperatureControllers/stage2/thermometer/properties/sample')
-        return r['sample']
+        return self.get_stage2_snapshot().sample
 
     def get_stage2_temperature(self):
-        r = self.get_prop('/cooler/temperatureControllers/stage2/thermometer/properties/sample')
-        return r['sample']['temperatureOK'], r['sample']['temperatureAvg1Sec']
+        s = self.get_stage2_snapshot()
+        return s.temperature_ok, s.temperature
 
     #
     # Platform methods
@@ -124,23 +145,25 @@ class SCryostation(genericcryostat.GenericCryostat):
         return self.set_prop('/controller/properties/platformTargetTemperature', target)
 
     def get_platform_temperature(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/platform/thermometer/properties/sample')
-        return r['sample']['temperatureOK'], r['sample']['temperatureAvg1Sec']
+        s = self.get_platform_snapshot()
+        return s.temperature_ok, s.temperature
 
     def get_platform_temperature_stability(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/platform/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStability']
+        s = self.get_platform_snapshot()
+        return s.stability_ok, s.stability
 
     def set_platform_stability_target(self, target):
         return self.set_prop('/sampleChamber/temperatureControllers/platform/thermometer/properties/stabilityTarget', target)
 
     def get_platform_temperature_stable(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/platform/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStable']
+        s = self.get_platform_snapshot()
+        return s.stability_ok, s.stable
+
+    def get_platform_snapshot(self):
+        return self.get_thermometer_snapshot(Channels['platform'])
 
     def get_platform_temperature_sample(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/platform/thermometer/properties/sample')
-        return r['sample']
+        return self.get_platform_snapshot().sample
 
     def get_platform_heater_sample(self):
         r = self.get_prop('/sampleChamber/temperatureControllers/platform/heater/properties/sample')
@@ -149,24 +172,26 @@ class SCryostation(genericcryostat.GenericCryostat):
     #
     # User1 methods
     #
+    def get_user1_snapshot(self):
+        return self.get_thermometer_snapshot(Channels['user1'])
+
     def get_user1_temperature_sample(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user1/thermometer/properties/sample')
-        return r['sample']
+        return self.get_user1_snapshot().sample
 
     def get_user1_temperature(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user1/thermometer/properties/sample')
-        return r['sample']['temperatureOK'], r['sample']['temperatureAvg1Sec']
+        s = self.get_user1_snapshot()
+        return s.temperature_ok, s.temperature
 
     def get_user1_temperature_stability(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user1/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStability']
+        s = self.get_user1_snapshot()
+        return s.stability_ok, s.stability
 
     def set_user1_stability_target(self, target):
         return self.set_prop('/sampleChamber/temperatureControllers/user1/thermometer/properties/stabilityTarget', target)
 
     def get_user1_temperature_stable(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user1/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStable']    
+        s = self.get_user1_snapshot()
+        return s.stability_ok, s.stable
 
     def set_user1_temperature_controller_enabled(self, enabled):
         return self.set_prop('/sampleChamber/temperatureControllers/user1/properties/controllerEnabled', enabled)
@@ -185,24 +210,26 @@ class SCryostation(genericcryostat.GenericCryostat):
     #
     # User2 methods
     #
+    def get_user2_snapshot(self):
+        return self.get_thermometer_snapshot(Channels['user2'])
+
     def get_user2_temperature_sample(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user2/thermometer/properties/sample')
-        return r['sample']
+        return self.get_user2_snapshot().sample
 
     def get_user2_temperature(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user2/thermometer/properties/sample')
-        return r['sample']['temperatureOK'], r['sample']['temperatureAvg1Sec']
+        s = self.get_user2_snapshot()
+        return s.temperature_ok, s.temperature
 
     def get_user2_temperature_stability(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user2/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStability']
+        s = self.get_user2_snapshot()
+        return s.stability_ok, s.stability
 
     def set_user2_stability_target(self, target):
         return self.set_prop('/sampleChamber/temperatureControllers/user2/thermometer/properties/stabilityTarget', target)
 
     def get_user2_temperature_stable(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/user2/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStable']
+        s = self.get_user2_snapshot()
+        return s.stability_ok, s.stable
 
     def set_user2_temperature_controller_enabled(self, enabled):
         return self.set_prop('/sampleChamber/temperatureControllers/user2/properties/controllerEnabled', enabled)
@@ -221,24 +248,26 @@ class SCryostation(genericcryostat.GenericCryostat):
     #
     # Cryo-Optic methods
     #
+    def get_cryooptic_snapshot(self):
+        return self.get_thermometer_snapshot(Channels['cryooptic'])
+
     def get_cryooptic_temperature_sample(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/cryoOptic/thermometer/properties/sample')
-        return r['sample']
+        return self.get_cryooptic_snapshot().sample
 
     def get_cryooptic_temperature(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/cryoOptic/thermometer/properties/sample')
-        return r['sample']['temperatureOK'], r['sample']['temperatureAvg1Sec']
+        s = self.get_cryooptic_snapshot()
+        return s.temperature_ok, s.temperature
 
     def get_cryooptic_temperature_stability(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/cryoOptic/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStability']
+        s = self.get_cryooptic_snapshot()
+        return s.stability_ok, s.stability
 
     def set_cryooptic_stability_target(self, target):
         return self.set_prop('/sampleChamber/temperatureControllers/cryoOptic/thermometer/properties/stabilityTarget', target)
 
     def get_cryooptic_temperature_stable(self):
-        r = self.get_prop('/sampleChamber/temperatureControllers/cryoOptic/thermometer/properties/sample')
-        return r['sample']['temperatureStabilityOK'], r['sample']['temperatureStable']
+        s = self.get_cryooptic_snapshot()
+        return s.stability_ok, s.stable
 
     def set_cryooptic_temperature_controller_enabled(self, enabled):
         return self.set_prop('/sampleChamber/temperatureControllers/cryoOptic/properties/controllerEnabled', enabled)
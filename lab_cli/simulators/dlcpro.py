@@ -0,0 +1,276 @@
+# In-process stand-in for a Toptica DLC pro
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..connections.laser import (is_simulated, SIGNAL_NONE, SIGNAL_TIME, SIGNAL_CTL_POWER,
+                                 SIGNAL_CTL_WAVELENGTH_ACT, SIGNAL_FINE_IN1)
+
+# Recorder block ids per data channel
+BLOCK_IDS = {"channelx": "x", "channel1": "y", "channel2": "Y"}
+
+
+def encode_float_blocks(blocks: List[Tuple[str, np.ndarray]]) -> bytes:
+    """
+    Encodes arrays in the DLC pro 'Scope, Lock, and Recorder Binary Data'
+    format: block id letter, payload length in bytes as ASCII digits, a NUL
+    byte, then the payload as little-endian float32.
+    """
+    out = []
+    for block_id, values in blocks:
+        payload = np.asarray(values, dtype="<f4").tobytes()
+        out.append(block_id.encode("ascii") + str(len(payload)).encode("ascii") + b"\0" + payload)
+    return b"".join(out)
+
+
+class _Param:
+    """A DLC pro parameter: .get() and, unless read-only, .set()."""
+
+    def __init__(self, device: "SimulatedDLCpro", value=None,
+                 getter: Optional[Callable] = None, readonly: bool = False,
+                 on_set: Optional[Callable] = None):
+        self._device = device
+        self._value = value
+        self._getter = getter
+        self._readonly = readonly
+        self._on_set = on_set
+
+    def get(self):
+        self._device._call()
+        return self._getter() if self._getter else self._value
+
+    def set(self, value):
+        if self._readonly:
+            raise PermissionError("Parameter is read-only")
+        self._device._call()
+        self._device.write_count += 1
+        self._value = value
+        if self._on_set:
+            self._on_set(value)
+
+
+class _Node:
+    """Attribute container for a branch of the parameter tree."""
+
+
+class SimulatedDLCpro:
+    """
+    Simulates the parts of a DLC pro used by this project.
+
+    It serves the same attribute tree as
+    toptica.lasersdk.dlcpro.v2_0_3.DLCpro: system_health_txt,
+    laser1.emission, laser1.ctl.wavelength_act, laser1.wide_scan.* and
+    laser1.recorder.*. Wide scans run in (scaled) real time, the recorder
+    fills up while the scan runs, and recorder.data.get_data() returns the
+    same binary blocks as the real device.
+
+    Args:
+        time_scale: Simulated seconds per wall-clock second (speeds up scans).
+        latency: Delay per parameter access (seconds).
+        transfer_rate: get_data() throughput in bytes/second (None = instant).
+        memory_size: Recorder capacity in samples.
+        max_chunk: Largest sample count a single get_data() accepts.
+        error_rate: Fraction of get_data() calls that fail (transfer errors).
+        resonances: (center_nm, fwhm_nm, depth) dips in the transmission.
+        noise: Intensity noise (1 sigma).
+        seed: Seed for repeatable noise.
+    """
+
+    def __init__(self, time_scale: float = 1.0, latency: float = 0.0,
+                 transfer_rate: Optional[float] = None, memory_size: int = 1_000_000,
+                 max_chunk: int = 65536, resonances: Optional[List[Tuple[float, float, float]]] = None,
+                 noise: float = 0.002, wavelength: float = 1530.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.time_scale = time_scale
+        self.latency = latency
+        self.transfer_rate = transfer_rate
+        self.max_chunk = max_chunk
+        self.error_rate = error_rate
+        self.resonances = resonances if resonances is not None else [(1532.5, 0.01, 0.6)]
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+
+        self.call_count = 0
+        self.write_count = 0
+        self.bytes_sent = 0
+        self.is_open = False
+
+        self._scan_t0: Optional[float] = None
+        self._scan: Optional[Tuple[float, float, float]] = None   # begin, end, speed
+        self._rec: Optional[Dict[str, np.ndarray]] = None
+        self._rec_interval = 0.0
+        self._rec_count = 0
+        self._wavelength = wavelength
+
+        self.system_health_txt = _Param(self, "OK", readonly=True)
+
+        laser1 = self.laser1 = _Node()
+        laser1.emission = _Param(self, True)
+
+        laser1.ctl = _Node()
+        laser1.ctl.wavelength_act = _Param(self, getter=self._wavelength_now, readonly=True)
+        laser1.ctl.wavelength_set = _Param(self, wavelength, on_set=self._set_wavelength)
+
+        laser1.power_stabilization = _Node()
+        laser1.power_stabilization.input_channel_value_act = _Param(self, 10.0, readonly=True)
+
+        ws = laser1.wide_scan = _Node()
+        ws.scan_begin = _Param(self, 1530.0)
+        ws.scan_end = _Param(self, 1535.0)
+        ws.speed = _Param(self, 5.0)
+        ws.state = _Param(self, getter=self._scan_state, readonly=True)
+        ws.start = self._start_scan
+        ws.stop = self._stop_scan
+
+        rec = laser1.recorder = _Node()
+        rec.recording_time = _Param(self, 2.0)
+        rec.sample_count_set = _Param(self, 200)
+        rec.sample_count = _Param(self, getter=self._sample_count, readonly=True)
+        rec.sampling_interval = _Param(self, getter=lambda: rec.recording_time._value / max(1, self._sample_count()), readonly=True)
+        rec.memory_size = _Param(self, memory_size, readonly=True)
+
+        rec.inputs = _Node()
+        rec.inputs.channelx = _Node()
+        rec.inputs.channelx.signal = _Param(self, SIGNAL_CTL_WAVELENGTH_ACT)
+        rec.inputs.channel1 = _Node()
+        rec.inputs.channel1.signal = _Param(self, SIGNAL_FINE_IN1)
+        rec.inputs.channel2 = _Node()
+        rec.inputs.channel2.signal = _Param(self, SIGNAL_NONE)
+
+        rec.data = _Node()
+        rec.data.recorded_sample_count = _Param(self, getter=self._recorded_count, readonly=True)
+        rec.data.recorded_sampling_interval = _Param(self, getter=lambda: self._rec_interval, readonly=True)
+        rec.data.get_data = self._get_data
+
+    # Connection interface (matches DLCpro)
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Internals
+
+    def _call(self):
+        if not self.is_open:
+            raise ConnectionError("Simulated DLC pro is not connected")
+        self.call_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _elapsed(self) -> float:
+        return (time.monotonic() - self._scan_t0) * self.time_scale if self._scan_t0 is not None else 0.0
+
+    def _scan_duration(self) -> float:
+        begin, end, speed = self._scan
+        return abs(end - begin) / speed
+
+    def _wavelength_at(self, t: np.ndarray) -> np.ndarray:
+        begin, end, speed = self._scan
+        direction = 1.0 if end >= begin else -1.0
+        return begin + direction * np.minimum(t * speed, abs(end - begin))
+
+    def _wavelength_now(self) -> float:
+        if self._scan is None:
+            return self._wavelength
+        return float(self._wavelength_at(np.array([self._elapsed()]))[0])
+
+    def _set_wavelength(self, value):
+        self._scan = None
+        self._wavelength = float(value)
+
+    def _sample_count(self) -> int:
+        rec = self.laser1.recorder
+        return int(min(rec.sample_count_set._value, rec.memory_size._value))
+
+    def _scan_state(self) -> int:
+        if self._scan_t0 is None:
+            return 0
+        return 1 if self._elapsed() < self._scan_duration() else 0
+
+    def _start_scan(self):
+        self._call()
+        ws, rec = self.laser1.wide_scan, self.laser1.recorder
+        begin, end, speed = float(ws.scan_begin._value), float(ws.scan_end._value), float(ws.speed._value)
+        if speed <= 0:
+            raise ValueError("Scan speed must be positive")
+
+        with self.lock:
+            self._scan = (begin, end, speed)
+            count = self._sample_count()
+            self._rec_count = count
+            self._rec_interval = float(rec.recording_time._value) / max(1, count)
+
+            # Precompute the whole recording; samples become readable as time passes
+            t = np.arange(count) * self._rec_interval
+            x = self._wavelength_at(t)
+            y = np.ones(count)
+            for center, fwhm, depth in self.resonances:
+                y -= depth / (1.0 + ((x - center) / (fwhm / 2.0)) ** 2)
+            y += self.rng.normal(0.0, self.noise, count)
+            power = 10.0 + self.rng.normal(0.0, 0.01, count)
+            self._rec = {"channelx": x, "channel1": y, "channel2": power}
+            self._scan_t0 = time.monotonic()
+
+    def _stop_scan(self):
+        self._call()
+        if self._scan_t0 is not None and self._scan_state():
+            # Freeze the scan where it is
+            self._rec_count = self._recorded_count()
+            self._scan_t0 = time.monotonic() - self._scan_duration() / self.time_scale
+
+    def _recorded_count(self) -> int:
+        if self._scan_t0 is None or not self._rec_interval:
+            return 0
+        return int(min(self._rec_count, self._elapsed() // self._rec_interval + 1))
+
+    def _get_data(self, start_index: int, count: int) -> bytes:
+        assert isinstance(start_index, int), f"expected type 'int' for parameter 'start_index', got '{type(start_index)}'"
+        assert isinstance(count, int), f"expected type 'int' for parameter 'count', got '{type(count)}'"
+        self._call()
+        if count > self.max_chunk:
+            raise ValueError(f"count {count} exceeds the maximum of {self.max_chunk}")
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise ConnectionError("Simulated recorder transfer error")
+
+        recorded = self._recorded_count()
+        stop = min(start_index + count, recorded)
+        if self._rec is None or start_index >= stop:
+            return b""
+
+        signals = self.laser1.recorder.inputs
+        blocks = []
+        for channel, block_id in BLOCK_IDS.items():
+            if getattr(signals, channel).signal._value != SIGNAL_NONE:
+                blocks.append((block_id, self._rec[channel][start_index:stop]))
+        data = encode_float_blocks(blocks)
+
+        self.bytes_sent += len(data)
+        if self.transfer_rate:
+            time.sleep(len(data) / self.transfer_rate)
+        return data
+
+
+# Simulators by address, e.g. "sim://laser-01"
+_simulators: Dict[str, SimulatedDLCpro] = {}
+
+def register_simulator(address: str, simulator: SimulatedDLCpro):
+    """Makes `address` (sim://...) resolve to this simulator."""
+    _simulators[address] = simulator
+
+def get_simulator(address: str) -> SimulatedDLCpro:
+    """Returns the simulator for an address, creating a default one."""
+    if address not in _simulators:
+        _simulators[address] = SimulatedDLCpro()
+    return _simulators[address]
@@ -0,0 +1,495 @@
+# Local stand-in for the Montana Instruments REST servers
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, Optional, Tuple
+
+CRYO_PORT = 47101   # Rest_Ports.scryostation_hlm
+ROOK_PORT = 47171   # Rest_Ports.lynx_hlm
+ROOM_TEMPERATURE = 295.0
+STABILITY_WINDOW = 60      # Simulated seconds used for temperatureStability
+MAX_SUBSTEPS = 600         # Caps the work done after a long idle period
+
+
+class _ThermalChannel:
+    """First-order thermal model for one thermometer/heater pair."""
+
+    def __init__(self, temperature: float, base: float, tau: float, noise: float):
+        self.temperature = temperature
+        self.base = base            # Lowest temperature when cold
+        self.target = temperature   # Where the channel is heading
+        self.tau = tau              # Time constant (simulated seconds)
+        self.noise = noise          # Thermometer noise (K, 1 sigma)
+        self.stability_target = 0.01
+        self.controller_enabled = False
+        self.heater_power = 0.0
+        self.history = deque(maxlen=STABILITY_WINDOW)   # readings, one per simulated second
+        self.reading = temperature
+
+    def step(self, dt: float, rng: random.Random):
+        self.temperature += (self.target - self.temperature) * (1.0 - math.exp(-dt / self.tau))
+        self.reading = self.temperature + rng.gauss(0.0, self.noise)
+        self.heater_power = max(0.0, (self.target - self.base) * 0.01) if self.controller_enabled else 0.0
+        self.history.append(self.reading)
+
+    def sample(self) -> Dict[str, Any]:
+        values = list(self.history) or [self.reading]
+        mean = sum(values) / len(values)
+        stability = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+        settled = len(values) >= 10
+        return {
+            "temperatureOK": True,
+            "temperature": self.reading,
+            "temperatureAvg1Sec": self.reading,
+            "temperatureStabilityOK": settled,
+            "temperatureStability": stability,
+            "temperatureStable": settled and stability < self.stability_target,
+        }
+
+
+class _Axis:
+    """Piezo positioner axis moving toward its target at constant velocity."""
+
+    LIMIT = 5e-3   # m
+
+    def __init__(self):
+        self.position = 0.0
+        self.target = 0.0
+        self.velocity = 1e-3    # m/s
+        self.jog = 0
+        self.props: Dict[str, Any] = {}
+
+    def step(self, dt: float):
+        if self.jog:
+            self.target = self.LIMIT * self.jog
+        delta = self.target - self.position
+        travel = self.velocity * dt
+        self.position = self.target if abs(delta) <= travel else self.position + math.copysign(travel, delta)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "moving": self.position != self.target,
+            "targetPosition": self.target,
+            "encoderPosition": self.position,
+        }
+
+
+class MontanaState:
+    """
+    Simulated cryostat (and Rook positioner) state.
+
+    Time advances on every request by the wall-clock time since the last
+    one, multiplied by `time_scale`, so a cooldown that takes hours on the
+    real system can be replayed in seconds.
+    """
+
+    CHANNELS = {
+        ("cooler", "stage1"): (40.0, 600.0, 0.05),
+        ("cooler", "stage2"): (3.2, 600.0, 0.005),
+        ("sampleChamber", "platform"): (3.0, 60.0, 0.0005),
+        ("sampleChamber", "user1"): (3.1, 90.0, 0.001),
+        ("sampleChamber", "user2"): (3.1, 90.0, 0.001),
+    }
+
+    def __init__(self, time_scale: float = 1.0, seed: Optional[int] = None, cold: bool = True):
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.time_scale = time_scale
+        self._last = time.monotonic()
+        self._carry = 0.0
+        self.now = 0.0
+
+        self.channels: Dict[Tuple[str, str], _ThermalChannel] = {}
+        for key, (base, tau, noise) in self.CHANNELS.items():
+            start = base if cold else ROOM_TEMPERATURE
+            ch = _ThermalChannel(start, base, tau, noise)
+            for _ in range(STABILITY_WINDOW):
+                ch.step(1.0, self.rng)
+            self.channels[key] = ch
+
+        self.controller: Dict[str, Any] = {
+            "systemGoal": "None",
+            "systemState": "Ready" if cold else "Warm",
+            "platformTargetTemperature": self.channels[("sampleChamber", "platform")].base,
+        }
+        self.pressure = 1e-7 if cold else 760.0
+        self.vacuum_pump = True
+
+        self.magnet: Dict[str, Any] = {
+            "enabled": False,
+            "state": "Disabled",
+            "safeMode": False,
+            "targetField": 0.0,
+            "calculatedField": 0.0,
+            "measuredCurrent": 0.0,
+        }
+        self.magnet_ramp_rate = 0.01   # T/s
+        self.axes: Dict[Tuple[int, int], _Axis] = {(s, a): _Axis() for s in (1, 2) for a in (1, 2, 3)}
+
+    # Dynamics
+
+    def advance(self):
+        wall = time.monotonic()
+        dt = (wall - self._last) * self.time_scale
+        self._last = wall
+        if dt <= 0:
+            return
+        self.now += dt
+
+        # Thermometers are read on a 1 s simulated grid
+        self._carry += dt
+        steps = min(int(self._carry), MAX_SUBSTEPS)
+        thermal_dt = self._carry / steps if steps else 0.0
+        if steps:
+            self._carry = 0.0
+
+        goal = self.controller["systemGoal"]
+        for key, ch in self.channels.items():
+            if goal == "Warmup" or self.controller["systemState"] == "Warm":
+                ch.target = ROOM_TEMPERATURE
+            elif key == ("sampleChamber", "platform"):
+                ch.target = max(ch.base, float(self.controller["platformTargetTemperature"]))
+            elif not ch.controller_enabled:
+                ch.target = ch.base
+            for _ in range(steps):
+                ch.step(thermal_dt, self.rng)
+
+        # Goals complete once the platform gets there
+        platform = self.channels[("sampleChamber", "platform")]
+        if goal == "Cooldown" and abs(platform.temperature - platform.target) < 0.1:
+            self.controller["systemGoal"], self.controller["systemState"] = "None", "Ready"
+        elif goal == "Warmup" and platform.temperature > ROOM_TEMPERATURE - 1.0:
+            self.controller["systemGoal"], self.controller["systemState"] = "None", "Warm"
+
+        # Pressure follows temperature (cryopumping) unless vented
+        if self.controller["systemState"] != "Warm":
+            self.pressure = max(1e-8, self.pressure * math.exp(-dt / 30.0))
+
+        # Magnet ramps at a fixed rate
+        m = self.magnet
+        if m["enabled"]:
+            delta = float(m["targetField"]) - m["calculatedField"]
+            step = self.magnet_ramp_rate * dt
+            m["calculatedField"] = m["targetField"] if abs(delta) <= step else m["calculatedField"] + math.copysign(step, delta)
+            m["state"] = "Ramping" if m["calculatedField"] != m["targetField"] else "Enabled"
+            m["measuredCurrent"] = m["calculatedField"] * 50.0
+
+        for axis in self.axes.values():
+            axis.step(dt)
+
+    # Endpoint listing
+
+    def endpoints(self, base: str, rook: bool) -> list:
+        if rook:
+            paths = [f"stacks/stack{s}/axes/axis{a}/properties/status" for s, a in self.axes]
+        else:
+            paths = [f"{loc}/temperatureControllers/{ch}/thermometer/properties/sample" for loc, ch in self.channels]
+            paths += [f"{loc}/temperatureControllers/{ch}/heater/properties/sample" for loc, ch in self.channels]
+            paths += [f"controller/properties/{p}" for p in self.controller]
+            paths += [f"magnetoOptic/magnet/properties/{p}" for p in self.magnet]
+            paths += ["vacuumSystem/vacuumGauges/sampleChamberPressure/properties/pressureSample"]
+        return [f"{base}/{p}" for p in paths]
+
+    # Request handling. Each returns (http status, JSON body or None)
+
+    def _magnet_prop(self, parts):
+        if parts[:3] == ["magnetoOptic", "magnet", "properties"] and len(parts) == 4:
+            return parts[3]
+        if parts[:1] == ["magnet"] and len(parts) == 2:
+            return parts[1]
+        return None
+
+    def _channel(self, parts):
+        if len(parts) >= 3 and parts[1] == "temperatureControllers":
+            return self.channels.get((parts[0], parts[2]))
+        return None
+
+    def get(self, parts, rook: bool):
+        if rook:
+            if len(parts) == 6 and parts[0] == "stacks" and parts[5] == "status":
+                axis = self.axes.get((int(parts[1][5:]), int(parts[3][4:])))
+                if axis:
+                    return 200, {"status": axis.status()}
+            return 404, {"title": "Not Found"}
+
+        if parts == ["version"]:
+            return 200, {"version": "simulator"}
+        if len(parts) == 3 and parts[:2] == ["controller", "properties"] and parts[2] in self.controller:
+            return 200, {parts[2]: self.controller[parts[2]]}
+        if parts == ["vacuumSystem", "vacuumGauges", "sampleChamberPressure", "properties", "pressureSample"]:
+            return 200, {"pressureSample": {"pressure": self.pressure, "pressureOK": True}}
+
+        prop = self._magnet_prop(parts)
+        if prop in self.magnet:
+            return 200, {prop: self.magnet[prop]}
+
+        ch = self._channel(parts)
+        if ch is not None:
+            tail = parts[3:]
+            if tail == ["thermometer", "properties", "sample"]:
+                return 200, {"sample": ch.sample()}
+            if tail == ["heater", "properties", "sample"]:
+                return 200, {"sample": {"power": ch.heater_power, "powerOK": True}}
+            if tail == ["thermometer", "properties", "stabilityTarget"]:
+                return 200, {"stabilityTarget": ch.stability_target}
+            if tail == ["properties", "targetTemperature"]:
+                return 200, {"targetTemperature": ch.target}
+            if tail == ["properties", "controllerEnabled"]:
+                return 200, {"controllerEnabled": ch.controller_enabled}
+
+        return 404, {"title": "Not Found"}
+
+    def put(self, parts, value, rook: bool):
+        # set_prop() sends either a bare value or {name: value}
+        name = parts[-1]
+        if isinstance(value, dict) and name in value:
+            value = value[name]
+
+        if rook:
+            if len(parts) == 6 and parts[0] == "stacks":
+                axis = self.axes.get((int(parts[1][5:]), int(parts[3][4:])))
+                if axis:
+                    if name == "velocity":
+                        axis.velocity = abs(float(value))
+                    else:
+                        axis.props[name] = value
+                    return 204, None
+            return 404, {"title": "Not Found"}
+
+        if len(parts) == 3 and parts[:2] == ["controller", "properties"]:
+            self.controller[name] = value
+            return 204, None
+
+        prop = self._magnet_prop(parts)
+        if prop is not None:
+            if prop == "state":
+                self.magnet["enabled"] = str(value).upper() == "ENABLED"
+            elif prop == "enabled":
+                self.magnet["enabled"] = bool(value)
+            elif prop == "targetField":
+                self.magnet["targetField"] = float(value)
+            else:
+                self.magnet[prop] = value
+            if not self.magnet["enabled"]:
+                self.magnet["state"] = "Disabled"
+            return 204, None
+
+        ch = self._channel(parts)
+        if ch is not None:
+            if name == "stabilityTarget":
+                ch.stability_target = float(value)
+            elif name == "targetTemperature":
+                ch.target = float(value)
+            elif name == "controllerEnabled":
+                ch.controller_enabled = bool(value)
+            return 204, None
+
+        return 404, {"title": "Not Found"}
+
+    def post(self, parts, value, rook: bool):
+        method = parts[-1].split("(")[0] if parts else ""
+
+        if rook:
+            if parts[:1] == ["controller"] and method == "emergencyStop":
+                for axis in self.axes.values():
+                    axis.target, axis.jog = axis.position, 0
+                return 204, None
+            if len(parts) == 6 and parts[0] == "stacks":
+                axis = self.axes.get((int(parts[1][5:]), int(parts[3][4:])))
+                if axis is None:
+                    return 404, {"title": "Not Found"}
+                axis.jog = 0
+                if method == "moveAbsolute":
+                    axis.target = max(-axis.LIMIT, min(axis.LIMIT, float(value)))
+                elif method == "moveToNegativeLimit":
+                    axis.target = -axis.LIMIT
+                elif method == "moveToPositiveLimit":
+                    axis.target = axis.LIMIT
+                elif method == "jog":
+                    axis.jog = 1 if str(value) == "Positive" else -1
+                elif method == "stop":
+                    axis.target = axis.position
+                elif method == "zero":
+                    axis.position = axis.target = 0.0
+                return 204, None
+            return 404, {"title": "Not Found"}
+
+        if parts[:2] == ["controller", "methods"]:
+            goals = {"cooldown": "Cooldown", "warmup": "Warmup", "vent": "Vent",
+                     "pullVacuum": "PullVacuum", "abortGoal": "None"}
+            if method not in goals:
+                return 404, {"title": "Not Found"}
+            self.controller["systemGoal"] = goals[method]
+            if method == "cooldown":
+                self.controller["systemState"] = "Cooling"
+            elif method == "vent":
+                self.pressure = 760.0
+            return 204, None
+
+        ch = self._channel(parts)
+        if ch is not None:
+            if method == "enableController" and isinstance(value, dict):
+                ch.controller_enabled = True
+                ch.target = float(value.get("temperature", ch.target))
+                return 204, None
+            if method == "disableController":
+                ch.controller_enabled = False
+                return 204, None
+
+        return 404, {"title": "Not Found"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real servers
+    server_version = "MontanaSimulator"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _handle(self, op):
+        sim: "MontanaSimulator" = self.server.simulator
+        rook = self.server.rook
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        # Latency / fault injection
+        sim._count_request()
+        delay = sim.latency + sim.rng.uniform(-sim.jitter, sim.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        roll = sim.rng.random()
+        if roll < sim.drop_rate:
+            self.close_connection = True
+            return
+        if roll < sim.drop_rate + sim.error_rate:
+            self._reply(500, {"title": "Simulated fault", "detail": "Injected by MontanaSimulator"})
+            return
+
+        path = self.path.split("?", 1)[0].strip("/")
+        parts = [p for p in path.split("/") if p]
+        if not parts or parts[0] != "v1":
+            self._reply(404, {"title": "Not Found"})
+            return
+        parts = parts[1:]
+
+        try:
+            value = json.loads(raw) if raw else None
+        except ValueError:
+            self._reply(400, {"title": "Bad Request", "detail": "Body is not JSON"})
+            return
+
+        state = sim.state
+        with state.lock:
+            state.advance()
+            if op == "GET" and not parts:
+                base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}/v1"
+                status, body = 200, state.endpoints(base, rook)
+            elif op == "GET":
+                status, body = state.get(parts, rook)
+            elif op == "PUT":
+                status, body = state.put(parts, value, rook)
+            else:
+                status, body = state.post(parts, value, rook)
+        self._reply(status, body)
+
+    def _reply(self, status: int, body):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class MontanaSimulator:
+    """
+    Serves the Montana REST API on localhost for benchmarks and dry runs.
+
+    Usage:
+        with MontanaSimulator(latency=0.02, jitter=0.005, error_rate=0.01) as sim:
+            get_cryostat_details(sim.address)
+
+    Args:
+        host: Interface to bind.
+        cryo_port: Cryostation port (0 picks a free one).
+        rook_port: Rook positioner port (0 picks a free one, None disables).
+        latency: Added delay per request (seconds).
+        jitter: Uniform +/- variation of the delay (seconds).
+        error_rate: Fraction of requests answered with HTTP 500.
+        drop_rate: Fraction of requests whose connection is closed unanswered.
+        time_scale: Simulated seconds per wall-clock second.
+        seed: Seed for noise and fault injection (repeatable runs).
+        cold: Start at base temperature instead of room temperature.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", cryo_port: int = CRYO_PORT,
+                 rook_port: Optional[int] = ROOK_PORT, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, drop_rate: float = 0.0,
+                 time_scale: float = 1.0, seed: Optional[int] = None, cold: bool = True):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.state = MontanaState(time_scale=time_scale, seed=seed, cold=cold)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+        self._servers = []
+        self._threads = []
+        self.cryo_port = self._add_server(cryo_port, rook=False)
+        self.rook_port = self._add_server(rook_port, rook=True) if rook_port is not None else None
+
+    def _add_server(self, port: int, rook: bool) -> int:
+        server = ThreadingHTTPServer((self.host, port), _Handler)
+        server.daemon_threads = True
+        server.simulator = self
+        server.rook = rook
+        self._servers.append(server)
+        return server.server_address[1]
+
+    def _count_request(self):
+        with self._count_lock:
+            self.request_count += 1
+
+    @property
+    def address(self) -> str:
+        """Cryostat address in the form EQUIPMENT_CONFIG accepts."""
+        if self.cryo_port == CRYO_PORT:
+            return self.host
+        return f"{self.host}:{self.cryo_port}"
+
+    def start(self):
+        for server in self._servers:
+            t = threading.Thread(target=server.serve_forever, daemon=True, name="montana-sim")
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
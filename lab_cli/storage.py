@@ -0,0 +1,113 @@
+# Binary storage for sweep data
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Optional backends
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DEFAULT_FORMAT = "npz"
+DEFAULT_PRECISION = "float32"
+EXTENSIONS = {"npz": ".npz", "hdf5": ".h5", "parquet": ".parquet"}
+PRECISIONS = {"float32": np.float32, "float64": np.float64}
+METADATA_KEY = "lab_cli_metadata"
+
+Columns = Dict[str, np.ndarray]
+
+def _check_format(fmt: str):
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(EXTENSIONS)}")
+    if fmt == "hdf5" and h5py is None:
+        raise RuntimeError("HDF5 output needs 'h5py' (pip install h5py)")
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Parquet output needs 'pyarrow' (pip install pyarrow)")
+
+def save_sweep(filename_base: str, columns: Columns, metadata: Dict[str, Any],
+               fmt: str = DEFAULT_FORMAT, precision: str = DEFAULT_PRECISION) -> str:
+    """
+    Writes sweep columns and their metadata (sweep settings, loop context)
+    to one binary file. Returns the path written.
+
+    Args:
+        filename_base: Path without extension.
+        columns: Column name -> 1-D array, all the same length.
+        metadata: JSON-serialisable details stored alongside the data.
+        fmt: "npz" (default), "hdf5" or "parquet".
+        precision: "float32" (default, the recorder's native precision) or "float64".
+    """
+    _check_format(fmt)
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'. Choose from: {', '.join(PRECISIONS)}")
+
+    dtype = PRECISIONS[precision]
+    # astype(copy=False) keeps float32 recorder arrays as they are
+    data = {name: np.asarray(values).astype(dtype, copy=False) for name, values in columns.items()}
+    meta = json.dumps(dict(metadata, precision=precision, columns=list(data)), default=str)
+    path = filename_base + EXTENSIONS[fmt]
+
+    if fmt == "npz":
+        np.savez(path, **data, **{METADATA_KEY: np.array(meta)})
+    elif fmt == "hdf5":
+        with h5py.File(path, "w") as f:
+            for name, values in data.items():
+                f.create_dataset(name, data=values)
+            f.attrs[METADATA_KEY] = meta
+    else:
+        table = pa.table(data).replace_schema_metadata({METADATA_KEY: meta})
+        pq.write_table(table, path)
+    return path
+
+def load_sweep(path: str) -> Tuple[Columns, Dict[str, Any]]:
+    """Reads a file written by save_sweep(). Returns (columns, metadata)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f[METADATA_KEY])) if METADATA_KEY in f.files else {}
+            columns = {k: f[k] for k in f.files if k != METADATA_KEY}
+    elif ext in (".h5", ".hdf5"):
+        _check_format("hdf5")
+        with h5py.File(path, "r") as f:
+            meta = json.loads(f.attrs.get(METADATA_KEY, "{}"))
+            columns = {k: f[k][()] for k in f.keys()}
+    elif ext == ".parquet":
+        _check_format("parquet")
+        table = pq.read_table(path)
+        raw = (table.schema.metadata or {}).get(METADATA_KEY.encode(), b"{}")
+        meta = json.loads(raw)
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+    else:
+        raise ValueError(f"Not a sweep file: {path}")
+
+    # Keep the saved column order
+    order = meta.get("columns") or list(columns)
+    return {k: columns[k] for k in order if k in columns}, meta
+
+def export_excel(path: str, output: Optional[str] = None) -> str:
+    """
+    Converts a stored sweep to .xlsx, with the data on the first sheet and
+    the metadata on a second one. Returns the path written.
+    """
+    import pandas as pd
+
+    columns, meta = load_sweep(path)
+    output = output or os.path.splitext(path)[0] + ".xlsx"
+
+    context = meta.pop("context", None) or {}
+    rows = [(k, json.dumps(v) if isinstance(v, (dict, list)) else v) for k, v in meta.items()]
+    rows += [(f"context.{k}", v) for k, v in context.items()]
+
+    with pd.ExcelWriter(output) as writer:
+        pd.DataFrame(columns).to_excel(writer, sheet_name="Data", index=False)
+        pd.DataFrame(rows, columns=["Key", "Value"]).to_excel(writer, sheet_name="Metadata", index=False)
+    return output
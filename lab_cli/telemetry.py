@@ -0,0 +1,201 @@
+# Multi-rate telemetry polling for the status monitor
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .equipment_api import EQUIPMENT_CONFIG, DEFAULT_POLL_TIMEOUT
+from .connections.laser import get_laser_health, get_laser_optics
+from .connections.cryostat import (
+    get_cryostat_temperature_async, get_cryostat_pressure, get_cryostat_magnet
+)
+
+# Polling period per field (seconds).
+# Override per device with a "poll_periods" dict in EQUIPMENT_CONFIG,
+# or for a whole session with `status --period temperature_k=0.5`.
+DEFAULT_FIELD_PERIODS = {
+    "temperature_k": 1.0,
+    "temperature_stability_k": 1.0,
+    "temperature_stable": 1.0,
+    "stability_ok": 1.0,
+    "pressure_torr": 10.0,
+    "magnet_field_tesla": 10.0,
+    "wavelength_nm": 1.0,
+    "power_mw": 1.0,
+    "emission_active": 5.0,
+    "status": 10.0,
+    "details": 10.0,
+}
+FALLBACK_PERIOD = 5.0
+
+
+@dataclass
+class TelemetrySource:
+    """
+    One underlying device request and the fields it returns.
+    `fetch` is either a blocking function (run on a worker thread) or a
+    coroutine function (awaited on the scheduler's event loop).
+    """
+    device_id: str
+    name: str
+    fetch: Callable[[], Dict[str, Any]]
+    fields: Tuple[str, ...]
+    period: float = FALLBACK_PERIOD
+    timeout: float = DEFAULT_POLL_TIMEOUT
+
+
+def _driver_requests(driver: Optional[str], ip: Optional[str]) -> List[Tuple[str, Callable, Tuple[str, ...]]]:
+    """Lists (name, fetch, fields) for every request a driver can make."""
+    if driver == "toptica_dlc":
+        return [
+            ("health", partial(get_laser_health, ip), ("status", "details", "emission_active")),
+            ("optics", partial(get_laser_optics, ip), ("wavelength_nm", "power_mw")),
+        ]
+    elif driver == "montana":
+        return [
+            ("thermometer", partial(get_cryostat_temperature_async, ip),
+             ("temperature_k", "temperature_stability_k", "temperature_stable", "stability_ok")),
+            ("pressure", partial(get_cryostat_pressure, ip), ("pressure_torr",)),
+            ("magnet", partial(get_cryostat_magnet, ip), ("magnet_field_tesla",)),
+        ]
+    elif driver == "mock":
+        return [
+            ("mock", lambda: {"status": "Idle", "details": "Mock Device"}, ("status", "details")),
+        ]
+    return []
+
+
+def build_sources(config: Optional[Dict[str, Any]] = None,
+                  periods: Optional[Dict[str, float]] = None) -> List[TelemetrySource]:
+    """
+    Builds the polling sources for every configured device.
+
+    Fields that come from the same request are coalesced into one source,
+    which is polled at the fastest period of its fields.
+    """
+    config = EQUIPMENT_CONFIG if config is None else config
+    sources = []
+
+    for eq_id, conf in config.items():
+        field_periods = dict(DEFAULT_FIELD_PERIODS)
+        field_periods.update(conf.get("poll_periods", {}))
+        field_periods.update(periods or {})
+
+        for name, fetch, fields in _driver_requests(conf.get("driver"), conf.get("ip")):
+            sources.append(TelemetrySource(
+                device_id=eq_id,
+                name=name,
+                fetch=fetch,
+                fields=fields,
+                period=min(field_periods.get(f, FALLBACK_PERIOD) for f in fields),
+                timeout=conf.get("timeout", DEFAULT_POLL_TIMEOUT)
+            ))
+
+    return sources
+
+
+class TelemetryScheduler:
+    """
+    Polls each source on its own period and keeps the latest readings.
+
+    Polling and rendering are independent: sources update the shared state
+    whenever their request returns, and `run()` renders a snapshot of that
+    state at its own interval. A request that misses its deadline marks the
+    device stale and is not resubmitted until it returns.
+    """
+
+    def __init__(self, sources: List[TelemetrySource], config: Optional[Dict[str, Any]] = None):
+        config = EQUIPMENT_CONFIG if config is None else config
+        self.sources = sources
+        self.request_count = 0
+
+        self._state: Dict[str, Dict[str, Any]] = {}
+        for src in sources:
+            conf = config.get(src.device_id, {})
+            self._state.setdefault(src.device_id, {
+                "id": src.device_id,
+                "type": conf.get("type", "Unknown"),
+                "status": "Unknown",
+                "last_check": None
+            })
+
+        self._errors: Dict[Tuple[str, str], str] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(sources)),
+                                            thread_name_prefix="telemetry")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns a copy of the latest readings per device."""
+        result = {}
+        for eq_id, state in self._state.items():
+            data = dict(state)
+            errors = [msg for (dev, _), msg in self._errors.items() if dev == eq_id]
+            if errors:
+                data["stale"] = True
+                data["details"] = "; ".join(errors)
+                if data.get("status") == "Unknown":
+                    data["status"] = "Connection Error"
+            result[eq_id] = data
+        return result
+
+    async def poll_once(self, source: TelemetrySource):
+        """Runs one request for a source and stores its fields."""
+        key = (source.device_id, source.name)
+        loop = asyncio.get_running_loop()
+
+        fut = self._inflight.get(key)
+        if fut is None or fut.done():
+            if asyncio.iscoroutinefunction(source.fetch):
+                fut = asyncio.ensure_future(source.fetch())
+            else:
+                fut = loop.run_in_executor(self._executor, source.fetch)
+            self._inflight[key] = fut
+            self.request_count += 1
+
+        try:
+            values = await asyncio.wait_for(asyncio.shield(fut), source.timeout)
+        except asyncio.TimeoutError:
+            self._errors[key] = f"{source.name}: no response within {source.timeout:g}s"
+            return
+        except Exception as e:
+            self._errors[key] = f"{source.name}: {e}"
+            return
+
+        self._errors.pop(key, None)
+        state = self._state[source.device_id]
+        state.update(values)
+        state["last_check"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if "status" not in values and state.get("status") == "Unknown":
+            state["status"] = "Active"
+
+    async def _poll_forever(self, source: TelemetrySource):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await self.poll_once(source)
+            await asyncio.sleep(max(0.0, source.period - (loop.time() - started)))
+
+    async def run(self, render: Callable[[Dict[str, Dict[str, Any]]], None],
+                  render_interval: float = 1.0,
+                  duration: Optional[float] = None):
+        """
+        Polls all sources and calls render(snapshot) every render_interval
+        seconds, until cancelled or `duration` seconds have passed.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [asyncio.ensure_future(self._poll_forever(s)) for s in self.sources]
+        started = loop.time()
+        try:
+            while duration is None or loop.time() - started < duration:
+                render(self.snapshot())
+                await asyncio.sleep(render_interval)
+        finally:
+            for t in tasks:
+                t.cancel()
+            for fut in self._inflight.values():
+                fut.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Don't block on requests that are still hanging
+            self._executor.shutdown(wait=False)
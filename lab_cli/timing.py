@@ -0,0 +1,223 @@
+# Duration estimates for run-loop --dry-run, learned from journaled runs
+import glob
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .journal import RunJournal, JOURNAL_FOLDER, JOURNAL_EXTENSION
+from .plan import ExecutionPlan, PlanError, compile_recipe
+
+# Priors used until real runs have been journaled
+FIELD_RAMP_T_PER_S = 0.005          # magnet ramp rate
+TEMP_RAMP_K_PER_S = 0.05            # platform temperature ramp rate
+DEFAULT_STEP_SECONDS = 1.0          # actions without a model of their own
+# How many observations the prior is worth when fitting
+PRIOR_WEIGHT = 1.0
+# Narrow track-resonance scans (window_nm=0) are taken as this fraction of the range
+TRACK_WINDOW_GUESS = 0.1
+
+State = Dict[str, Any]
+
+
+def _num(kwargs: Dict[str, Any], name: str, default: float = 0.0) -> float:
+    try:
+        return float(kwargs.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def _scan_features(range_nm: float, kwargs: Dict[str, Any], passes: int = 1) -> List[float]:
+    """[scan seconds, recorded samples] of a sweep."""
+    speed = _num(kwargs, "speed", 1.0) or 1.0
+    resolution_pm = _num(kwargs, "resolution_pm")
+    rate = speed / (resolution_pm * 1e-3) if resolution_pm > 0 else _num(kwargs, "rate_hz", 100.0)
+    scan_s = abs(range_nm) / speed * passes
+    channels = len([c for c in str(kwargs.get("channels", "intensity")).split(",") if c.strip()])
+    return [scan_s, scan_s * rate * max(1, channels)]
+
+def _sweep(kwargs: Dict[str, Any], state: State) -> List[float]:
+    passes = max(1, int(_num(kwargs, "passes", 1)))
+    return _scan_features(_num(kwargs, "end_nm") - _num(kwargs, "start_nm"), kwargs, passes)
+
+def _track(kwargs: Dict[str, Any], state: State) -> List[float]:
+    full = abs(_num(kwargs, "end_nm") - _num(kwargs, "start_nm"))
+    key = (kwargs.get("start_nm"), kwargs.get("end_nm"))
+    tracked = state.setdefault("tracked", set())
+    if key not in tracked:
+        tracked.add(key)
+        return _scan_features(full, kwargs)
+    return _scan_features(_num(kwargs, "window_nm") or full * TRACK_WINDOW_GUESS, kwargs)
+
+def _ramp(variable: str, rate: float) -> Callable[[Dict[str, Any], State], List[float]]:
+    def features(kwargs: Dict[str, Any], state: State) -> List[float]:
+        target = _num(kwargs, "target")
+        # The magnet starts at zero; an unknown starting temperature counts as no change
+        previous = state.get(variable, 0.0 if variable == "field" else target)
+        state[variable] = target
+        change = abs(target - previous)
+        # set-field/set-temp return once the command is sent; the ramp is
+        # waited out by the next wait-stable
+        state["pending_s"] = max(state.get("pending_s", 0.0), change / rate)
+        return [change]
+    return features
+
+def _wait_stable(kwargs: Dict[str, Any], state: State) -> List[float]:
+    pending = state.pop("pending_s", 0.0)
+    return [min(pending, _num(kwargs, "timeout", 600))]
+
+def _delay(kwargs: Dict[str, Any], state: State) -> List[float]:
+    return [_num(kwargs, "seconds")]
+
+def _constant(kwargs: Dict[str, Any], state: State) -> List[float]:
+    return []
+
+
+class CostModel(NamedTuple):
+    features: Callable[[Dict[str, Any], State], List[float]]
+    prior: Sequence[float]      # intercept, then one coefficient per feature
+
+# seconds = prior[0] + sum(prior[i + 1] * feature[i])
+COST_MODELS: Dict[str, CostModel] = {
+    "delay": CostModel(_delay, (0.0, 1.0)),
+    "log": CostModel(_constant, (0.0,)),
+    "set-field": CostModel(_ramp("field", FIELD_RAMP_T_PER_S), (0.5, 0.0)),
+    "set-temp": CostModel(_ramp("temp", TEMP_RAMP_K_PER_S), (0.5, 0.0)),
+    "wait-stable": CostModel(_wait_stable, (30.0, 1.0)),
+    "magnet-zero": CostModel(_constant, (120.0,)),
+    "sweep-laser": CostModel(_sweep, (3.0, 1.0, 2e-6)),
+    "track-resonance": CostModel(_track, (3.0, 1.0, 2e-6)),
+}
+_DEFAULT_MODEL = CostModel(_constant, (DEFAULT_STEP_SECONDS,))
+
+
+class StepEstimate(NamedTuple):
+    index: int
+    action: str
+    runs: int
+    seconds: float
+    learned_from: int           # timed runs of this action the model was fit to
+    failed: int = 0             # points where the parameters can't be bound
+    error: Optional[str] = None # the first such error
+
+
+class TimingModel:
+    """
+    Per-action linear cost models. Each starts from its prior and is refit
+    on every journaled step that recorded a duration (ridge regression
+    towards the prior, so a handful of runs nudge it and many runs replace
+    it).
+    """
+
+    def __init__(self):
+        self._observations: Dict[str, List[tuple]] = {}
+        self._coefficients: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def model(action: str) -> CostModel:
+        return COST_MODELS.get(action, _DEFAULT_MODEL)
+
+    def features(self, action: str, kwargs: Dict[str, Any], state: State) -> np.ndarray:
+        return np.array([1.0] + self.model(action).features(kwargs, state))
+
+    def observe(self, action: str, features: np.ndarray, seconds: float):
+        self._observations.setdefault(action, []).append((features, float(seconds)))
+        self._coefficients.pop(action, None)
+
+    def learn(self, journal: RunJournal) -> int:
+        """Adds every timed step of a journal; returns how many were used."""
+        try:
+            plan = compile_recipe(journal.steps)
+        except PlanError:
+            return 0
+        state: State = {}
+        used = 0
+        for record in journal.records:
+            if record.get("event") != "step" or not (0 <= record.get("step", -1) < len(plan)):
+                continue
+            step = plan.steps[record["step"]]
+            try:
+                kwargs = step.bind(record["point"])
+            except (KeyError, ValueError, PlanError):
+                continue
+            # Features also advance the state (e.g. the last field), so
+            # compute them for untimed or failed steps too
+            features = self.features(step.name, kwargs, state)
+            if record.get("ok") and record.get("seconds") is not None:
+                self.observe(step.name, features, record["seconds"])
+                used += 1
+        return used
+
+    def count(self, action: str) -> int:
+        return len(self._observations.get(action, []))
+
+    def coefficients(self, action: str) -> np.ndarray:
+        if action not in self._coefficients:
+            prior = np.array(self.model(action).prior, dtype=float)
+            observations = self._observations.get(action)
+            if not observations:
+                self._coefficients[action] = prior
+            else:
+                X = np.array([f for f, _ in observations])
+                y = np.array([s for _, s in observations])
+                # Penalty scaled per feature, so the prior is worth PRIOR_WEIGHT observations
+                scale = np.maximum(np.mean(X ** 2, axis=0), 1e-12)
+                penalty = np.diag(PRIOR_WEIGHT * scale)
+                self._coefficients[action] = np.linalg.solve(X.T @ X + penalty,
+                                                             X.T @ y + penalty @ prior)
+        return self._coefficients[action]
+
+    def predict(self, action: str, kwargs: Dict[str, Any], state: State) -> float:
+        features = self.features(action, kwargs, state)
+        return max(0.0, float(features @ self.coefficients(action)))
+
+
+def load_timing_model(folder: str = JOURNAL_FOLDER) -> TimingModel:
+    """A TimingModel refit on every run journal in `folder`."""
+    model = TimingModel()
+    for path in sorted(glob.glob(os.path.join(folder, "*" + JOURNAL_EXTENSION))):
+        try:
+            model.learn(RunJournal.load(path))
+        except (OSError, ValueError):
+            continue
+    return model
+
+def estimate_plan(plan: ExecutionPlan, points: Sequence[Dict[str, Any]], model: TimingModel,
+                  skip: Optional[Callable[[int], Any]] = None) -> List[StepEstimate]:
+    """
+    Walks the plan over `points` without running anything and returns the
+    predicted time of each step, summed over all points. skip(i) gives the
+    step indices already done at point i (e.g. when resuming). Steps whose
+    parameters can't be bound at a point are counted in `failed` instead.
+    """
+    state: State = {}
+    totals = [0.0] * len(plan)
+    runs = [0] * len(plan)
+    failed = [0] * len(plan)
+    errors: List[Optional[str]] = [None] * len(plan)
+    for i, point in enumerate(points):
+        done = skip(i) if skip else ()
+        for step in plan.steps:
+            if step.index in done:
+                continue
+            try:
+                kwargs = step.bind(dict(point))
+            except (KeyError, ValueError) as e:
+                # A real run reports this as a failed step and moves on
+                failed[step.index] += 1
+                errors[step.index] = errors[step.index] or str(e)
+                continue
+            totals[step.index] += model.predict(step.name, kwargs, state)
+            runs[step.index] += 1
+    return [StepEstimate(step.index, step.name, runs[step.index], totals[step.index],
+                         model.count(step.name), failed[step.index], errors[step.index])
+            for step in plan.steps]
+
+def format_duration(seconds: float) -> str:
+    seconds = float(seconds)
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes} min {secs:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
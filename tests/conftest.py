@@ -0,0 +1,23 @@
+import pytest
+
+from lab_cli.actions import ACTION_REGISTRY, register_action
+
+
+@pytest.fixture
+def register():
+    """
+    Registers throwaway actions for one test and removes them afterwards.
+    Usage: @register("test-probe") def probe(x: float, context=None): ...
+    """
+    added = []
+
+    def decorator_for(name):
+        def decorator(func):
+            register_action(name)(func)
+            added.append(name)
+            return func
+        return decorator
+
+    yield decorator_for
+    for name in added:
+        ACTION_REGISTRY.pop(name, None)
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from lab_cli import main
+from lab_cli.actions import ActionResult
+from lab_cli.adaptive import MIN_STEP_FRACTION, AdaptiveSampler
+from lab_cli.experiment_registry import save_experiment
+
+PEAK = 3.3
+WIDTH = 0.4
+
+
+def lorentzian(x):
+    return 1.0 / (1.0 + ((x - PEAK) / (WIDTH / 2)) ** 2)
+
+
+def run(sampler, metric=lorentzian):
+    batch = sampler.start()
+    while batch:
+        for x in batch:
+            sampler.add(x, metric(x))
+        batch = sampler.next_batch()
+    return np.array(sampler.points)
+
+
+@pytest.mark.parametrize("criterion", ["gradient", "curvature"])
+def test_refinement_concentrates_near_the_peak(criterion):
+    coarse = np.arange(0.0, 10.5, 1.0)
+    points = run(AdaptiveSampler(coarse, budget=40, criterion=criterion))
+
+    assert len(points) == 40
+    near = np.sum(np.abs(points - PEAK) <= 1.0)
+    far = np.sum(np.abs(points - 7.5) <= 1.0)
+    assert near >= 4 * far
+    assert np.min(np.abs(points - PEAK)) < WIDTH / 4
+
+
+def test_spacing_never_goes_below_min_step():
+    coarse = np.arange(0.0, 10.5, 1.0)
+    sampler = AdaptiveSampler(coarse, budget=10_000)
+    assert sampler.min_step == pytest.approx(1.0 * MIN_STEP_FRACTION)
+
+    points = run(sampler)
+    # Stops on its own once every gap worth splitting is at min_step
+    assert len(points) < 10_000
+    assert np.min(np.diff(points)) >= sampler.min_step - 1e-9
+    assert np.min(np.diff(points)) == pytest.approx(sampler.min_step)
+
+
+def test_explicit_min_step():
+    points = run(AdaptiveSampler([0, 2, 4, 6, 8, 10], budget=1000, min_step=0.5))
+    assert np.min(np.diff(points)) >= 0.5 - 1e-9
+
+
+def test_failed_points_are_not_refined_around():
+    def metric(x):
+        return None if x == 3.0 else lorentzian(x)
+
+    sampler = AdaptiveSampler(np.arange(0.0, 10.5, 1.0), budget=30)
+    points = run(sampler, metric)
+    assert sampler.results[3.0] is None
+    # Both gaps touching the failed point stay unsplit
+    assert not np.any((points > 2.0) & (points < 3.0))
+    assert not np.any((points > 3.0) & (points < 4.0))
+    # ...but the rest still gets refined
+    assert len(points) > 11
+
+
+def test_all_metrics_missing_stops():
+    sampler = AdaptiveSampler([0, 1, 2, 3], budget=20)
+    for x in sampler.start():
+        sampler.add(x, None)
+    assert sampler.next_batch() == []
+
+
+def test_tolerance_stops_on_flat_metric():
+    sampler = AdaptiveSampler([0, 1, 2, 3], budget=20, tolerance=0.01)
+    points = run(sampler, lambda x: 1.0 + 0.001 * x)
+    assert list(points) == [0, 1, 2, 3]
+
+
+def test_budget_caps_the_batch():
+    sampler = AdaptiveSampler(np.arange(0.0, 10.5, 1.0), budget=12)
+    for x in sampler.start():
+        sampler.add(x, lorentzian(x))
+    batch = sampler.next_batch()
+    assert len(batch) == 1
+    # The single point goes into the gap with the largest change
+    assert 2.0 < batch[0] < 5.0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="criterion"):
+        AdaptiveSampler([0, 1], budget=5, criterion="random")
+    with pytest.raises(ValueError, match="two"):
+        AdaptiveSampler([1, 1], budget=5)
+    # The budget is at least the coarse grid
+    assert AdaptiveSampler([0, 1, 2], budget=1).budget == 3
+
+
+def test_non_numeric_metrics_count_as_missing():
+    sampler = AdaptiveSampler([0, 1, 2, 3], budget=10)
+    assert sampler.add(0, "n/a") is None
+    assert sampler.add(1, float("nan")) is None
+    assert sampler.add(2, None) is None
+    assert sampler.add(3, np.float32(2.5)) == 2.5
+    assert sampler.results == {0.0: None, 1.0: None, 2.0: None, 3.0: 2.5}
+
+
+def test_run_loop_survives_a_missing_metric(tmp_path, monkeypatch, register):
+    monkeypatch.chdir(tmp_path)
+    visited = []
+
+    @register("test-metric")
+    def metric(x: float, context=None):
+        visited.append(x)
+        # No resonance found here
+        return ActionResult(m=None if x == 4.0 else lorentzian(x))
+
+    save_experiment("adapt", [{"type": "test-metric", "x": "{x}"}])
+    result = CliRunner().invoke(main.app, ["run-loop", "adapt", "--variable", "x", "--start", "0",
+                                           "--end", "8", "--step", "2", "--adaptive", "m",
+                                           "--budget", "9"], input="y\n")
+    assert result.exit_code == 0, result.output
+    assert "m=None at x=4.0" in result.output
+    assert len(visited) == 9
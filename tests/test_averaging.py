@@ -0,0 +1,50 @@
+import numpy as np
+
+from lab_cli.averaging import RunningStats, resample, uniform_grid
+
+
+def test_running_stats_match_numpy():
+    passes = np.random.default_rng(0).normal(5.0, 2.0, size=(7, 300))
+    stats = RunningStats()
+    for values in passes:
+        stats.add(values.astype(np.float32))
+
+    assert stats.count == 7
+    np.testing.assert_allclose(stats.mean, np.mean(passes.astype(np.float32), axis=0), rtol=1e-6)
+    np.testing.assert_allclose(stats.std, np.std(passes.astype(np.float32), axis=0, ddof=1), rtol=1e-5)
+
+
+def test_running_stats_before_two_passes():
+    stats = RunningStats()
+    assert stats.mean is None and stats.variance is None and stats.std is None
+    stats.add([1.0, 2.0])
+    np.testing.assert_array_equal(stats.mean, [1.0, 2.0])
+    np.testing.assert_array_equal(stats.std, [0.0, 0.0])
+
+
+def test_running_stats_do_not_keep_a_reference_to_the_input():
+    values = np.array([1.0, 2.0])
+    stats = RunningStats()
+    stats.add(values)
+    values[:] = 0
+    np.testing.assert_array_equal(stats.mean, [1.0, 2.0])
+
+
+def test_uniform_grid():
+    np.testing.assert_allclose(uniform_grid(1530, 1520, 11), np.arange(1520.0, 1531.0))
+    assert len(uniform_grid(0, 1, 1)) == 2
+
+
+def test_resample_reverse_and_forward_passes_agree():
+    grid = uniform_grid(0.0, 10.0, 101)
+    forward = np.linspace(0.0, 10.0, 357)
+    reverse = forward[::-1]
+
+    def line(x):
+        return 3.0 * x - 1.0
+
+    np.testing.assert_allclose(resample(forward, line(forward), grid), line(grid))
+    np.testing.assert_allclose(resample(reverse, line(reverse), grid), line(grid))
+    # Unsorted (wobbling) wavelength readings are sorted first
+    wobble = np.random.default_rng(1).permutation(forward)
+    np.testing.assert_allclose(resample(wobble, line(wobble), grid), line(grid))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from lab_cli.decimation import SPARK_CHARS, envelope, minmax_indices, sparkline
+
+
+@pytest.mark.parametrize("n, bins", [(10_000, 100), (10_007, 64), (999, 10)])
+def test_envelope_keeps_min_and_max_of_every_bin(n, bins):
+    rng = np.random.default_rng(n)
+    x = np.linspace(0.0, 1.0, n)
+    y = rng.normal(size=n)
+    ex, ey = envelope(x, y, bins)
+
+    assert len(ex) <= 2 * bins
+    assert np.all(np.diff(ex) >= 0)
+    per_bin = -(-n // bins)
+    for start in range(0, n, per_bin):
+        chunk = y[start:start + per_bin]
+        inside = ey[(ex >= x[start]) & (ex <= x[min(start + per_bin, n) - 1])]
+        assert chunk.min() in inside and chunk.max() in inside
+
+
+def test_single_sample_features_survive():
+    y = np.zeros(100_000)
+    y[12_345], y[87_654] = -5.0, 3.0
+    _, ey = envelope(np.arange(len(y)), y, 50)
+    assert ey.min() == -5.0 and ey.max() == 3.0
+
+
+def test_short_series_are_returned_whole():
+    y = np.arange(10.0)
+    np.testing.assert_array_equal(minmax_indices(y, 5), np.arange(10))
+    np.testing.assert_array_equal(minmax_indices(y, 0), np.arange(10))
+    ex, ey = envelope(y, y, 100)
+    np.testing.assert_array_equal(ey, y)
+
+
+def test_indices_stay_in_range():
+    # The last bin is shorter than the others
+    idx = minmax_indices(np.arange(101.0)[::-1], 10)
+    assert idx.max() == 100 and idx.min() == 0
+
+
+def test_sparkline():
+    assert sparkline([]) == ""
+    assert sparkline(np.ones(5)) == SPARK_CHARS[len(SPARK_CHARS) // 2] * 5
+    line = sparkline(np.linspace(0, 1, 9), width=60)
+    assert line == SPARK_CHARS
+    # A one-sample dip in a long flat trace still shows
+    y = np.ones(100_000)
+    y[50_000] = 0.0
+    line = sparkline(y, width=40)
+    assert len(line) == 40 and SPARK_CHARS[0] in line
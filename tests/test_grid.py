@@ -0,0 +1,94 @@
+import itertools
+
+import pytest
+
+from lab_cli.grid import grid_points, loop_values, order_axes, parse_axis, path_cost
+
+
+def _tuples(points):
+    return [tuple(p.values()) for p in points]
+
+def _single_steps(points, axes):
+    """True if every move changes exactly one axis, to a neighbouring value."""
+    position = {name: {v: i for i, v in enumerate(values)} for name, values in axes}
+    for a, b in zip(points, points[1:]):
+        moves = [abs(position[k][a[k]] - position[k][b[k]]) for k in a]
+        if sorted(moves)[-1] != 1 or sum(moves) != 1:
+            return False
+    return True
+
+
+def test_loop_values_include_the_end_in_either_direction():
+    assert loop_values(0, 1, 0.25) == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert loop_values(1, 0, 0.5) == [1.0, 0.5, 0.0]
+
+
+def test_parse_axis():
+    assert parse_axis("field=0:1:0.5") == ("field", [0.0, 0.5, 1.0])
+    assert parse_axis(" temp = 4,10,300 ") == ("temp", [4.0, 10.0, 300.0])
+    for bad in ("field", "1x=0:1:1", "field=0:1", "field=0:1:0", "field="):
+        with pytest.raises(ValueError):
+            parse_axis(bad)
+
+
+def test_raster_and_serpentine_on_2x3():
+    axes = [("a", [0, 1]), ("b", [0, 1, 2])]
+    assert _tuples(grid_points(axes, "raster")) == [
+        (0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)]
+    assert _tuples(grid_points(axes, "serpentine")) == [
+        (0, 0), (0, 1), (0, 2), (1, 2), (1, 1), (1, 0)]
+
+
+def test_3d_grid_orders():
+    axes = [("a", [0, 1]), ("b", [0, 1, 2]), ("c", [0, 1])]
+    raster = grid_points(axes, "raster")
+    serpentine = grid_points(axes, "serpentine")
+
+    assert _tuples(raster) == list(itertools.product([0, 1], [0, 1, 2], [0, 1]))
+    assert sorted(_tuples(serpentine)) == sorted(_tuples(raster))
+    assert serpentine[:4] == [{"a": 0, "b": 0, "c": 0}, {"a": 0, "b": 0, "c": 1},
+                              {"a": 0, "b": 1, "c": 1}, {"a": 0, "b": 1, "c": 0}]
+    assert _single_steps(serpentine, axes)
+    assert not _single_steps(raster, axes)
+
+
+def test_order_axes_puts_the_most_expensive_axis_outermost():
+    field = ("field", [-1.0, -0.5, 0.0, 0.5, 1.0])   # 2 T x 600 s/T = 1200
+    temp = ("temp", [4.0, 10.0])                      # 6 K x 30 s/K = 180
+    slew = {"field": 600, "temp": 30}
+
+    assert [name for name, _ in order_axes([temp, field], slew)] == ["field", "temp"]
+    assert [name for name, _ in order_axes([field, temp], {"field": 1, "temp": 1})] == ["temp", "field"]
+
+    points = grid_points([temp, field], "slow-outer", slew)
+    assert list(points[0]) == ["field", "temp"]
+    # The outer axis only changes once per pass over the inner one
+    changes = sum(a["field"] != b["field"] for a, b in zip(points, points[1:]))
+    assert changes == len(field[1]) - 1
+
+
+@pytest.mark.parametrize("axes", [
+    [("a", [0, 1]), ("b", [0, 1, 2])],
+    [("a", [0, 1]), ("b", [0, 1, 2]), ("c", [0, 1])],
+    [("field", [-1.0, 0.0, 1.0]), ("temp", [4.0, 10.0, 50.0])],
+])
+@pytest.mark.parametrize("slew", [None, {"field": 600, "temp": 30, "a": 5}])
+def test_serpentine_never_costs_more_than_raster(axes, slew):
+    serpentine = path_cost(grid_points(axes, "serpentine"), slew)
+    raster = path_cost(grid_points(axes, "raster"), slew)
+    assert serpentine <= raster
+
+
+def test_serpentine_saves_the_flyback():
+    axes = [("a", [0, 1]), ("b", [0, 1, 2])]
+    assert path_cost(grid_points(axes, "serpentine")) == 5
+    assert path_cost(grid_points(axes, "raster")) == 7
+    assert path_cost([]) == 0
+
+
+def test_grid_points_errors():
+    with pytest.raises(ValueError, match="Unknown order"):
+        grid_points([("a", [0, 1])], "zigzag")
+    with pytest.raises(ValueError, match="different name"):
+        grid_points([("a", [0, 1]), ("a", [2])])
+    assert grid_points([]) == []
@@ -0,0 +1,213 @@
+import json
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from lab_cli import main
+from lab_cli.actions import ActionResult
+from lab_cli.experiment_registry import save_experiment
+from lab_cli.journal import JOURNAL_FOLDER, RunJournal
+
+TORN = '{"event": "step", "index": 2, "point": {"x": 2.0}, "st'
+
+
+def _write_partial_run(path):
+    journal = RunJournal.create(path, {"name": "t"}, [{"type": "a"}, {"type": "b"}])
+    # Point 0: both steps succeeded
+    journal.record_step(0, {"x": 0.0}, 0, "a", True, {"m": 1}, 0.1)
+    journal.record_step(0, {"x": 0.0}, 1, "b", True, {"n": 2}, 0.1)
+    journal.record_point(0, {"x": 0.0}, True, {"m": 1, "n": 2})
+    # Point 1: the second step failed
+    journal.record_step(1, {"x": 1.0}, 0, "a", True, {"m": 3}, 0.1)
+    journal.record_step(1, {"x": 1.0}, 1, "b", False, {}, 0.1)
+    journal.record_point(1, {"x": 1.0}, False, {"m": 3})
+    # Point 2: interrupted after the first step, in the middle of a write
+    journal.record_step(2, {"x": 2.0}, 0, "a", True, {"m": 5}, 0.1)
+    with open(path, "a") as f:
+        f.write(TORN)
+    return journal
+
+
+def test_load_skips_exactly_the_completed_work(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    _write_partial_run(path)
+
+    journal = RunJournal.load(path)
+    assert journal.run_id == "run"
+    assert journal.settings == {"name": "t"}
+    assert journal.steps == [{"type": "a"}, {"type": "b"}]
+    assert set(journal.done_points) == {0}
+    assert journal.done_points[0]["values"] == {"m": 1, "n": 2}
+    assert {i: set(steps) for i, steps in journal.done_steps.items()} == {0: {0, 1}, 1: {0}, 2: {0}}
+    assert journal.done_steps[2][0] == {"m": 5}
+    assert set(journal.visited) == {0, 1, 2}
+
+
+def test_records_after_a_torn_line_are_kept(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    _write_partial_run(path)
+
+    journal = RunJournal.load(path)
+    journal.record("resume")
+    journal.record_step(2, {"x": 2.0}, 1, "b", True, {"n": 6}, 0.1)
+
+    reloaded = RunJournal.load(path)
+    assert [r["event"] for r in reloaded.records][-2:] == ["resume", "step"]
+    assert set(reloaded.done_steps[2]) == {0, 1}
+    with open(path) as f:
+        assert f.read().count(TORN + "\n") == 1
+
+
+def test_load_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunJournal.load(str(tmp_path / "missing.jsonl"))
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text(TORN)
+    with pytest.raises(ValueError, match="no start record"):
+        RunJournal.load(str(empty))
+    with pytest.raises(FileExistsError):
+        RunJournal.create(str(empty), {}, [])
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Recipes and journals go to a scratch directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _run(*args):
+    return CliRunner().invoke(main.app, list(args), input="y\n")
+
+def _journal():
+    (name,) = os.listdir(JOURNAL_FOLDER)
+    return RunJournal.load(os.path.join(JOURNAL_FOLDER, name))
+
+
+def test_resume_after_interrupt_skips_finished_steps(workdir, register):
+    calls = []
+    interrupt = {"at": 2.0}
+
+    @register("test-a")
+    def step_a(x: float, context=None):
+        calls.append(("a", x))
+        return ActionResult(a=x)
+
+    @register("test-b")
+    def step_b(x: float, context=None):
+        if x == interrupt.get("at"):
+            del interrupt["at"]
+            raise KeyboardInterrupt
+        calls.append(("b", x))
+        return True
+
+    save_experiment("resumable", [{"type": "test-a", "x": "{x}"}, {"type": "test-b", "x": "{x}"}])
+    result = _run("run-loop", "resumable", "--variable", "x", "--start", "0", "--end", "4", "--step", "1")
+    assert result.exit_code == 130
+    assert calls == [("a", 0.0), ("b", 0.0), ("a", 1.0), ("b", 1.0), ("a", 2.0)]
+
+    journal = _journal()
+    assert [r["event"] for r in journal.records][-1] == "interrupted"
+    assert "--resume " + journal.run_id in result.output
+    # The process died in the middle of the next write
+    with open(journal.path, "a") as f:
+        f.write(TORN)
+
+    calls.clear()
+    result = _run("run-loop", "--resume", journal.run_id)
+    assert result.exit_code == 0, result.output
+    assert calls == [("b", 2.0), ("a", 3.0), ("b", 3.0), ("a", 4.0), ("b", 4.0)]
+
+    journal = _journal()
+    assert set(journal.done_points) == {0, 1, 2, 3, 4}
+    # Values of the step run before the interrupt are restored for point 2
+    assert journal.done_points[2]["values"] == {"a": 2.0}
+    assert journal.records[-1]["event"] == "end"
+
+
+def test_resume_reruns_only_failed_steps(workdir, register):
+    calls = []
+    fail = {"at": 1.0}
+
+    @register("test-a")
+    def step_a(x: float, context=None):
+        calls.append(("a", x))
+        return True
+
+    @register("test-b")
+    def step_b(x: float, context=None):
+        calls.append(("b", x))
+        if x == fail.get("at"):
+            del fail["at"]
+            return False
+        return True
+
+    save_experiment("flaky", [{"type": "test-a", "x": "{x}"}, {"type": "test-b", "x": "{x}"}])
+    result = _run("run-loop", "flaky", "--variable", "x", "--start", "0", "--end", "2", "--step", "1")
+    assert result.exit_code == 0, result.output
+    assert set(_journal().done_points) == {0, 2}
+
+    calls.clear()
+    result = _run("run-loop", "--resume", _journal().run_id)
+    assert result.exit_code == 0, result.output
+    assert calls == [("b", 1.0)]
+    assert set(_journal().done_points) == {0, 1, 2}
+
+
+def test_resume_uses_the_journaled_recipe(workdir, register):
+    calls = []
+
+    @register("test-a")
+    def step_a(x: float, context=None):
+        calls.append(("a", x))
+        if x == 1.0 and len(calls) == 2:
+            raise KeyboardInterrupt
+        return True
+
+    save_experiment("edited", [{"type": "test-a", "x": "{x}"}])
+    assert _run("run-loop", "edited", "--variable", "x", "--start", "0", "--end", "2", "--step", "1").exit_code == 130
+
+    save_experiment("edited", [{"type": "delay", "seconds": "100"}])
+    calls.clear()
+    result = _run("run-loop", "--resume", _journal().run_id)
+    assert result.exit_code == 0, result.output
+    assert "changed since the run started" in result.output
+    assert calls == [("a", 1.0), ("a", 2.0)]
+
+
+def test_adaptive_resume_continues_the_same_refinement(workdir, register):
+    def lorentzian(x):
+        return 1.0 / (1.0 + ((x - 3.3) / 0.5) ** 2)
+
+    visited = []
+    interrupt = {"after": None}
+
+    @register("test-metric")
+    def metric(x: float, context=None):
+        if len(visited) == interrupt["after"]:
+            interrupt["after"] = None
+            raise KeyboardInterrupt
+        visited.append(x)
+        return ActionResult(m=lorentzian(x))
+
+    save_experiment("adapt", [{"type": "test-metric", "x": "{x}"}])
+    args = ["run-loop", "adapt", "--variable", "x", "--start", "0", "--end", "8", "--step", "2",
+            "--adaptive", "m", "--budget", "15"]
+
+    assert _run(*args).exit_code == 0
+    uninterrupted = list(visited)
+    assert len(uninterrupted) == 15
+    for name in os.listdir(JOURNAL_FOLDER):
+        os.remove(os.path.join(JOURNAL_FOLDER, name))
+
+    visited.clear()
+    interrupt["after"] = 8
+    assert _run(*args).exit_code == 130
+    assert len(visited) == 8
+    assert _run("run-loop", "--resume", _journal().run_id).exit_code == 0
+    assert visited == uninterrupted
+
+    with open(_journal().path) as f:
+        events = [json.loads(line)["event"] for line in f]
+    assert events.count("point") == 15
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from lab_cli.peaks import find_resonance
+
+CENTER = 1525.1234
+FWHM = 0.02
+
+
+def _lorentzian(x, center=CENTER, fwhm=FWHM):
+    return 1.0 / (1.0 + ((x - center) / (fwhm / 2)) ** 2)
+
+
+def _trace(feature="dip", noise=0.01, seed=0):
+    x = np.linspace(1520.0, 1530.0, 5001)    # 2 pm steps
+    shape = 0.5 * _lorentzian(x)
+    y = 1.0 - shape if feature == "dip" else 0.1 + shape
+    return x, y + np.random.default_rng(seed).normal(0.0, noise, len(x))
+
+
+@pytest.mark.parametrize("feature", ["dip", "peak"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_recovers_the_lorentzian_center(feature, seed):
+    x, y = _trace(feature, seed=seed)
+    found = find_resonance(x, y, feature)
+    assert found is not None
+    # Well below the sample spacing
+    assert found.center_nm == pytest.approx(CENTER, abs=FWHM / 10)
+    assert found.fwhm_nm == pytest.approx(FWHM, rel=0.3)
+    assert found.depth == pytest.approx(0.5, rel=0.2)
+    assert found.snr > 8
+
+
+def test_scan_direction_does_not_matter():
+    x, y = _trace()
+    forward = find_resonance(x, y)
+    backward = find_resonance(x[::-1], y[::-1])
+    assert backward.center_nm == pytest.approx(forward.center_nm)
+    assert backward.fwhm_nm == pytest.approx(forward.fwhm_nm)
+
+
+def test_strongest_of_two_dips():
+    x = np.linspace(1520.0, 1530.0, 5001)
+    y = 1.0 - 0.2 * _lorentzian(x, 1522.0) - 0.6 * _lorentzian(x, 1528.0)
+    assert find_resonance(x, y).center_nm == pytest.approx(1528.0, abs=FWHM / 10)
+
+
+def test_noise_alone_is_not_a_resonance():
+    x = np.linspace(1520.0, 1530.0, 5001)
+    y = 1.0 + np.random.default_rng(0).normal(0.0, 0.01, len(x))
+    assert find_resonance(x, y) is None
+    # A dip is not a peak
+    x, y = _trace("dip")
+    assert find_resonance(x, y, "peak") is None
+
+
+def test_edge_cases():
+    assert find_resonance([1.0, 2.0], [0.0, 1.0]) is None
+    with pytest.raises(ValueError, match="feature"):
+        find_resonance(*_trace(), feature="edge")
@@ -0,0 +1,167 @@
+import pytest
+from typer.testing import CliRunner
+
+from lab_cli import main
+from lab_cli.actions import ActionResult
+from lab_cli.plan import PlanError, coerce, compile_recipe
+
+
+def test_unknown_action_and_missing_param_are_reported_together():
+    steps = [{"type": "no-such-action"}, {"type": "delay"}]
+    with pytest.raises(PlanError) as info:
+        compile_recipe(steps, ["x"])
+    message = str(info.value)
+    assert "step 1: unknown action 'no-such-action'" in message
+    assert "step 2 (delay): missing 'seconds'" in message
+
+
+def test_template_with_undeclared_variable_is_rejected():
+    with pytest.raises(PlanError, match=r"\{temp\}"):
+        compile_recipe([{"type": "delay", "seconds": "{temp}"}], ["field"])
+    # Without loop variables to check against, any name is accepted
+    compile_recipe([{"type": "delay", "seconds": "{temp}"}], None)
+
+
+def test_malformed_template_is_rejected():
+    with pytest.raises(PlanError, match="bad template"):
+        compile_recipe([{"type": "log", "message": "{x"}], ["x"])
+
+
+def test_coerce():
+    assert coerce("on", bool) is True
+    assert coerce("0", bool) is False
+    assert coerce("3.0", int) == 3
+    assert coerce(2.5, float) == 2.5
+    assert coerce("abc", str) == "abc"
+    with pytest.raises(ValueError):
+        coerce("3.5", int)
+
+
+def test_constants_are_coerced_to_declared_types(register):
+    calls = []
+
+    @register("test-typed")
+    def typed(count: int, scale: float, flag: bool, label: str, context=None):
+        calls.append((count, scale, flag, label))
+        return True
+
+    plan = compile_recipe([{"type": "test-typed", "count": "3", "scale": "2.5",
+                            "flag": "on", "label": "abc"}], [])
+    plan.run({})
+    assert calls == [(3, 2.5, True, "abc")]
+    assert [type(v) for v in calls[0]] == [int, float, bool, str]
+
+
+def test_bad_constant_fails_at_compile_time(register):
+    @register("test-int")
+    def needs_int(count: int, context=None):
+        return True
+
+    with pytest.raises(PlanError, match="whole number"):
+        compile_recipe([{"type": "test-int", "count": "3.5"}], [])
+
+
+def test_loop_values_are_bound_and_coerced(register):
+    calls = []
+
+    @register("test-bind")
+    def bind(value: float, label: str, context=None):
+        calls.append((value, label, dict(context)))
+        return True
+
+    plan = compile_recipe([{"type": "test-bind", "value": "{x}", "label": "run_{x}_{y}"}], ["x", "y"])
+    plan.run({"x": "1.5", "y": 2})
+    assert calls == [(1.5, "run_1.5_2", {"x": "1.5", "y": 2})]
+
+
+def test_optional_params_keep_their_defaults(register):
+    calls = []
+
+    @register("test-optional")
+    def optional(a: float, b: float = 7.0, mode: str = "fast", context=None):
+        calls.append((a, b, mode))
+        return True
+
+    plan = compile_recipe([{"type": "test-optional", "a": "1"}], [])
+    plan.run({})
+    assert calls == [(1.0, 7.0, "fast")]
+
+
+def test_run_continues_after_failures_and_merges_values(register):
+    ran = []
+
+    @register("test-false")
+    def fails(context=None):
+        ran.append("false")
+        return False
+
+    @register("test-raise")
+    def raises(context=None):
+        ran.append("raise")
+        raise RuntimeError("boom")
+
+    @register("test-values")
+    def values(a: int, b: int = 0, context=None):
+        ran.append("values")
+        return ActionResult(a=a, **({"b": b} if b else {}))
+
+    plan = compile_recipe([{"type": "test-values", "a": "1"},
+                           {"type": "test-false"},
+                           {"type": "test-raise"},
+                           {"type": "test-values", "a": "3", "b": "2"}], [])
+    errors = []
+    result = plan.run({}, on_error=lambda step, exc: errors.append((step.index, exc)))
+
+    assert ran == ["values", "false", "raise", "values"]
+    assert result.ok is False
+    assert result.values == {"a": 3, "b": 2}
+    assert errors[0] == (1, None)
+    assert errors[1][0] == 2 and isinstance(errors[1][1], RuntimeError)
+
+
+def test_failed_action_result_counts_as_failure(register):
+    @register("test-not-ok")
+    def not_ok(context=None):
+        return ActionResult(ok=False, reason=1)
+
+    result = compile_recipe([{"type": "test-not-ok"}], []).run({})
+    assert result.ok is False
+    assert result.values == {"reason": 1}
+
+
+def test_run_skips_steps_and_reports_each_one(register):
+    ran = []
+
+    @register("test-step")
+    def step(n: int, context=None):
+        ran.append(n)
+        return ActionResult(n=n)
+
+    plan = compile_recipe([{"type": "test-step", "n": str(i)} for i in range(3)], [])
+    reported = []
+    result = plan.run({}, skip={1}, on_step=lambda s, ok, values, seconds:
+                      reported.append((s.index, ok, values, seconds >= 0)))
+
+    assert ran == [0, 2]
+    assert reported == [(0, True, {"n": 0}, True), (2, True, {"n": 2}, True)]
+    assert result.ok and result.values == {"n": 2}
+
+
+def test_run_command_goes_through_the_compiler(register):
+    calls = []
+
+    @register("test-cli")
+    def cli(count: int, scale: float = 1.0, context=None):
+        calls.append((count, scale))
+        return True
+
+    result = CliRunner().invoke(main.app, ["run", "test-cli", "count=3", "scale=2"])
+    assert result.exit_code == 0, result.output
+    assert "completed" in result.output
+    assert calls == [(3, 2.0)] and type(calls[0][0]) is int
+
+    result = CliRunner().invoke(main.app, ["run", "test-cli", "count=3.5"])
+    assert "whole number" in result.output
+    result = CliRunner().invoke(main.app, ["run", "test-cli", "count=1", "speed=2"])
+    assert "no parameter 'speed'" in result.output
+    assert calls == [(3, 2.0)]
@@ -0,0 +1,26 @@
+import pytest
+
+from lab_cli.postprocess import PostProcessor
+
+
+def _ok(i):
+    return i
+
+def _fail(i):
+    raise ValueError(i)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_finished_jobs_are_released_but_errors_reported(workers):
+    post = PostProcessor(workers=workers, max_pending=4)
+    try:
+        for i in range(30):
+            post.submit(f"job {i}", _fail if i % 10 == 3 else _ok, i)
+            # Finished jobs don't pile up until flush()
+            assert len(post._pending) <= 5
+        failures = post.flush()
+    finally:
+        post.shutdown()
+    assert sorted(e.args[0] for _, e in failures) == [3, 13, 23]
+    assert all(label == f"job {e.args[0]}" for label, e in failures)
+    assert post.flush() == []
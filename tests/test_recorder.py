@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from lab_cli.connections import recorder
+from lab_cli.connections.recorder import (MAX_CHUNK, MIN_CHUNK, ChunkSizer, RecorderDownloadError,
+                                          RecorderReader, decode_blocks_into, download_recorder,
+                                          reply_samples, stream_recorder)
+from lab_cli.simulators.dlcpro import SimulatedDLCpro, encode_float_blocks
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(recorder, "RETRY_DELAY", 0.0)
+
+
+def _recorded(samples, time_scale=1e9, **kwargs):
+    """A simulator whose recorder holds `samples` samples (all recorded if time_scale is huge)."""
+    sim = SimulatedDLCpro(time_scale=time_scale, seed=1, **kwargs)
+    sim.open()
+    sim.laser1.recorder.sample_count_set.set(samples)
+    sim.laser1.wide_scan.start()
+    return sim
+
+def _expected(sim, channel):
+    return sim._rec[channel].astype(np.float32)
+
+
+def test_decode_across_chunk_boundaries():
+    x = np.arange(10, dtype=np.float32)        # 0.0 encodes as NUL bytes
+    y = -np.arange(10, dtype=np.float32)
+    first = encode_float_blocks([("x", x[:4]), ("y", y[:4]), ("Y", x[:4])])
+    second = encode_float_blocks([("x", x[4:]), ("y", y[4:]), ("Y", x[4:])])
+    assert reply_samples(first) == 4 and reply_samples(second) == 6
+    assert reply_samples(b"") == 0
+
+    out = {"x": np.zeros(10, np.float32), "y": np.zeros(10, np.float32)}
+    seen = set()
+    assert decode_blocks_into(first, out, 0, seen) == 4
+    assert decode_blocks_into(second, out, 4, seen) == 6
+    np.testing.assert_array_equal(out["x"], x)
+    np.testing.assert_array_equal(out["y"], y)
+    # Blocks without a target array are skipped
+    assert seen == {"x", "y"}
+
+
+def test_decode_never_writes_past_the_array():
+    x = np.arange(6, dtype=np.float32)
+    out = {"x": np.full(5, -1, np.float32)}
+    assert decode_blocks_into(encode_float_blocks([("x", x)]), out, 3) == 2
+    np.testing.assert_array_equal(out["x"], [-1, -1, -1, 0, 1])
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+def test_download_matches_the_recording(pipelined):
+    # 5000 samples: chunks of 1024, 2048, ... don't divide it evenly
+    sim = _recorded(5000)
+    data = download_recorder(sim, "xyY", pipelined=pipelined)
+    # channel2 is off by default, so no 'Y' block comes back
+    assert set(data) == {"x", "y"}
+    np.testing.assert_array_equal(data["x"], _expected(sim, "channelx"))
+    np.testing.assert_array_equal(data["y"], _expected(sim, "channel1"))
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+def test_arrays_grow_past_the_initial_capacity(pipelined):
+    sim = _recorded(5000)
+    reader = RecorderReader(sim, "xy", capacity=1000, pipelined=pipelined)
+    try:
+        assert reader.fetch(1000) == 1000
+        assert len(reader.out["x"]) == 1000
+        assert reader.fetch(5000) == 5000
+        assert len(reader.out["x"]) >= 5000
+        data = reader.result()
+    finally:
+        reader.close()
+    np.testing.assert_array_equal(data["x"], _expected(sim, "channelx"))
+    np.testing.assert_array_equal(data["y"], _expected(sim, "channel1"))
+
+
+def test_reserve_keeps_decoded_samples():
+    sim = _recorded(3000)
+    reader = RecorderReader(sim, "x", capacity=100, pipelined=False)
+    reader.fetch(100)
+    reader._reserve(150)
+    # Grows to at least double, keeping what was already read
+    assert len(reader.out["x"]) == 200
+    np.testing.assert_array_equal(reader.out["x"][:100], _expected(sim, "channelx")[:100])
+    reader._reserve(1000)
+    assert len(reader.out["x"]) == 1000
+    reader.close()
+
+
+def test_failed_chunk_is_retried_smaller():
+    sim = _recorded(6000)
+    get_data = sim.laser1.recorder.data.get_data
+    calls = []
+
+    def flaky(index, count):
+        calls.append((index, count))
+        if index >= 3000 and not any(i >= 3000 for i, _ in calls[:-1]):
+            raise ConnectionError("transfer error")
+        return get_data(index, count)
+
+    sim.laser1.recorder.data.get_data = flaky
+    sizer = ChunkSizer(initial=4096)
+    data = download_recorder(sim, "xy", sizer=sizer)
+
+    np.testing.assert_array_equal(data["x"], _expected(sim, "channelx"))
+    failed, retried = [c for c in calls if c[0] >= 3000][:2]
+    assert failed[0] == retried[0]
+    assert retried[1] <= failed[1] and retried[1] <= max(MIN_CHUNK, 4096 // 2)
+
+
+def test_partial_data_when_retries_run_out():
+    sim = _recorded(6000)
+    get_data = sim.laser1.recorder.data.get_data
+    attempts = []
+
+    def broken(index, count):
+        if index >= 3000:
+            attempts.append(index)
+            raise ConnectionError("link down")
+        return get_data(index, count)
+
+    sim.laser1.recorder.data.get_data = broken
+    with pytest.raises(RecorderDownloadError) as info:
+        download_recorder(sim, "xy", retries=2)
+
+    partial = info.value.partial
+    n = len(partial["x"])
+    assert 0 < n < 6000 and n >= 3000
+    assert len(partial["y"]) == n
+    np.testing.assert_array_equal(partial["x"], _expected(sim, "channelx")[:n])
+    np.testing.assert_array_equal(partial["y"], _expected(sim, "channel1")[:n])
+    assert attempts == [n] * 3
+    assert f"at sample {n} of 6000" in str(info.value)
+    assert isinstance(info.value.__cause__, ConnectionError)
+
+
+def test_stream_reads_while_recording():
+    # 2 s of recording at time_scale 20 is about 0.1 s of wall time
+    sim = _recorded(20000, time_scale=20)
+    count = sim.laser1.recorder.data.recorded_sample_count
+    progress = []
+
+    data = stream_recorder(sim, lambda: count.get() < 20000, "xy", capacity=5000,
+                           poll_interval=0.005, progress=progress.append)
+
+    np.testing.assert_array_equal(data["x"], _expected(sim, "channelx"))
+    np.testing.assert_array_equal(data["y"], _expected(sim, "channel1"))
+    # Samples were pulled during the recording, not only at the end
+    assert progress and progress == sorted(progress)
+    assert progress[0] < 20000
+
+
+def test_chunk_sizer():
+    sizer = ChunkSizer(initial=MIN_CHUNK, target=1.0)
+    sizer.record(MIN_CHUNK, 0.1)
+    assert sizer.size == 2 * MIN_CHUNK
+    # Short replies (end of data) say nothing about speed
+    sizer.record(10, 0.0)
+    assert sizer.size == 2 * MIN_CHUNK
+    sizer.record(sizer.size, 5.0)
+    assert sizer.size == MIN_CHUNK
+    for _ in range(20):
+        sizer.record(sizer.size, 0.0)
+    assert sizer.size == MAX_CHUNK
+    for _ in range(20):
+        sizer.failed()
+    assert sizer.size == MIN_CHUNK
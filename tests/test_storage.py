@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from lab_cli.storage import EXTENSIONS, load_sweep, save_sweep
+
+BACKENDS = {"npz": None, "hdf5": "h5py", "parquet": "pyarrow"}
+
+
+def _columns(n=1000):
+    x = np.linspace(1520.0, 1530.0, n)
+    return {"Wavelength": x, "Intensity": np.sin(x).astype(np.float32), "Power": np.cos(x)}
+
+
+@pytest.mark.parametrize("fmt", list(EXTENSIONS))
+@pytest.mark.parametrize("precision", ["float32", "float64"])
+def test_round_trip(tmp_path, fmt, precision):
+    if BACKENDS[fmt]:
+        pytest.importorskip(BACKENDS[fmt])
+    columns = _columns()
+    metadata = {"speed": 10.0, "context": {"field": 0.5}, "channels": ["intensity"]}
+
+    path = save_sweep(str(tmp_path / "sweep"), columns, metadata, fmt=fmt, precision=precision)
+    assert path.endswith(EXTENSIONS[fmt])
+
+    loaded, meta = load_sweep(path)
+    # Column order is kept
+    assert list(loaded) == list(columns)
+    for name, values in columns.items():
+        assert loaded[name].dtype == np.dtype(precision)
+        np.testing.assert_allclose(loaded[name], values, rtol=1e-6 if precision == "float32" else 0)
+    assert meta["context"] == {"field": 0.5}
+    assert meta["channels"] == ["intensity"]
+    assert meta["precision"] == precision
+
+
+def test_float32_keeps_recorder_values_exact(tmp_path):
+    intensity = np.random.default_rng(0).random(100, dtype=np.float32)
+    path = save_sweep(str(tmp_path / "sweep"), {"Intensity": intensity}, {})
+    np.testing.assert_array_equal(load_sweep(path)[0]["Intensity"], intensity)
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(ValueError, match="Unknown format"):
+        save_sweep(str(tmp_path / "s"), _columns(), {}, fmt="csv")
+    with pytest.raises(ValueError, match="Unknown precision"):
+        save_sweep(str(tmp_path / "s"), _columns(), {}, precision="float16")
+    with pytest.raises(ValueError, match="Not a sweep file"):
+        load_sweep(str(tmp_path / "s.txt"))
+
+
+def test_export_excel(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+    from lab_cli.storage import export_excel
+
+    path = save_sweep(str(tmp_path / "sweep"), _columns(10), {"speed": 10.0, "context": {"field": 0.5}})
+    output = export_excel(path)
+    assert output == str(tmp_path / "sweep.xlsx")
+
+    data = pd.read_excel(output, sheet_name="Data")
+    assert list(data.columns) == ["Wavelength", "Intensity", "Power"]
+    np.testing.assert_allclose(data["Wavelength"], _columns(10)["Wavelength"], rtol=1e-6)
+    meta = dict(pd.read_excel(output, sheet_name="Metadata").values.tolist())
+    assert meta["speed"] == 10.0 and meta["context.field"] == 0.5
@@ -0,0 +1,103 @@
+import pytest
+
+from lab_cli.journal import RunJournal
+from lab_cli.plan import compile_recipe
+from lab_cli.timing import (DEFAULT_STEP_SECONDS, FIELD_RAMP_T_PER_S, TimingModel, estimate_plan,
+                            format_duration, load_timing_model)
+
+
+def _points(*values):
+    return [{"x": v} for v in values]
+
+
+def test_priors_without_history(register):
+    @register("test-untimed")
+    def untimed(context=None):
+        return True
+
+    plan = compile_recipe([{"type": "delay", "seconds": "2"},
+                           {"type": "log", "message": "at {x}"},
+                           {"type": "test-untimed"}], ["x"])
+    estimates = estimate_plan(plan, _points(1, 2, 3), TimingModel())
+
+    assert [(e.action, e.runs, e.learned_from) for e in estimates] == [
+        ("delay", 3, 0), ("log", 3, 0), ("test-untimed", 3, 0)]
+    assert [e.seconds for e in estimates] == [6.0, 0.0, 3 * DEFAULT_STEP_SECONDS]
+
+
+def test_field_ramps_are_charged_to_the_next_wait_stable():
+    plan = compile_recipe([{"type": "set-field", "target": "{x}"},
+                           {"type": "wait-stable", "threshold": "0.01"}], ["x"])
+    ramp, wait = estimate_plan(plan, _points(0.0, 0.5, 1.0, 1.0), TimingModel())
+
+    assert ramp.seconds == pytest.approx(4 * 0.5)
+    # 30 s to settle at each point, plus 0.5 T of ramping twice
+    assert wait.seconds == pytest.approx(4 * 30.0 + 2 * 0.5 / FIELD_RAMP_T_PER_S)
+
+
+def test_skipped_steps_are_not_counted():
+    plan = compile_recipe([{"type": "delay", "seconds": "1"},
+                           {"type": "delay", "seconds": "{x}"}], ["x"])
+    first, second = estimate_plan(plan, _points(1, 2, 3), TimingModel(),
+                                  skip=lambda i: {0, 1} if i == 0 else {0} if i == 1 else ())
+    assert (first.runs, first.seconds) == (1, 1.0)
+    assert (second.runs, second.seconds) == (2, 5.0)
+
+
+def test_unbindable_steps_are_reported(register):
+    @register("test-count")
+    def count(n: int, context=None):
+        return True
+
+    plan = compile_recipe([{"type": "test-count", "n": "{x}"}], ["x"])
+    (estimate,) = estimate_plan(plan, _points(1, 1.5, 2, 2.5), TimingModel())
+    assert (estimate.runs, estimate.failed) == (2, 2)
+    assert "whole number" in estimate.error
+
+
+def _journal(tmp_path, name, steps, timings):
+    journal = RunJournal.create(str(tmp_path / f"{name}.jsonl"), {"name": name}, steps)
+    for i, (point, step, seconds) in enumerate(timings):
+        journal.record_step(i, point, step, steps[step]["type"], True, {}, seconds)
+    return journal
+
+
+def test_learns_from_journaled_runs(tmp_path, register):
+    @register("test-slow")
+    def slow(n: float, context=None):
+        return True
+
+    # Takes 10 s + 2 s per unit of n, instead of the 1 s default
+    steps = [{"type": "test-slow", "n": "{x}"}]
+    _journal(tmp_path, "a", steps, [({"x": n}, 0, 10.0 + 2.0 * n) for n in range(5)])
+    _journal(tmp_path, "b", steps, [({"x": n}, 0, 10.0 + 2.0 * n) for n in range(5, 40)]
+             + [({"x": 1}, 0, None)])
+    model = load_timing_model(str(tmp_path))
+    assert model.count("test-slow") == 40
+
+    (estimate,) = estimate_plan(compile_recipe(steps, ["x"]), _points(0), model)
+    assert estimate.learned_from == 40
+    # The default model has no feature for n, so it learns the average
+    assert estimate.seconds == pytest.approx(10.0 + 2.0 * 19.5, rel=0.05)
+
+
+def test_learned_sweep_time_scales_with_the_range(tmp_path):
+    steps = [{"type": "sweep-laser", "start_nm": "1520", "end_nm": "{x}", "speed": "10", "power": "1"}]
+    # Actual overhead is 8 s and the scan itself runs at the nominal speed
+    timings = [({"x": 1520 + r}, 0, 8.0 + r / 10) for r in (10, 20, 40, 80) * 5]
+    _journal(tmp_path, "sweeps", steps, timings)
+    model = load_timing_model(str(tmp_path))
+
+    (estimate,) = estimate_plan(compile_recipe(steps, ["x"]), _points(1580), model)
+    assert estimate.seconds == pytest.approx(8.0 + 6.0, rel=0.1)
+
+
+def test_load_ignores_broken_journals(tmp_path):
+    (tmp_path / "broken.jsonl").write_text("not json\n")
+    assert load_timing_model(str(tmp_path)).count("delay") == 0
+
+
+def test_format_duration():
+    assert format_duration(12.34) == "12.3 s"
+    assert format_duration(125) == "2 min 05 s"
+    assert format_duration(3 * 3600 + 7 * 60) == "3 h 07 min"